@@ -9,9 +9,60 @@ import time
 import json
 from typing import Dict, List, Any, Optional, Tuple, Union
 from datetime import datetime
-from ..config import SUPABASE_URL, SUPABASE_KEY
+from urllib.parse import quote
+from ..config import (SUPABASE_URL, SUPABASE_KEY, SUPABASE_BULK_CHUNK_SIZE, SUPABASE_MAX_FILTER_LENGTH,
+                      SUPABASE_PAGE_SIZE)
+from ..db.database import CHECKIN_ADMITTED, CHECKIN_DUPLICATE, CHECKIN_NOT_FOUND
 from ..utils.error_handler import ApiError
 
+
+def quote_filter_value(value: str) -> str:
+    """
+    Quote a value for a PostgREST in.() list
+    
+    Values are always double-quoted so commas, parentheses and dots inside QR
+    codes are not read as list syntax.
+    
+    Args:
+        value: Raw value
+        
+    Returns:
+        Quoted value
+    """
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def chunk_filter_values(values: List[str], max_items: int = SUPABASE_BULK_CHUNK_SIZE,
+                        max_length: int = SUPABASE_MAX_FILTER_LENGTH) -> List[List[str]]:
+    """
+    Split values into groups whose in.() filters stay within a request size
+    
+    Args:
+        values: Values to look up
+        max_items: Most values per group
+        max_length: Longest URL-encoded filter per group; a single longer value
+            still gets a group of its own
+        
+    Returns:
+        List of value groups
+    """
+    chunks = []
+    chunk: List[str] = []
+    length = len("in.()")
+    for value in values:
+        # The separating comma is encoded as %2C
+        cost = len(quote(quote_filter_value(value), safe="")) + (3 if chunk else 0)
+        if chunk and (len(chunk) >= max_items or length + cost > max_length):
+            chunks.append(chunk)
+            chunk, length = [], len("in.()")
+            cost -= 3
+        chunk.append(value)
+        length += cost
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
 class SupabaseClient:
     """Client for interacting with Supabase APIs"""
     
@@ -38,20 +89,114 @@ class SupabaseClient:
         """
         Fetch all tickets for event from Supabase
         
+        Pages through the event so responses are not cut off at the server's row
+        limit; SyncEngine streams the same pages into the database instead of
+        collecting them.
+        
         Args:
             event_id: ID of the event to fetch tickets for
             
         Returns:
             List of attendee data dictionaries
         """
+        tickets = []
         try:
-            # Updated to use booking_attendees table
-            response = self.client.table('booking_attendees').select('*').eq('event_id', event_id).execute()
-            logging.info(f"Fetched {len(response.data)} attendees for event {event_id}")
-            return response.data
-        except Exception as e:
+            while True:
+                page = self.fetch_ticket_page(event_id, tickets[-1]['id'] if tickets else None)
+                tickets.extend(page)
+                if len(page) < SUPABASE_PAGE_SIZE:
+                    break
+            logging.info(f"Fetched {len(tickets)} attendees for event {event_id}")
+            return tickets
+        except ApiError as e:
             logging.error(f"Preload tickets error: {e}")
             return []
+
+    def fetch_ticket_page(self, event_id: str, after_id: Optional[str] = None,
+                          page_size: int = SUPABASE_PAGE_SIZE) -> List[Dict[str, Any]]:
+        """
+        Fetch one page of an event's attendees
+        
+        Rows are ordered by id and paged by keyset, so rows inserted or deleted
+        during a download do not shift later pages.
+        
+        Args:
+            event_id: ID of the event
+            after_id: ID of the last row of the previous page; None fetches the first page
+            page_size: Rows per page
+            
+        Returns:
+            List of attendee data dictionaries; shorter than page_size at the end
+            
+        Raises:
+            ApiError: If the request fails
+        """
+        query = self.client.table('booking_attendees').select('*').eq('event_id', event_id)
+        if after_id is not None:
+            query = query.gt('id', after_id)
+        try:
+            response = query.order('id').limit(page_size).execute()
+        except Exception as e:
+            raise ApiError(f"Fetching tickets after {after_id} failed: {e}") from e
+        return response.data
+
+    def count_tickets(self, event_id: str) -> int:
+        """
+        Count an event's attendees
+        
+        Args:
+            event_id: ID of the event
+            
+        Returns:
+            Number of attendees
+            
+        Raises:
+            ApiError: If the request fails
+        """
+        try:
+            response = self.client.table('booking_attendees').select('id', count='exact').eq('event_id', event_id).limit(1).execute()
+        except Exception as e:
+            raise ApiError(f"Counting tickets failed: {e}") from e
+        return response.count or 0
+            
+    def fetch_ticket_changes(self, event_id: str, since_updated_at: Optional[str] = None,
+                             since_id: Optional[str] = None, page_size: int = SUPABASE_PAGE_SIZE) -> List[Dict[str, Any]]:
+        """
+        Fetch the attendees of an event changed after a watermark
+        
+        Rows are ordered by (updated_at, id) and paged by keyset, so rows sharing
+        an updated_at are neither skipped nor fetched twice.
+        
+        Args:
+            event_id: ID of the event
+            since_updated_at: updated_at of the newest row already fetched; None fetches every row
+            since_id: ID of that row
+            page_size: Rows per request
+            
+        Returns:
+            List of attendee data dictionaries, oldest change first
+            
+        Raises:
+            ApiError: If a request fails
+        """
+        changes = []
+        while True:
+            query = self.client.table('booking_attendees').select('*').eq('event_id', event_id)
+            if since_updated_at is not None:
+                updated_at = quote_filter_value(since_updated_at)
+                query = query.or_(f"updated_at.gt.{updated_at},"
+                                  f"and(updated_at.eq.{updated_at},id.gt.{quote_filter_value(since_id or '')})")
+            try:
+                response = query.order('updated_at').order('id').limit(page_size).execute()
+            except Exception as e:
+                raise ApiError(f"Fetching ticket changes failed: {e}") from e
+            changes.extend(response.data)
+            # Rows without updated_at sort last and cannot be paged past
+            if len(response.data) < page_size or response.data[-1].get('updated_at') is None:
+                break
+            since_updated_at, since_id = response.data[-1]['updated_at'], response.data[-1].get('id')
+        logging.info(f"Fetched {len(changes)} changed attendees for event {event_id}")
+        return changes
             
     def get_attendee_by_qr(self, qr_code: str):
         """
@@ -119,10 +264,58 @@ class SupabaseClient:
             logging.error(f"QR code verification error: {e}")
             return False, None, f"Verification error: {str(e)}"
 
+    def check_in_attendee(self, qr_code: str, scanner_id: str) -> str:
+        """
+        Check an attendee in only if no scanner has checked them in yet
+        
+        The update is filtered on checked_in not being true (false or NULL), so
+        of two devices racing on one ticket only one gets the row back. The scan is recorded only when
+        this call admits the attendee.
+        
+        Args:
+            qr_code: QR code of the attendee
+            scanner_id: ID of the scanner device
+            
+        Returns:
+            CHECKIN_ADMITTED, CHECKIN_DUPLICATE, or CHECKIN_NOT_FOUND if the QR
+            code is not in Supabase
+            
+        Raises:
+            ApiError: If Supabase is unreachable or a request fails
+        """
+        if not self.connection_verified:
+            raise ApiError("Supabase connection not available")
+            
+        current_time = datetime.utcnow().isoformat()
+        try:
+            response = self.client.table('booking_attendees').update({
+                'checked_in': True,
+                'checked_in_at': current_time
+            }).eq('qr_code', qr_code).not_.is_('checked_in', True).execute()
+            if response.data:
+                self.client.table('scans').insert({
+                    'qr_code': qr_code,
+                    'scanner_id': scanner_id,
+                    'scanned_at': current_time,
+                    'synced': True
+                }).execute()
+                outcome = CHECKIN_ADMITTED
+            else:
+                existing = self.client.table('booking_attendees').select('checked_in').eq('qr_code', qr_code).execute()
+                outcome = CHECKIN_DUPLICATE if existing.data else CHECKIN_NOT_FOUND
+        except Exception as e:
+            raise ApiError(f"Check-in failed: {e}") from e
+            
+        logging.info(f"Online check-in for QR code {qr_code}: {outcome}")
+        return outcome
+
     def push_scan(self, qr_code: str, scanner_id: str):
         """
         Push scan log to Supabase and update attendee check-in status
         
+        A scan whose attendee was already checked in elsewhere counts as pushed;
+        the conditional check-in leaves the existing check-in untouched.
+        
         Args:
             qr_code: QR code that was scanned
             scanner_id: ID of the scanner device
@@ -135,29 +328,13 @@ class SupabaseClient:
             return False
             
         try:
-            # Get current timestamp in ISO format
-            current_time = datetime.utcnow().isoformat()
-            
-            # First, record the scan
-            scan_data = {
-                'qr_code': qr_code,
-                'scanner_id': scanner_id,
-                'scanned_at': current_time,
-                'synced': True
-            }
-            self.client.table('scans').insert(scan_data).execute()
-            
-            # Then, update attendee status to checked-in
-            self.client.table('booking_attendees').update({
-                'checked_in': True, 
-                'checked_in_at': current_time
-            }).eq('qr_code', qr_code).execute()
-            
-            logging.info(f"Scan pushed and attendee checked in for QR code {qr_code}")
-            return True
-        except Exception as e:
+            outcome = self.check_in_attendee(qr_code, scanner_id)
+        except ApiError as e:
             logging.error(f"Push scan error: {e}")
             return False
+        if outcome == CHECKIN_DUPLICATE:
+            logging.info(f"QR code {qr_code} was already checked in online")
+        return True
 
     def subscribe_realtime_updates(self, callback):
         """
@@ -234,7 +411,30 @@ class SupabaseClient:
             logging.error(f"Get attendee count error: {e}")
             return (0, 0)
             
-    def bulk_verify_qr_codes(self, qr_codes: List[str]) -> Dict[str, Tuple[bool, str]]:
+    def get_attendees_by_qr(self, qr_codes: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch attendees for many QR codes in as few requests as the URL length allows
+        
+        Args:
+            qr_codes: QR codes to look up
+            
+        Returns:
+            Dictionary mapping found QR codes to attendee data
+            
+        Raises:
+            ApiError: If a request fails
+        """
+        attendees = {}
+        for chunk in chunk_filter_values(list(dict.fromkeys(qr_codes))):
+            in_expression = f"in.({','.join(quote_filter_value(qr_code) for qr_code in chunk)})"
+            try:
+                response = self.client.table('booking_attendees').select('*').filter('qr_code', in_expression).execute()
+            except Exception as e:
+                raise ApiError(f"Bulk attendee lookup failed: {e}") from e
+            attendees.update((attendee['qr_code'], attendee) for attendee in response.data)
+        return attendees
+            
+    def bulk_verify_qr_codes(self, qr_codes: List[str]) -> Dict[str, Tuple[bool, Optional[Dict[str, Any]], str]]:
         """
         Verify multiple QR codes at once
         
@@ -242,33 +442,29 @@ class SupabaseClient:
             qr_codes: List of QR codes to verify
             
         Returns:
-            Dictionary mapping QR codes to (is_valid, message) tuples
+            Dictionary mapping QR codes to (is_valid, attendee data, message) tuples,
+            as returned by verify_qr_code
         """
         if not self.connection_verified:
             logging.warning("Supabase connection not available, can't verify QR codes")
-            return {qr_code: (False, "Supabase connection not available") for qr_code in qr_codes}
+            return {qr_code: (False, None, "Cannot connect to Supabase for verification") for qr_code in qr_codes}
             
         results = {}
         try:
-            # Use a single query to get all attendees
-            in_expression = f"in.({','.join(qr_codes)})"
-            response = self.client.table('booking_attendees').select('*').filter('qr_code', in_expression).execute()
-            
-            # Create a lookup dictionary
-            attendees_by_qr = {attendee['qr_code']: attendee for attendee in response.data}
+            attendees_by_qr = self.get_attendees_by_qr(qr_codes)
             
             # Process each QR code
             for qr_code in qr_codes:
                 if qr_code in attendees_by_qr:
                     attendee = attendees_by_qr[qr_code]
                     if attendee.get('checked_in', False):
-                        results[qr_code] = (False, f"Already checked in at {attendee.get('checked_in_at')}")
+                        results[qr_code] = (False, attendee, f"Attendee already checked in at {attendee.get('checked_in_at')}")
                     else:
-                        results[qr_code] = (True, "QR code valid")
+                        results[qr_code] = (True, attendee, "QR code valid")
                 else:
-                    results[qr_code] = (False, "QR code not found")
+                    results[qr_code] = (False, None, "QR code not found in database")
                     
             return results
         except Exception as e:
             logging.error(f"Bulk QR code verification error: {e}")
-            return {qr_code: (False, f"Verification error: {str(e)}") for qr_code in qr_codes}
+            return {qr_code: (False, None, f"Verification error: {str(e)}") for qr_code in qr_codes}
@@ -0,0 +1,262 @@
+"""
+EventHive Replay Benchmark
+Feeds recorded video files or image directories through QRScanner without the GUI
+and reports throughput, decode latency, hit rate and CPU time per decoder setting.
+
+Usage:
+    python -m backend.qr_scanner.bench recordings/gate1.mp4 --output results.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+import cv2
+import numpy as np
+
+from . import __version__
+from .core.scanner import QRScanner
+from .core.preprocess import PreprocessCascade
+
+# Image file extensions read from a frame directory
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp")
+
+# Named decoder settings, passed to QRScanner as keyword arguments ("cascade": True
+# gives each run a fresh preprocessing cascade)
+DECODER_SETTINGS: Dict[str, Dict[str, Any]] = {
+    "full": {"roi_tracking": False, "downscale_first": False, "gating": False},
+    "downscale": {"roi_tracking": False, "downscale_first": True, "gating": False},
+    "roi": {"roi_tracking": True, "downscale_first": False, "gating": False},
+    "roi+downscale": {"roi_tracking": True, "downscale_first": True, "gating": False},
+    "roi+downscale+gating": {"roi_tracking": True, "downscale_first": True, "gating": True},
+    "roi+downscale+cascade": {"roi_tracking": True, "downscale_first": True, "gating": False, "cascade": True},
+    "opencv": {"roi_tracking": True, "downscale_first": True, "gating": False, "decoder": "opencv"},
+    "opencv_multi": {"roi_tracking": True, "downscale_first": True, "gating": False, "decoder": "opencv_multi"},
+    "pyzbar,opencv": {"roi_tracking": True, "downscale_first": True, "gating": False, "decoder": "pyzbar,opencv"},
+}
+
+
+def iter_frames(source: str, max_frames: int = 0) -> Iterator[Any]:
+    """
+    Read frames from a video file or a directory of images
+
+    Args:
+        source: Path to a video file or a directory of image files (read in name order)
+        max_frames: Stop after this many frames (0 = read everything)
+
+    Yields:
+        BGR frames
+    """
+    count = 0
+    if os.path.isdir(source):
+        names = sorted(name for name in os.listdir(source) if name.lower().endswith(IMAGE_EXTENSIONS))
+        for name in names:
+            frame = cv2.imread(os.path.join(source, name), cv2.IMREAD_COLOR)
+            if frame is None:
+                logging.warning(f"Skipping unreadable image {name}")
+                continue
+            yield frame
+            count += 1
+            if max_frames and count >= max_frames:
+                return
+        return
+
+    capture = cv2.VideoCapture(source)
+    if not capture.isOpened():
+        raise ValueError(f"Cannot open video source {source}")
+    try:
+        while not max_frames or count < max_frames:
+            ret, frame = capture.read()
+            if not ret:
+                break
+            yield frame
+            count += 1
+    finally:
+        capture.release()
+
+
+def summarize_latencies(latencies: List[float]) -> Dict[str, float]:
+    """
+    Summarize per-frame latencies
+
+    Args:
+        latencies: Latencies in seconds
+
+    Returns:
+        Dictionary with mean, p50, p90, p95, p99 and max in milliseconds
+    """
+    if not latencies:
+        return {"mean": 0.0, "p50": 0.0, "p90": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    ms = np.asarray(latencies) * 1000
+    p50, p90, p95, p99 = np.percentile(ms, [50, 90, 95, 99])
+    return {
+        "mean": round(float(ms.mean()), 3),
+        "p50": round(float(p50), 3),
+        "p90": round(float(p90), 3),
+        "p95": round(float(p95), 3),
+        "p99": round(float(p99), 3),
+        "max": round(float(ms.max()), 3)
+    }
+
+
+def run_setting(frames: List[Any], name: str, options: Dict[str, Any], repeat: int = 1) -> Dict[str, Any]:
+    """
+    Replay frames through a freshly created scanner
+
+    Args:
+        frames: BGR frames to replay, in recording order
+        name: Name of the decoder setting
+        options: QRScanner keyword arguments for this setting
+        repeat: Number of passes over the frames
+
+    Returns:
+        Dictionary with throughput, latency, hit rate and CPU time for the setting
+    """
+    kwargs = dict(options)
+    kwargs["cascade"] = PreprocessCascade() if kwargs.get("cascade") else None
+    scanner = QRScanner("", **kwargs)
+    latencies = []
+    hits = 0
+    skipped = 0
+    payloads = set()
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    for _ in range(repeat):
+        for frame in frames:
+            start = time.perf_counter()
+            analysis = scanner.analyze_frame(frame)
+            latencies.append(time.perf_counter() - start)
+            if analysis.skipped:
+                skipped += 1
+            elif analysis.symbols:
+                hits += 1
+                payloads.update(symbol.data for symbol in analysis.symbols)
+    wall_time = time.perf_counter() - wall_start
+    cpu_time = time.process_time() - cpu_start
+
+    total = len(latencies)
+    return {
+        "setting": name,
+        "options": options,
+        "frames": total,
+        "wall_time_s": round(wall_time, 4),
+        "cpu_time_s": round(cpu_time, 4),
+        "cpu_ms_per_frame": round(cpu_time * 1000 / total, 3) if total else 0.0,
+        "fps": round(total / wall_time, 2) if wall_time > 0 else 0.0,
+        "latency_ms": summarize_latencies(latencies),
+        "hits": hits,
+        "hit_rate": round(hits / total, 4) if total else 0.0,
+        "skipped": skipped,
+        "distinct_payloads": len(payloads),
+        "strategies": scanner.get_decode_stats()
+    }
+
+
+def run_benchmark(source: str, settings: Optional[List[str]] = None, max_frames: int = 0,
+                  repeat: int = 1) -> Dict[str, Any]:
+    """
+    Benchmark each decoder setting against one recording
+
+    Args:
+        source: Path to a video file or a directory of images
+        settings: Names from DECODER_SETTINGS to run (None = all)
+        max_frames: Limit on frames read from the source (0 = all)
+        repeat: Number of passes over the frames per setting
+
+    Returns:
+        JSON-serializable report with run metadata and one result per setting
+    """
+    names = settings or list(DECODER_SETTINGS)
+    unknown = [name for name in names if name not in DECODER_SETTINGS]
+    if unknown:
+        raise ValueError(f"Unknown decoder settings: {', '.join(unknown)}")
+
+    # Frames are loaded up front so file decoding is not part of the measurement
+    frames = list(iter_frames(source, max_frames))
+    if not frames:
+        raise ValueError(f"No frames read from {source}")
+
+    height, width = frames[0].shape[:2]
+    return {
+        "source": os.path.abspath(source),
+        "frames": len(frames),
+        "resolution": [width, height],
+        "repeat": repeat,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": {
+            "version": __version__,
+            "python": platform.python_version(),
+            "opencv": cv2.__version__,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count()
+        },
+        "results": [run_setting(frames, name, DECODER_SETTINGS[name], repeat) for name in names]
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """
+    Format a benchmark report as a plain-text table
+
+    Args:
+        report: Output of run_benchmark
+
+    Returns:
+        Table with one row per decoder setting
+    """
+    width, height = report["resolution"]
+    lines = [
+        f"{report['source']}: {report['frames']} frames at {width}x{height}, {report['repeat']} pass(es)",
+        f"{'setting':<22}{'fps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'hit rate':>10}{'cpu ms/f':>10}"
+    ]
+    for result in report["results"]:
+        latency = result["latency_ms"]
+        lines.append(
+            f"{result['setting']:<22}{result['fps']:>9.1f}{latency['p50']:>9.2f}{latency['p95']:>9.2f}"
+            f"{latency['p99']:>9.2f}{result['hit_rate']:>10.1%}{result['cpu_ms_per_frame']:>10.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(description="Replay recorded frames through the QR scanner decoder")
+    parser.add_argument("source", help="Video file or directory of images")
+    parser.add_argument("--settings", nargs="+", choices=list(DECODER_SETTINGS), help="Decoder settings to run (default: all)")
+    parser.add_argument("--max-frames", type=int, default=0, help="Limit the number of frames read (default: all)")
+    parser.add_argument("--repeat", type=int, default=1, help="Passes over the frames per setting")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    try:
+        report = run_benchmark(args.source, args.settings, args.max_frames, args.repeat)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(format_report(report))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -33,13 +33,32 @@ SUPABASE_ATTENDEES_TABLE = os.environ.get("EVENTHIVE_SUPABASE_ATTENDEES_TABLE",
 SUPABASE_EVENTS_TABLE = os.environ.get("EVENTHIVE_SUPABASE_EVENTS_TABLE", "events")
 SUPABASE_SCANS_TABLE = os.environ.get("EVENTHIVE_SUPABASE_SCANS_TABLE", "scans")
 
+# Bulk lookups: codes per request, and the longest URL-encoded in.() filter sent in one request
+SUPABASE_BULK_CHUNK_SIZE = int(os.environ.get("EVENTHIVE_SUPABASE_BULK_CHUNK_SIZE", "100"))
+SUPABASE_MAX_FILTER_LENGTH = int(os.environ.get("EVENTHIVE_SUPABASE_MAX_FILTER_LENGTH", "4000"))
+# Rows per request when paging through attendees; pages are keyed on the last ID (or
+# (updated_at, id) for changes) and a download fetches one page ahead while storing
+SUPABASE_PAGE_SIZE = int(os.environ.get("EVENTHIVE_SUPABASE_PAGE_SIZE", "1000"))
+
 # HMAC secret (store securely in production)
 HMAC_SECRET = os.environ.get("EVENTHIVE_HMAC_SECRET", "your_hmac_secret_here")
+# Signing keys for compact signed tickets as "id:secret,id:secret"; the highest ID signs
+# new tickets and older IDs keep verifying until removed. Empty uses HMAC_SECRET as key 0.
+TICKET_KEYS = os.environ.get("EVENTHIVE_TICKET_KEYS", "")
 
 # SQLite DB path
 DB_DIR = os.path.join(BASE_DIR, "data")
 os.makedirs(DB_DIR, exist_ok=True)
 DB_PATH = os.path.join(DB_DIR, "eventhive_scanner.db")
+# Milliseconds a SQLite connection waits for a lock before failing
+DB_BUSY_TIMEOUT_MS = int(os.environ.get("EVENTHIVE_DB_BUSY_TIMEOUT_MS", "5000"))
+# Page cache per SQLite connection, in KiB
+DB_CACHE_KB = int(os.environ.get("EVENTHIVE_DB_CACHE_KB", "8192"))
+# Last known-good camera configurations, reused to open cameras immediately on the next launch
+CAMERA_STATE_PATH = os.path.join(DB_DIR, "camera_state.json")
+
+# Seconds between full re-downloads of the event; polls in between fetch only changed rows
+FULL_SYNC_INTERVAL_SEC = float(os.environ.get("EVENTHIVE_FULL_SYNC_INTERVAL", "900"))
 
 # Scanner ID
 SCANNER_ID = os.environ.get("EVENTHIVE_SCANNER_ID", "scanner_001")
@@ -47,14 +66,70 @@ SCANNER_ID = os.environ.get("EVENTHIVE_SCANNER_ID", "scanner_001")
 # Scanner settings
 SCANNER_NAME = os.environ.get("EVENTHIVE_SCANNER_NAME", "EventHive Check-In")
 CAMERA_INDEX = int(os.environ.get("EVENTHIVE_CAMERA_INDEX", "0"))
+# Comma-separated camera indexes, one scanning lane per camera (e.g. "0,1")
+CAMERA_INDEXES = [int(i) for i in os.environ.get("EVENTHIVE_CAMERA_INDEXES", str(CAMERA_INDEX)).split(",")]
+# Requested capture mode; cameras that refuse it fall back to driver defaults
+CAMERA_WIDTH = int(os.environ.get("EVENTHIVE_CAMERA_WIDTH", "1280"))
+CAMERA_HEIGHT = int(os.environ.get("EVENTHIVE_CAMERA_HEIGHT", "720"))
+CAMERA_FPS = float(os.environ.get("EVENTHIVE_CAMERA_FPS", "30"))
+CAMERA_FOURCC = os.environ.get("EVENTHIVE_CAMERA_FOURCC", "MJPG")
+# Frames the driver may queue; 1 keeps capture on the newest frame
+CAMERA_BUFFER_SIZE = int(os.environ.get("EVENTHIVE_CAMERA_BUFFER_SIZE", "1"))
+# Seconds during which the same QR code is suppressed after it was last seen
 SCAN_COOLDOWN_SEC = int(os.environ.get("EVENTHIVE_SCAN_COOLDOWN", "2"))
+# Number of distinct recently scanned codes remembered for duplicate suppression
+SCAN_DEDUP_CAPACITY = int(os.environ.get("EVENTHIVE_SCAN_DEDUP_CAPACITY", "1024"))
+# False positive rate of the offline revocation filter; a false positive refuses a valid ticket
+REVOCATION_ERROR_RATE = float(os.environ.get("EVENTHIVE_REVOCATION_ERROR_RATE", "1e-6"))
+
+# Decoding settings
+# "inprocess" decodes on the pipeline thread, "process_pool" fans frames out to worker processes
+DECODE_MODE = os.environ.get("EVENTHIVE_DECODE_MODE", "inprocess")
+# Number of decode worker processes (0 = one per CPU core, leaving one for capture and the GUI)
+DECODE_WORKERS = int(os.environ.get("EVENTHIVE_DECODE_WORKERS", "0"))
+# Try a cropped decode around the last code found before scanning the whole frame
+DECODE_ROI_TRACKING = os.environ.get("EVENTHIVE_DECODE_ROI_TRACKING", "1") == "1"
+# Try a half-resolution decode first on frames at least this wide
+DECODE_DOWNSCALE_FIRST = os.environ.get("EVENTHIVE_DECODE_DOWNSCALE_FIRST", "1") == "1"
+DECODE_DOWNSCALE_MIN_WIDTH = int(os.environ.get("EVENTHIVE_DECODE_DOWNSCALE_MIN_WIDTH", "960"))
+# Skip unchanged idle scenes and motion-blurred frames before decoding
+DECODE_GATING = os.environ.get("EVENTHIVE_DECODE_GATING", "1") == "1"
+# Retry failed frames with enhancement steps (CLAHE, adaptive threshold, inversion, sharpening)
+DECODE_CASCADE = os.environ.get("EVENTHIVE_DECODE_CASCADE", "0") == "1"
+# Space-separated cascade steps and the time they may spend per frame
+DECODE_CASCADE_STEPS = os.environ.get("EVENTHIVE_DECODE_CASCADE_STEPS", "clahe adaptive invert sharpen").split()
+DECODE_CASCADE_BUDGET_MS = float(os.environ.get("EVENTHIVE_DECODE_CASCADE_BUDGET_MS", "15"))
+# Decoder backend: "pyzbar", "opencv", "opencv_multi", or a fallback chain such as "pyzbar,opencv"
+DECODE_BACKEND = os.environ.get("EVENTHIVE_DECODE_BACKEND", "pyzbar")
+# Live frames sampled at startup to pick, in the background, the fastest backend meeting the target hit rate (0 = off)
+DECODE_CALIBRATION_FRAMES = int(os.environ.get("EVENTHIVE_DECODE_CALIBRATION_FRAMES", "20"))
+DECODE_CALIBRATION_TARGET = float(os.environ.get("EVENTHIVE_DECODE_CALIBRATION_TARGET", "0.9"))
+# Space-separated backends compared during calibration
+DECODE_CALIBRATION_CANDIDATES = os.environ.get("EVENTHIVE_DECODE_CALIBRATION_CANDIDATES", "pyzbar opencv pyzbar,opencv").split()
+
+# Headless daemon settings
+# Event whose tickets are loaded at startup (empty = none)
+EVENT_ID = os.environ.get("EVENTHIVE_EVENT_ID", "")
+# Status socket: a Unix socket path, or a TCP port number on 127.0.0.1
+DAEMON_STATUS_SOCKET = os.environ.get("EVENTHIVE_STATUS_SOCKET", "8765" if os.name == "nt" else "/tmp/eventhive-scanner.sock")
+# Comma-separated result plugins, each "package.module:attribute"
+DAEMON_PLUGINS = [p.strip() for p in os.environ.get("EVENTHIVE_DAEMON_PLUGINS", "").split(",") if p.strip()]
 
 # GUI settings
 WINDOW_WIDTH = int(os.environ.get("EVENTHIVE_WINDOW_WIDTH", "800"))
 WINDOW_HEIGHT = int(os.environ.get("EVENTHIVE_WINDOW_HEIGHT", "600"))
+# Camera preview refresh rate per lane, independent of capture and decode rates
+PREVIEW_FPS = float(os.environ.get("EVENTHIVE_PREVIEW_FPS", "15"))
+
+# Verification backlog: scans waiting for verification, and milliseconds spent gathering
+# a burst so its online lookups share bulk requests (single scans are never held back)
+VERIFY_QUEUE_SIZE = int(os.environ.get("EVENTHIVE_VERIFY_QUEUE_SIZE", "32"))
+VERIFY_BATCH_WINDOW_MS = float(os.environ.get("EVENTHIVE_VERIFY_BATCH_WINDOW_MS", "20"))
 
 # Logging settings
 LOG_DIR = os.path.join(BASE_DIR, "logs")
 os.makedirs(LOG_DIR, exist_ok=True)
 LOG_FILE = os.path.join(LOG_DIR, "scanner.log")
 LOG_LEVEL = os.environ.get("EVENTHIVE_LOG_LEVEL", "INFO")
+# Per-stage verification latency percentiles, written on exit
+LATENCY_REPORT_PATH = os.environ.get("EVENTHIVE_LATENCY_REPORT", os.path.join(LOG_DIR, "latency.json"))
@@ -0,0 +1,339 @@
+"""
+EventHive Attendee Index
+In-memory lookup of attendees by QR code so scans are answered without a
+network round trip or database query, reconciled with Supabase in the background.
+"""
+
+import logging
+import queue
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, TYPE_CHECKING
+
+from ..db.database import DBManager
+from .revocation import RevocationFilter
+
+if TYPE_CHECKING:
+    from ..api.supabase_client import SupabaseClient
+
+
+class IndexedAttendee:
+    """
+    Compact attendee record with its check-in state
+    """
+
+    __slots__ = ("id", "event_id", "name", "email", "ticket_type", "checked_in", "checked_in_at")
+
+    def __init__(self, id: str, event_id: str, name: str, email: str, ticket_type: str,
+                 checked_in: bool = False, checked_in_at: Optional[str] = None):
+        self.id = id
+        # Every attendee of an event shares one copy of the event ID
+        self.event_id = sys.intern(event_id or "")
+        self.name = name or ""
+        self.email = email or ""
+        self.ticket_type = sys.intern(ticket_type or "")
+        self.checked_in = checked_in
+        self.checked_in_at = checked_in_at
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "IndexedAttendee":
+        """
+        Build a record from a booking_attendees row
+
+        Args:
+            row: Attendee dictionary from Supabase or the local database
+
+        Returns:
+            The compact record
+        """
+        return cls(
+            row.get("id", ""), row.get("event_id", ""), row.get("attendee_name", ""),
+            row.get("attendee_email", ""), row.get("ticket_type", ""),
+            bool(row.get("checked_in")), row.get("checked_in_at") or None
+        )
+
+    def to_dict(self, qr_code: str) -> Dict[str, Any]:
+        """
+        Expand the record into the attendee dictionary shape used by the rest of the app
+
+        Args:
+            qr_code: QR code the record is stored under
+
+        Returns:
+            Attendee dictionary
+        """
+        return {
+            "id": self.id,
+            "event_id": self.event_id,
+            "qr_code": qr_code,
+            "attendee_name": self.name,
+            "attendee_email": self.email,
+            "ticket_type": self.ticket_type,
+            "checked_in": self.checked_in,
+            "checked_in_at": self.checked_in_at
+        }
+
+
+class AttendeeIndex:
+    """
+    Attendee records keyed by QR code, kept in step with the local database
+
+    Lookups are plain dictionary reads; writers (loading, the ticket poller and
+    local check-ins) serialize on a lock.
+    """
+
+    def __init__(self):
+        """Initialize an empty index"""
+        self._records: Dict[str, IndexedAttendee] = {}
+        # The same records by attendee ID, for signed tickets whose payload is not the stored QR code
+        self._by_id: Dict[str, IndexedAttendee] = {}
+        self._lock = threading.Lock()
+        self.loaded = False
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, db: DBManager) -> int:
+        """
+        Rebuild the index from the local database
+
+        Args:
+            db: Local database manager
+
+        Returns:
+            Number of attendees indexed
+        """
+        cursor = db.reader().cursor()
+        cursor.execute("""
+            SELECT qr_code, id, event_id, attendee_name, attendee_email, ticket_type, checked_in, checked_in_at
+            FROM booking_attendees WHERE qr_code IS NOT NULL AND qr_code != ''
+        """)
+        records = {
+            qr_code: IndexedAttendee(id, event_id, name, email, ticket_type, bool(checked_in), checked_in_at or None)
+            for qr_code, id, event_id, name, email, ticket_type, checked_in, checked_in_at in cursor.fetchall()
+        }
+        by_id = {record.id: record for record in records.values() if record.id}
+        with self._lock:
+            self._records = records
+            self._by_id = by_id
+            self.loaded = True
+        logging.info(f"Attendee index built with {len(records)} attendees")
+        return len(records)
+
+    def update(self, attendees: Iterable[Dict[str, Any]]) -> int:
+        """
+        Merge attendee rows fetched from Supabase
+
+        A local check-in is never undone by a row that has not caught up with it yet.
+
+        Args:
+            attendees: Attendee dictionaries
+
+        Returns:
+            Number of rows merged
+        """
+        count = 0
+        with self._lock:
+            for row in attendees:
+                qr_code = row.get("qr_code")
+                if not qr_code:
+                    continue
+                record = IndexedAttendee.from_row(row)
+                current = self._records.get(qr_code)
+                if current is not None and current.checked_in and not record.checked_in:
+                    record.checked_in = True
+                    record.checked_in_at = current.checked_in_at
+                self._records[qr_code] = record
+                if record.id:
+                    self._by_id[record.id] = record
+                count += 1
+        return count
+
+    def get(self, qr_code: str) -> Optional[IndexedAttendee]:
+        """
+        Get an attendee record without counting it as a scan lookup
+
+        Args:
+            qr_code: QR code to look up
+
+        Returns:
+            The attendee record, or None if the code is not indexed
+        """
+        return self._records.get(qr_code)
+
+    def get_by_id(self, attendee_id: str) -> Optional[IndexedAttendee]:
+        """
+        Get an attendee record by attendee ID
+
+        Args:
+            attendee_id: booking_attendees ID
+
+        Returns:
+            The attendee record, or None if no indexed attendee has that ID
+        """
+        return self._by_id.get(attendee_id)
+
+    def lookup(self, qr_code: str) -> Optional[IndexedAttendee]:
+        """
+        Find the attendee for a scanned QR code
+
+        Args:
+            qr_code: QR code to look up
+
+        Returns:
+            The attendee record, or None if the code is not indexed
+        """
+        record = self._records.get(qr_code)
+        if record is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return record
+
+    def mark_checked_in(self, qr_code: str, checked_in_at: Optional[str] = None) -> bool:
+        """
+        Record a local check-in
+
+        Args:
+            qr_code: QR code of the attendee
+            checked_in_at: Check-in timestamp (defaults to now)
+
+        Returns:
+            True if the attendee was indexed and not yet checked in
+        """
+        with self._lock:
+            record = self._records.get(qr_code)
+            if record is None or record.checked_in:
+                return False
+            record.checked_in = True
+            record.checked_in_at = checked_in_at or time.strftime('%Y-%m-%d %H:%M:%S')
+            return True
+
+    def __len__(self) -> int:
+        """Number of indexed attendees"""
+        return len(self._records)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get index counters
+
+        Returns:
+            Dictionary with size, checked-in count, hits and misses
+        """
+        with self._lock:
+            checked_in = sum(1 for record in self._records.values() if record.checked_in)
+        return {"size": len(self._records), "checked_in": checked_in, "hits": self.hits, "misses": self.misses}
+
+
+class IndexReconciler:
+    """
+    Re-checks codes answered from the index against Supabase on a background thread
+
+    Codes queued within a short window are looked up together in bulk requests.
+    """
+
+    def __init__(self, index: AttendeeIndex, supabase: "SupabaseClient", queue_size: int = 256,
+                 batch_window: float = 0.05, batch_size: int = 100, db: Optional[DBManager] = None,
+                 revocations: Optional[RevocationFilter] = None):
+        """
+        Initialize the reconciler
+
+        Args:
+            index: Index to correct
+            supabase: Supabase client to check against
+            db: Local database the corrections are also written to, so a reload keeps them
+            revocations: Revocation filter kept in step with the corrections
+            queue_size: Codes waiting to be checked; further codes are skipped while full
+            batch_window: Seconds to gather further codes after the first one arrives
+            batch_size: Most codes checked together
+        """
+        self.index = index
+        self.supabase = supabase
+        self.db = db
+        self.revocations = revocations
+        self.batch_window = batch_window
+        self.batch_size = batch_size
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self.reconciled = 0
+        self.conflicts = 0
+        self.skipped = 0
+
+    def start(self):
+        """Start the background thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="index-reconcile", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Ask the background thread to exit"""
+        if self._thread is not None:
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                pass
+            self._thread = None
+
+    def submit(self, qr_code: str):
+        """
+        Queue a code for checking
+
+        Args:
+            qr_code: QR code that was answered from the index
+        """
+        try:
+            self._queue.put_nowait(qr_code)
+        except queue.Full:
+            # The poller will bring the index up to date anyway
+            self.skipped += 1
+
+    def reconcile(self, qr_codes: List[str]) -> int:
+        """
+        Check codes against Supabase and merge the results
+
+        Args:
+            qr_codes: QR codes to check
+
+        Returns:
+            Number of codes Supabase reported as checked in while the index did not
+        """
+        rows = self.supabase.get_attendees_by_qr(qr_codes)
+        conflicts = 0
+        for qr_code, row in rows.items():
+            current = self.index.get(qr_code)
+            if current is not None and bool(row.get("checked_in")) and not current.checked_in:
+                conflicts += 1
+                logging.warning(f"QR code {qr_code} was already checked in elsewhere at {row.get('checked_in_at')}")
+        self.index.update(rows.values())
+        if rows and self.db is not None:
+            self.db.preload_tickets(list(rows.values()))
+        if self.revocations is not None:
+            self.revocations.update(rows.values())
+        self.reconciled += len(rows)
+        self.conflicts += conflicts
+        return conflicts
+
+    def _run(self):
+        """Background loop"""
+        while True:
+            qr_code = self._queue.get()
+            if qr_code is None:
+                return
+            batch = [qr_code]
+            deadline = time.monotonic() + self.batch_window
+            stopping = False
+            while len(batch) < self.batch_size:
+                try:
+                    qr_code = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if qr_code is None:
+                    stopping = True
+                    break
+                batch.append(qr_code)
+            try:
+                self.reconcile(batch)
+            except Exception as e:
+                logging.error(f"Index reconciliation error: {e}")
+            if stopping:
+                return
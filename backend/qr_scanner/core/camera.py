@@ -0,0 +1,253 @@
+"""
+EventHive Camera Manager
+Opens cameras in a low-latency mode, probes devices in the background and
+remembers the last configuration that worked for each camera.
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import cv2
+
+
+class CameraConfig(NamedTuple):
+    """Capture settings for one camera; zero or empty values leave the driver default"""
+    api: int
+    fourcc: str
+    width: int
+    height: int
+    fps: float
+
+
+def default_capture_api() -> int:
+    """
+    Pick the capture API that opens fastest on this platform
+
+    Returns:
+        OpenCV CAP_* constant
+    """
+    if sys.platform.startswith("linux"):
+        return cv2.CAP_V4L2
+    if sys.platform == "win32":
+        # Media Foundation can take seconds to open a device; DirectShow does not
+        return cv2.CAP_DSHOW
+    if sys.platform == "darwin":
+        return cv2.CAP_AVFOUNDATION
+    return cv2.CAP_ANY
+
+
+def _decode_fourcc(code: float) -> str:
+    """Turn a CAP_PROP_FOURCC value back into its four-character name"""
+    code = int(code)
+    return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4))
+
+
+class CameraManager:
+    """
+    Negotiates capture settings, probes devices and persists known-good configurations
+    """
+
+    def __init__(self, state_path: Optional[str] = None, width: int = 1280, height: int = 720,
+                 fps: float = 30, fourcc: str = "MJPG", buffer_size: int = 1,
+                 probe_indexes: Iterable[int] = range(3)):
+        """
+        Initialize the manager
+
+        Args:
+            state_path: JSON file holding known-good configurations and the last
+                probed devices (None = do not persist)
+            width: Requested frame width
+            height: Requested frame height
+            fps: Requested frame rate
+            fourcc: Requested pixel format; MJPG lets USB cameras reach full frame
+                rates at higher resolutions
+            buffer_size: Frames the driver may queue; 1 keeps capture on the newest frame
+            probe_indexes: Camera indexes checked by probing
+        """
+        self.state_path = state_path
+        self.requested = CameraConfig(default_capture_api(), fourcc, width, height, fps)
+        self.buffer_size = buffer_size
+        self.probe_indexes = list(probe_indexes)
+        self.known: Dict[int, CameraConfig] = {}
+        self.available: List[int] = []
+        self._in_use = set()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._load_state()
+
+    def open(self, index: int) -> Tuple[cv2.VideoCapture, int, int]:
+        """
+        Open a camera, trying its known-good configuration first
+
+        Args:
+            index: Camera index
+
+        Returns:
+            Tuple of (capture device, width, height)
+
+        Raises:
+            ValueError: If the camera cannot be opened in any configuration
+        """
+        api = self.requested.api
+        attempts = [self.known.get(index), self.requested, CameraConfig(api, "", 0, 0, 0)]
+        if api != cv2.CAP_ANY:
+            attempts.append(CameraConfig(cv2.CAP_ANY, "", 0, 0, 0))
+
+        tried = set()
+        for attempt in attempts:
+            if attempt is None or attempt in tried:
+                continue
+            tried.add(attempt)
+            capture = self._open_with(index, attempt)
+            if capture is None:
+                continue
+
+            actual = self._read_back(capture, attempt)
+            with self._lock:
+                self._in_use.add(index)
+                changed = self.known.get(index) != actual
+                self.known[index] = actual
+                if index not in self.available:
+                    self.available = sorted(self.available + [index])
+            if changed:
+                self._save_state()
+            logging.info(f"Camera {index} opened at {actual.width}x{actual.height} "
+                         f"{actual.fps:g}fps {actual.fourcc or 'default format'}")
+            return capture, actual.width, actual.height
+
+        # A stale configuration should not be retried first next time
+        with self._lock:
+            self.known.pop(index, None)
+        raise ValueError(f"Unable to open camera {index}")
+
+    def release(self, index: int, capture=None):
+        """
+        Release a camera opened by this manager
+
+        Args:
+            index: Camera index
+            capture: Capture device to release, if still open
+        """
+        if capture is not None:
+            capture.release()
+        with self._lock:
+            self._in_use.discard(index)
+
+    def probe(self) -> List[int]:
+        """
+        Check every probe index concurrently, skipping cameras already in use
+
+        Returns:
+            Sorted list of available camera indexes
+        """
+        with self._lock:
+            found = set(self._in_use)
+        candidates = [index for index in self.probe_indexes if index not in found]
+
+        def check(index):
+            capture = cv2.VideoCapture(index, self.requested.api)
+            if capture.isOpened():
+                found.add(index)
+            capture.release()
+
+        threads = [threading.Thread(target=check, args=(index,), daemon=True) for index in candidates]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with self._lock:
+            self.available = sorted(found)
+        self._save_state()
+        return self.available
+
+    def probe_async(self, callback: Optional[Callable[[List[int]], None]] = None) -> threading.Thread:
+        """
+        Probe devices on a background thread
+
+        Args:
+            callback: Called on the probe thread with the available camera indexes
+
+        Returns:
+            The probe thread
+        """
+        def run():
+            try:
+                devices = self.probe()
+            except Exception as e:
+                logging.error(f"Camera probe failed: {e}")
+                return
+            if callback is not None:
+                callback(devices)
+
+        thread = threading.Thread(target=run, name="camera-probe", daemon=True)
+        thread.start()
+        return thread
+
+    def _open_with(self, index: int, config: CameraConfig) -> Optional[cv2.VideoCapture]:
+        """Open a camera with the given settings, returning None unless it delivers a frame"""
+        capture = cv2.VideoCapture(index, config.api)
+        if not capture.isOpened():
+            capture.release()
+            return None
+        # The pixel format must be set before the size for V4L2 to honour both
+        if config.fourcc:
+            capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*config.fourcc))
+        if config.width and config.height:
+            capture.set(cv2.CAP_PROP_FRAME_WIDTH, config.width)
+            capture.set(cv2.CAP_PROP_FRAME_HEIGHT, config.height)
+        if config.fps:
+            capture.set(cv2.CAP_PROP_FPS, config.fps)
+        # Every queued frame is a frame of lag between the ticket and the decoder
+        capture.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer_size)
+
+        ret, _ = capture.read()
+        if not ret:
+            capture.release()
+            return None
+        return capture
+
+    def _read_back(self, capture: cv2.VideoCapture, requested: CameraConfig) -> CameraConfig:
+        """Get the settings the driver actually applied"""
+        fourcc = _decode_fourcc(capture.get(cv2.CAP_PROP_FOURCC))
+        return CameraConfig(
+            api=requested.api,
+            fourcc=fourcc if fourcc.isalnum() else requested.fourcc,
+            width=int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            height=int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            fps=float(capture.get(cv2.CAP_PROP_FPS))
+        )
+
+    def _load_state(self):
+        """Read known-good configurations from the state file"""
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+            self.known = {int(index): CameraConfig(**config) for index, config in state.get("cameras", {}).items()}
+            self.available = sorted(int(index) for index in state.get("available", []))
+        except (OSError, ValueError, TypeError) as e:
+            logging.warning(f"Ignoring unreadable camera state {self.state_path}: {e}")
+
+    def _save_state(self):
+        """Write known-good configurations to the state file"""
+        if not self.state_path:
+            return
+        with self._lock:
+            state = {
+                "cameras": {str(index): config._asdict() for index, config in self.known.items()},
+                "available": self.available
+            }
+        try:
+            with self._save_lock:
+                temp_path = f"{self.state_path}.tmp"
+                with open(temp_path, "w") as f:
+                    json.dump(state, f, indent=2)
+                os.replace(temp_path, self.state_path)
+        except OSError as e:
+            logging.warning(f"Could not save camera state: {e}")
@@ -0,0 +1,143 @@
+"""
+EventHive Check-In Service
+Verifies scanned QR codes and records check-ins; shared by the GUI and the headless daemon.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+
+from .scanner import QRScanner
+from ..db.database import DBManager, CHECKIN_DUPLICATE, CHECKIN_NOT_FOUND
+from ..utils.error_handler import ApiError
+from .. import config
+
+if TYPE_CHECKING:
+    from ..api.supabase_client import SupabaseClient
+
+
+class CheckInService:
+    """
+    Turns decoded payloads into check-in results
+    """
+
+    def __init__(self, scanner: QRScanner, db: DBManager, supabase: Optional["SupabaseClient"] = None,
+                 scanner_id: str = config.SCANNER_ID):
+        """
+        Initialize the service
+
+        Args:
+            scanner: Scanner used for verification
+            db: Local database manager
+            supabase: Supabase client for pushing scans, if connected
+            scanner_id: ID recorded with each scan
+        """
+        self.scanner = scanner
+        self.db = db
+        self.supabase = supabase
+        self.scanner_id = scanner_id
+        # Seeded once from the scan log; counted in memory from then on
+        self.scan_count = db.count_scans()
+
+    def prefetch(self, payloads: List[str]):
+        """
+        Prepare a backlog of payloads for verification with bulk online lookups
+
+        Runs on the pipeline's verification worker before the payloads are verified.
+
+        Args:
+            payloads: Decoded QR payloads about to be verified
+        """
+        self.scanner.prefetch_online(payloads)
+
+    def end_batch(self):
+        """Discard the lookups prefetched for a backlog once it has been verified"""
+        self.scanner.clear_prefetched()
+
+    def verify_and_check_in(self, qr_data: str) -> Optional[Dict[str, Any]]:
+        """
+        Verify a scanned QR code and record the check-in
+
+        Runs on the pipeline's verification worker.
+
+        Args:
+            qr_data: Decoded QR payload
+
+        Returns:
+            Dictionary with qr_code, event_id, attendee, is_valid and message, or
+            None for a repeat of a code that was just scanned
+        """
+        with self.scanner.latency.span("scan"):
+            return self._verify_and_check_in(qr_data)
+
+    def _verify_and_check_in(self, qr_data: str) -> Optional[Dict[str, Any]]:
+        """Body of verify_and_check_in; every stage is timed separately"""
+        result = {"qr_code": qr_data.strip(), "event_id": "", "attendee": "Unknown"}
+        try:
+            logging.info(f"Processing QR code: {qr_data[:20]}...")
+
+            # Use the enhanced verification system
+            is_valid, result_data, message = self.scanner.verify_qr_code(qr_data)
+            if result_data.get("status") == "cooldown":
+                # Keep showing the first result while the code stays in view
+                return None
+
+            # Get the QR code value - might be in different places depending on format
+            qr_code = result_data.get("qr_code", qr_data.strip())
+            result["qr_code"] = qr_code
+
+            # Check if attendee data is in the result
+            if "attendee" in result_data:
+                attendee = result_data["attendee"]
+                result["event_id"] = attendee.get('event_id', '')
+                if attendee.get('attendee_name'):
+                    result["attendee"] = f"{attendee.get('attendee_name', '')} ({attendee.get('attendee_email', '')})"
+                else:
+                    # Signed tickets not yet in the local database carry no name
+                    result["attendee"] = f"{attendee.get('ticket_type', '')} ticket {attendee.get('id', '')[:8]}"
+            else:
+                # Try to get from database
+                with self.scanner.latency.span("sqlite"):
+                    record = self.db.lookup_attendee(qr_code)
+
+                if record is not None:
+                    result["event_id"] = record.event_id
+                    result["attendee"] = f"{record.attendee_name} ({record.attendee_email})"
+
+            if is_valid:
+                # Valid QR code - check in unless another lane got there first
+                # Signed tickets may not be in the local database; their row is created
+                # so the check-in is recorded durably rather than only in the index
+                signed = "ticket" in result_data
+                with self.scanner.latency.span("checkin"):
+                    outcome = self.db.check_in_attendee(qr_code, self.scanner_id,
+                                                        result_data.get("attendee") if signed else None)
+
+                if outcome == CHECKIN_DUPLICATE or (signed and outcome == CHECKIN_NOT_FOUND):
+                    is_valid = False
+                    message = "Attendee already checked in (local database)"
+                elif self.supabase is not None:
+                    # Check in online too, so other devices cannot admit the same ticket
+                    try:
+                        with self.scanner.latency.span("push"):
+                            online = self.supabase.check_in_attendee(qr_code, self.scanner_id)
+                        # An online admission needs no later sync; a duplicate is not our scan
+                        self.db.settle_online_check_in(qr_code, self.scanner_id, online)
+                        if online == CHECKIN_DUPLICATE:
+                            is_valid = False
+                            message = "Attendee already checked in (another scanner)"
+                    except ApiError as e:
+                        logging.warning(f"Couldn't push scan, will sync later: {e}")
+
+                if is_valid:
+                    self.scan_count += 1
+                    if self.scanner.index is not None:
+                        self.scanner.index.mark_checked_in(qr_code)
+                    message = f"Valid QR code: {message}"
+            result["message"] = message
+            result["is_valid"] = is_valid
+
+        except Exception as e:
+            logging.error(f"Error processing QR code: {e}")
+            result["is_valid"] = False
+            result["message"] = f"Error: {str(e)}"
+        return result
@@ -0,0 +1,280 @@
+"""
+EventHive Decoder Backends
+Interchangeable QR decoders (pyzbar, OpenCV) and the startup calibration that picks one.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+import cv2
+from pyzbar import pyzbar
+
+
+class DecodedSymbol(NamedTuple):
+    """A single symbol decoded from a frame"""
+    data: str
+    symbol_type: str
+    rect: Tuple[int, int, int, int]
+    polygon: List[Tuple[int, int]]
+
+
+class DecoderBackend:
+    """
+    Base class for QR decoder backends
+
+    Backends may keep per-instance state (OpenCV detectors do), so each decode
+    thread or process uses its own instance.
+    """
+
+    name = "base"
+
+    def decode(self, image) -> List[DecodedSymbol]:
+        """
+        Decode all symbols in an image
+
+        Args:
+            image: Grayscale image array
+
+        Returns:
+            List of decoded symbols in image coordinates
+        """
+        raise NotImplementedError
+
+
+class PyzbarDecoder(DecoderBackend):
+    """Decoder backed by the zbar library"""
+
+    name = "pyzbar"
+
+    def decode(self, image) -> List[DecodedSymbol]:
+        return [
+            DecodedSymbol(
+                data=barcode.data.decode('utf-8'),
+                symbol_type=barcode.type,
+                rect=tuple(barcode.rect),
+                polygon=[(x, y) for x, y in barcode.polygon]
+            )
+            for barcode in pyzbar.decode(image)
+        ]
+
+
+class OpenCVDecoder(DecoderBackend):
+    """Decoder backed by cv2.QRCodeDetector, returning at most one code per image"""
+
+    name = "opencv"
+
+    def __init__(self):
+        self.detector = cv2.QRCodeDetector()
+
+    def decode(self, image) -> List[DecodedSymbol]:
+        data, points, _ = self.detector.detectAndDecode(image)
+        if not data or points is None:
+            return []
+        return [_symbol_from_corners(data, points[0])]
+
+
+class OpenCVMultiDecoder(OpenCVDecoder):
+    """Decoder backed by cv2.QRCodeDetector's multi-code detection"""
+
+    name = "opencv_multi"
+
+    def decode(self, image) -> List[DecodedSymbol]:
+        found, decoded, points, _ = self.detector.detectAndDecodeMulti(image)
+        if not found or points is None:
+            return []
+        return [_symbol_from_corners(data, corners) for data, corners in zip(decoded, points) if data]
+
+
+class ChainedDecoder(DecoderBackend):
+    """Tries each backend in turn and returns the first non-empty result"""
+
+    def __init__(self, backends: List[DecoderBackend]):
+        """
+        Initialize the chain
+
+        Args:
+            backends: Backends in the order they are tried
+        """
+        self.backends = backends
+        self.name = ",".join(backend.name for backend in backends)
+
+    def decode(self, image) -> List[DecodedSymbol]:
+        for backend in self.backends:
+            symbols = backend.decode(image)
+            if symbols:
+                return symbols
+        return []
+
+
+# Backends selectable by name; a comma-separated list of names builds a fallback chain
+DECODER_BACKENDS = {
+    "pyzbar": PyzbarDecoder,
+    "opencv": OpenCVDecoder,
+    "opencv_multi": OpenCVMultiDecoder,
+}
+
+
+def _symbol_from_corners(data: str, corners) -> DecodedSymbol:
+    """Build a symbol from the four corner points reported by OpenCV"""
+    polygon = [(int(round(x)), int(round(y))) for x, y in corners]
+    xs = [x for x, _ in polygon]
+    ys = [y for _, y in polygon]
+    return DecodedSymbol(data, "QRCODE", (min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys)), polygon)
+
+
+def create_decoder(spec: Union[str, DecoderBackend] = "pyzbar") -> DecoderBackend:
+    """
+    Create a decoder backend from its name
+
+    Args:
+        spec: Backend name such as "pyzbar" or "opencv", a comma-separated fallback
+            chain such as "pyzbar,opencv", or an existing backend (returned as is)
+
+    Returns:
+        The decoder backend
+
+    Raises:
+        ValueError: If a backend name is unknown
+    """
+    if isinstance(spec, DecoderBackend):
+        return spec
+    names = [name.strip() for name in spec.split(",") if name.strip()]
+    unknown = [name for name in names if name not in DECODER_BACKENDS]
+    if not names or unknown:
+        raise ValueError(f"Unknown decoder backend {spec!r}; choose from {', '.join(DECODER_BACKENDS)}")
+    backends = [DECODER_BACKENDS[name]() for name in names]
+    return backends[0] if len(backends) == 1 else ChainedDecoder(backends)
+
+
+class CalibrationResult(NamedTuple):
+    """Outcome of a decoder calibration run"""
+    backend: DecoderBackend
+    stats: Dict[str, Dict[str, Any]]
+    reference_frames: int
+
+
+def calibrate_decoder(frames: List[Any], candidates: Iterable[Union[str, DecoderBackend]],
+                      target_hit_rate: float = 0.9) -> Optional[CalibrationResult]:
+    """
+    Pick the fastest backend that decodes enough of the sample frames
+
+    A frame counts towards the hit rate when any candidate decoded a code in it,
+    so frames without a code only contribute to the measured cost.
+
+    Args:
+        frames: Grayscale sample frames
+        candidates: Backend names or instances to compare
+        target_hit_rate: Fraction of code-bearing frames a backend must decode
+
+    Returns:
+        CalibrationResult, or None if no candidate found a code in any frame
+    """
+    backends = [create_decoder(candidate) for candidate in candidates]
+    hits = {backend.name: set() for backend in backends}
+    elapsed = {backend.name: 0.0 for backend in backends}
+    for index, frame in enumerate(frames):
+        for backend in backends:
+            start = time.perf_counter()
+            try:
+                found = bool(backend.decode(frame))
+            except Exception as e:
+                logging.warning(f"Decoder {backend.name} failed during calibration: {e}")
+                found = False
+            elapsed[backend.name] += time.perf_counter() - start
+            if found:
+                hits[backend.name].add(index)
+
+    reference = set().union(*hits.values())
+    if not reference:
+        return None
+
+    stats = {
+        backend.name: {
+            "hit_rate": len(hits[backend.name]) / len(reference),
+            "avg_ms": elapsed[backend.name] * 1000 / len(frames)
+        }
+        for backend in backends
+    }
+    eligible = [backend for backend in backends if stats[backend.name]["hit_rate"] >= target_hit_rate]
+    if eligible:
+        chosen = min(eligible, key=lambda backend: stats[backend.name]["avg_ms"])
+    else:
+        # Nothing meets the target: prefer the most reliable, then the cheapest
+        chosen = max(backends, key=lambda backend: (stats[backend.name]["hit_rate"], -stats[backend.name]["avg_ms"]))
+    return CalibrationResult(chosen, stats, len(reference))
+
+
+class DecoderCalibrator:
+    """
+    Collects live frames and calibrates the decoder once enough have been seen
+
+    Each round runs on a background thread against copies of the sampled frames,
+    so the decode thread feeding it never waits; frames offered while a round
+    runs are not sampled.
+    """
+
+    def __init__(self, candidates: Iterable[str], frames: int = 20, target_hit_rate: float = 0.9,
+                 max_rounds: int = 5):
+        """
+        Initialize the calibrator
+
+        Args:
+            candidates: Backend names to compare
+            frames: Frames sampled per calibration round
+            target_hit_rate: Fraction of code-bearing frames a backend must decode
+            max_rounds: Rounds without any code in view before giving up and
+                keeping the configured backend
+        """
+        self.candidates = list(candidates)
+        self.frames = frames
+        self.target_hit_rate = target_hit_rate
+        self.max_rounds = max_rounds
+        self.rounds = 0
+        self.done = False
+        self.result: Optional[CalibrationResult] = None
+        self._samples: List[Any] = []
+        self._worker: Optional[threading.Thread] = None
+
+    def add_frame(self, gray):
+        """
+        Sample a frame, starting a background calibration round when the round is full
+
+        Args:
+            gray: Grayscale frame that passed gating
+        """
+        if self.done or (self._worker is not None and self._worker.is_alive()):
+            return
+        # The caller reuses its frame buffers; the round works on its own copy
+        self._samples.append(gray.copy())
+        if len(self._samples) < self.frames:
+            return
+
+        samples, self._samples = self._samples, []
+        self._worker = threading.Thread(target=self._run_round, args=(samples,),
+                                        name="decoder-calibration", daemon=True)
+        self._worker.start()
+
+    def join(self, timeout: Optional[float] = None):
+        """
+        Wait for a running calibration round to finish
+
+        Args:
+            timeout: Seconds to wait, or None to wait indefinitely
+        """
+        if self._worker is not None:
+            self._worker.join(timeout)
+
+    def _run_round(self, samples: List[Any]):
+        """Calibrate against one round of samples"""
+        self.rounds += 1
+        result = calibrate_decoder(samples, self.candidates, self.target_hit_rate)
+        if result is not None:
+            self.result = result
+            self.done = True
+            stats = ", ".join(f"{name} {s['hit_rate']:.0%}/{s['avg_ms']:.1f}ms" for name, s in result.stats.items())
+            logging.info(f"Decoder calibration picked {result.backend.name} ({stats})")
+        elif self.rounds >= self.max_rounds:
+            self.done = True
+            logging.info("Decoder calibration saw no codes; keeping the configured backend")
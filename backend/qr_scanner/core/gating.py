@@ -0,0 +1,148 @@
+"""
+EventHive Frame Gating
+Cheap motion and sharpness checks that decide whether a frame is worth decoding.
+"""
+
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+
+class FrameGate:
+    """
+    Pre-filter that skips unchanged idle scenes and motion-blurred frames
+    """
+
+    def __init__(self, sample_width: int = 160, motion_factor: float = 3.0, min_motion: float = 1.5,
+                 blur_factor: float = 0.5, idle_refresh: float = 1.0, hold_frames: int = 15,
+                 smoothing: float = 0.05):
+        """
+        Initialize the gate
+
+        Args:
+            sample_width: Approximate width of the downsampled frame used for scoring
+            motion_factor: Motion must exceed the idle noise floor by this factor to count
+            min_motion: Minimum mean absolute difference (0-255) that counts as motion
+            blur_factor: Moving frames sharper than this fraction of the typical sharpness are decoded
+            idle_refresh: Seconds after which an unchanged scene is decoded again anyway
+            hold_frames: Frames after a successful decode during which gating is bypassed
+            smoothing: Weight of the newest sample in the adaptive averages
+        """
+        self.sample_width = sample_width
+        self.motion_factor = motion_factor
+        self.min_motion = min_motion
+        self.blur_factor = blur_factor
+        self.idle_refresh = idle_refresh
+        self.hold_frames = hold_frames
+        self.smoothing = smoothing
+
+        self.noise_floor: Optional[float] = None
+        self.typical_sharpness: Optional[float] = None
+        self._previous = None
+        self._decoded_since_still = False
+        self._last_decode = 0.0
+        self._hold = 0
+
+        self.frames_seen = 0
+        self.skipped_idle = 0
+        self.skipped_blur = 0
+
+    def should_decode(self, gray) -> Tuple[bool, Optional[str]]:
+        """
+        Decide whether a frame deserves a decode attempt
+
+        Args:
+            gray: Grayscale frame
+
+        Returns:
+            Tuple of (decode, reason the frame was skipped or None)
+        """
+        self.frames_seen += 1
+        step = max(1, gray.shape[1] // self.sample_width)
+        small = gray[::step, ::step].astype(np.float32)
+        previous, self._previous = self._previous, small
+
+        # Keep decoding while a code is in view so real scans never wait on the gate
+        if self._hold > 0 or previous is None or previous.shape != small.shape:
+            return self._decode()
+
+        motion = float(np.mean(np.abs(small - previous)))
+        if motion <= self.motion_threshold:
+            # Only idle frames teach the gate what sensor noise looks like
+            self.noise_floor = self._average(self.noise_floor, motion)
+            # Decode once when the scene settles (a ticket held still), then rest
+            if not self._decoded_since_still or time.monotonic() - self._last_decode >= self.idle_refresh:
+                self._decoded_since_still = True
+                return self._decode()
+            self.skipped_idle += 1
+            return False, "idle"
+
+        self._decoded_since_still = False
+        sharpness = self.sharpness(small)
+        self.typical_sharpness = self._average(self.typical_sharpness, sharpness)
+        if sharpness < self.typical_sharpness * self.blur_factor:
+            self.skipped_blur += 1
+            return False, "blur"
+        return self._decode()
+
+    def record_result(self, hit: bool):
+        """
+        Tell the gate whether the last decode attempt found a code
+
+        Args:
+            hit: True if at least one symbol was decoded
+        """
+        if hit:
+            self._hold = self.hold_frames
+        elif self._hold > 0:
+            self._hold -= 1
+
+    @property
+    def motion_threshold(self) -> float:
+        """Mean absolute difference above which a frame counts as moving"""
+        if self.noise_floor is None:
+            return self.min_motion
+        return max(self.min_motion, self.noise_floor * self.motion_factor)
+
+    @staticmethod
+    def sharpness(image) -> float:
+        """
+        Variance of the Laplacian, a standard focus measure
+
+        Args:
+            image: Grayscale image as a float array
+
+        Returns:
+            Sharpness score; higher is sharper
+        """
+        laplacian = (image[:-2, 1:-1] + image[2:, 1:-1] + image[1:-1, :-2] + image[1:-1, 2:]
+                     - 4 * image[1:-1, 1:-1])
+        return float(laplacian.var())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get gating counters
+
+        Returns:
+            Dictionary with frames seen, frames skipped (total, idle, blur) and current thresholds
+        """
+        return {
+            "frames_seen": self.frames_seen,
+            "skipped": self.skipped_idle + self.skipped_blur,
+            "skipped_idle": self.skipped_idle,
+            "skipped_blur": self.skipped_blur,
+            "motion_threshold": round(self.motion_threshold, 2),
+            "typical_sharpness": round(self.typical_sharpness or 0.0, 1)
+        }
+
+    def _decode(self) -> Tuple[bool, None]:
+        """Mark a frame as passed to the decoder"""
+        self._last_decode = time.monotonic()
+        return True, None
+
+    def _average(self, current: Optional[float], sample: float) -> float:
+        """Exponential moving average seeded with the first sample"""
+        if current is None:
+            return sample
+        return current + self.smoothing * (sample - current)
@@ -0,0 +1,469 @@
+"""
+EventHive Scan Pipeline
+Runs capture, decode and verification on worker threads so the GUI only consumes results.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .scanner import QRScanner, FrameAnalysis, to_grayscale
+from .process_decoder import ProcessPoolDecoder
+
+
+class DropOldestQueue:
+    """
+    Bounded thread-safe queue that discards the oldest item when full
+    """
+
+    def __init__(self, maxsize: int):
+        """
+        Initialize the queue
+
+        Args:
+            maxsize: Maximum number of items held before the oldest is dropped
+        """
+        self._items = deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item: Any) -> Optional[Any]:
+        """
+        Add an item, dropping the oldest one if the queue is full
+
+        Args:
+            item: Item to enqueue
+
+        Returns:
+            The dropped item, or None if nothing was dropped
+        """
+        with self._cond:
+            dropped = None
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+                dropped = self._items.popleft()
+            self._items.append(item)
+            self._cond.notify()
+            return dropped
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Remove and return the oldest item
+
+        Args:
+            timeout: Seconds to wait for an item, or None to wait forever
+
+        Returns:
+            The item, or None on timeout or when the queue is closed
+        """
+        with self._cond:
+            if not self._items and not self._closed:
+                self._cond.wait(timeout)
+            if not self._items:
+                return None
+            return self._items.popleft()
+
+    def drain(self) -> List[Any]:
+        """Remove and return all queued items without blocking"""
+        with self._cond:
+            items = list(self._items)
+            self._items.clear()
+            return items
+
+    def close(self):
+        """Wake up all waiting consumers"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def qsize(self) -> int:
+        """Current number of queued items"""
+        return len(self._items)
+
+
+class StageStats:
+    """
+    Throughput counters for a single pipeline stage
+    """
+
+    def __init__(self, name: str, queue: Optional[DropOldestQueue] = None, window: float = 1.0):
+        """
+        Initialize stage counters
+
+        Args:
+            name: Stage name
+            queue: Input queue of the stage, used for depth and drop counts
+            window: Seconds over which the fps figure is averaged
+        """
+        self.name = name
+        self.queue = queue
+        self.window = window
+        self.total = 0
+        self.fps = 0.0
+        self._window_start = time.monotonic()
+        self._window_count = 0
+
+    def record(self, count: int = 1):
+        """
+        Record processed items
+
+        Args:
+            count: Number of items processed
+        """
+        self.total += count
+        self._window_count += count
+        now = time.monotonic()
+        elapsed = now - self._window_start
+        if elapsed >= self.window:
+            self.fps = self._window_count / elapsed
+            self._window_start = now
+            self._window_count = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the current counters
+
+        Returns:
+            Dictionary with fps, total processed, queue depth and dropped items
+        """
+        # Decay the fps reading if the stage has stalled
+        if time.monotonic() - self._window_start > 2 * self.window:
+            self.fps = 0.0
+        return {
+            "fps": round(self.fps, 1),
+            "total": self.total,
+            "queue_depth": self.queue.qsize() if self.queue else 0,
+            "dropped": self.queue.dropped if self.queue else 0
+        }
+
+
+class VerifyWorker:
+    """
+    Verification stage shared by one or more scan pipelines
+
+    A payload is verified at most once at a time: submitting it again while it
+    is queued or being verified returns the pending future instead of queueing it twice.
+    """
+
+    def __init__(self, verify_handler: Callable[[str], Optional[Dict[str, Any]]], queue_size: int = 8,
+                 batch_handler: Optional[Callable[[List[str]], None]] = None, batch_window: float = 0.0,
+                 batch_size: int = 100, batch_done: Optional[Callable[[], None]] = None):
+        """
+        Initialize the worker
+
+        Args:
+            verify_handler: Called on the worker thread with each decoded payload;
+                a non-None return value is passed to the submitter's reply callback
+            queue_size: Maximum payloads waiting for verification
+            batch_handler: Called with every payload of a backlog before they are verified
+                one by one, so their lookups can be made in bulk
+            batch_window: Seconds to keep gathering payloads once a backlog is seen;
+                a payload arriving on its own is never held back
+            batch_size: Most payloads handed to batch_handler at once
+            batch_done: Called once every payload handed to batch_handler has been
+                verified, so anything it prepared can be discarded
+        """
+        self.verify_handler = verify_handler
+        self.batch_handler = batch_handler
+        self.batch_window = batch_window
+        self.batch_size = batch_size
+        self.batch_done = batch_done
+        self.queue = DropOldestQueue(queue_size)
+        self.stats = StageStats("verify", self.queue)
+        self.deduplicated = 0
+        self._in_flight: Dict[str, Future] = {}
+        self._in_flight_lock = threading.Lock()
+        self._running = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, qr_data: str, reply: Optional[Callable[[Dict[str, Any]], None]] = None) -> Future:
+        """
+        Queue a payload for verification
+
+        Args:
+            qr_data: Decoded QR payload
+            reply: Called on the worker thread with the handler's result, unless
+                the result is None or the payload was already in flight
+
+        Returns:
+            Future resolving to the handler's result; cancelled if the payload
+            was dropped from a full queue
+        """
+        key = qr_data.strip()
+        with self._in_flight_lock:
+            pending = self._in_flight.get(key)
+            if pending is not None:
+                self.deduplicated += 1
+                return pending
+            future = Future()
+            self._in_flight[key] = future
+            dropped = self.queue.put((key, qr_data, reply, future))
+            if dropped is not None:
+                self._in_flight.pop(dropped[0], None)
+        if dropped is not None:
+            dropped[3].cancel()
+        return future
+
+    def in_flight(self) -> int:
+        """Number of payloads queued or being verified"""
+        return len(self._in_flight)
+
+    def start(self):
+        """Start the worker thread"""
+        if self._running.is_set():
+            return
+        self._running.set()
+        self._thread = threading.Thread(target=self._verify_loop, name="scan-verify", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        """
+        Stop the worker thread
+
+        Args:
+            timeout: Seconds to wait for the thread to exit
+        """
+        self._running.clear()
+        self.queue.close()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _verify_loop(self):
+        """Verify queued payloads and hand results back to their pipelines"""
+        while self._running.is_set():
+            item = self.queue.get(timeout=0.1)
+            if item is None:
+                continue
+            batch = self._gather_batch(item) if self.batch_handler is not None else [item]
+            try:
+                for item in batch:
+                    self._verify_item(item)
+            finally:
+                if len(batch) > 1 and self.batch_done is not None:
+                    try:
+                        self.batch_done()
+                    except Exception as e:
+                        logging.error(f"Verification batch error: {e}")
+        # Nothing will verify what is still queued
+        for _, _, _, future in self.queue.drain():
+            future.cancel()
+        with self._in_flight_lock:
+            self._in_flight.clear()
+
+    def _gather_batch(self, first: Tuple) -> List[Tuple]:
+        """Collect the backlog behind a payload and hand it to the batch handler"""
+        batch = [first]
+        while len(batch) < self.batch_size:
+            item = self.queue.get(timeout=0)
+            if item is None:
+                break
+            batch.append(item)
+        if len(batch) == 1:
+            return batch
+
+        # A backlog means a burst; give the rest of it a moment to arrive
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            item = self.queue.get(timeout=remaining) if remaining > 0 else None
+            if item is None:
+                break
+            batch.append(item)
+        try:
+            self.batch_handler([qr_data for _, qr_data, _, future in batch if not future.cancelled()])
+        except Exception as e:
+            logging.error(f"Verification batch error: {e}")
+        return batch
+
+    def _verify_item(self, item: Tuple):
+        """Verify one payload and resolve its future"""
+        key, qr_data, reply, future = item
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = self.verify_handler(qr_data)
+        except Exception as e:
+            logging.error(f"Verification worker error: {e}")
+            self._finish(key)
+            future.set_exception(e)
+            return
+        self._finish(key)
+        future.set_result(result)
+        if result is not None and reply is not None:
+            try:
+                reply(result)
+            except Exception as e:
+                logging.error(f"Verification reply error: {e}")
+        self.stats.record()
+
+    def _finish(self, key: str):
+        """Allow a payload to be submitted again"""
+        with self._in_flight_lock:
+            self._in_flight.pop(key, None)
+
+
+class ScanPipeline:
+    """
+    Capture -> decode pipeline for one camera lane, feeding a shared verification worker
+    """
+
+    def __init__(self, scanner: QRScanner, verifier: VerifyWorker, result_queue_size: int = 32,
+                 decode_pool: Optional[ProcessPoolDecoder] = None, name: str = "lane",
+                 on_result: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        Initialize the pipeline
+
+        Args:
+            scanner: QR scanner used for frame analysis; holds this lane's decode state
+            verifier: Verification worker, possibly shared with other lanes
+            result_queue_size: Maximum results waiting for the UI
+            decode_pool: Optional process pool to decode frames on; results are
+                still consumed in frame order
+            name: Lane name used for thread names and logging
+            on_result: Called on the verification thread with each of this lane's
+                results instead of queueing them for get_results
+        """
+        self.scanner = scanner
+        self.verifier = verifier
+        self.decode_pool = decode_pool
+        self.name = name
+        self.on_result = on_result
+
+        # The capture stage only ever keeps the newest frame
+        self.frame_queue = DropOldestQueue(1)
+        self.result_queue = DropOldestQueue(result_queue_size)
+
+        self.stats = {
+            "capture": StageStats("capture"),
+            "decode": StageStats("decode", self.frame_queue),
+            "verify": verifier.stats
+        }
+
+        self._capture = None
+        self._capture_lock = threading.Lock()
+        self._preview_lock = threading.Lock()
+        self._latest_frame = None
+        self._latest_analysis: Optional[FrameAnalysis] = None
+        self._running = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def set_capture(self, capture):
+        """
+        Swap the video source used by the capture stage
+
+        Args:
+            capture: cv2.VideoCapture-like object, or None to pause capture
+
+        Returns:
+            The previous capture object, which the caller should release
+        """
+        with self._capture_lock:
+            previous = self._capture
+            self._capture = capture
+        return previous
+
+    def start(self):
+        """Start the capture and decode threads"""
+        if self._running.is_set():
+            return
+        self._running.set()
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name=f"{self.name}-capture", daemon=True),
+            threading.Thread(
+                target=self._pooled_decode_loop if self.decode_pool else self._decode_loop,
+                name=f"{self.name}-decode", daemon=True
+            )
+        ]
+        for thread in self._threads:
+            thread.start()
+        logging.info(f"Scan pipeline {self.name} started")
+
+    def stop(self, timeout: float = 1.0):
+        """
+        Stop the capture and decode threads
+
+        Args:
+            timeout: Seconds to wait for each thread to exit
+        """
+        self._running.clear()
+        for q in (self.frame_queue, self.result_queue):
+            q.close()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        logging.info(f"Scan pipeline {self.name} stopped")
+
+    def get_preview(self) -> Tuple[Optional[Any], Optional[FrameAnalysis]]:
+        """
+        Get the newest captured frame and the most recent frame analysis
+
+        Returns:
+            Tuple of (frame, analysis); either may be None
+        """
+        with self._preview_lock:
+            return self._latest_frame, self._latest_analysis
+
+    def get_results(self) -> List[Dict[str, Any]]:
+        """Return all verification results for this lane produced since the last call"""
+        return self.result_queue.drain()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return fps and queue-depth counters for every stage"""
+        return {name: stage.snapshot() for name, stage in self.stats.items()}
+
+    def _capture_loop(self):
+        """Read frames from the camera, keeping only the newest one"""
+        while self._running.is_set():
+            with self._capture_lock:
+                capture = self._capture
+                ret, frame = capture.read() if capture is not None and capture.isOpened() else (False, None)
+            if not ret:
+                time.sleep(0.05)
+                continue
+            with self._preview_lock:
+                self._latest_frame = frame
+            self.frame_queue.put(frame)
+            self.stats["capture"].record()
+
+    def _decode_loop(self):
+        """Decode queued frames and forward payloads to verification"""
+        while self._running.is_set():
+            frame = self.frame_queue.get(timeout=0.1)
+            if frame is None:
+                continue
+            self._publish_analysis(self.scanner.analyze_frame(frame))
+
+    def _pooled_decode_loop(self):
+        """Keep the decode pool busy and consume its results in frame order"""
+        pool = self.decode_pool
+        gate = self.scanner.gate
+        while self._running.is_set():
+            frame = self.frame_queue.get(timeout=0.005 if pool.in_flight else 0.1)
+            if frame is not None:
+                gray = to_grayscale(frame)
+                if gate is None or gate.should_decode(gray)[0]:
+                    # Calibration runs here; the chosen backend applies to every later frame
+                    self.scanner.feed_calibrator(gray)
+                    pool.submit(gray, self.scanner.decoder.name)
+                else:
+                    self.stats["decode"].record()
+            for analysis in pool.collect(block=pool.in_flight >= pool.workers):
+                if gate is not None:
+                    gate.record_result(bool(analysis.symbols))
+                self._publish_analysis(analysis)
+
+    def _publish_analysis(self, analysis: FrameAnalysis):
+        """Expose an analysis to the preview and forward its payloads to verification"""
+        # A gated frame says nothing new about the scene; keep the last overlay
+        if not analysis.skipped:
+            with self._preview_lock:
+                self._latest_analysis = analysis
+        # Every ticket in view is verified; the verifier drops repeats of one in flight
+        for payload in dict.fromkeys(symbol.data for symbol in analysis.symbols):
+            self.verifier.submit(payload, self.on_result or self.result_queue.put)
+        self.stats["decode"].record()
@@ -0,0 +1,134 @@
+"""
+EventHive Paged Preload
+Streams an event's tickets from Supabase into the local database page by page,
+fetching each page while the previous one is stored.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from ..db.database import DBManager
+from ..utils.error_handler import ApiError
+from .. import config
+
+if TYPE_CHECKING:
+    from ..api.supabase_client import SupabaseClient
+
+
+def advance_watermark(rows: List[Dict[str, Any]], watermark: Tuple[Optional[str], Optional[str]]
+                      ) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Move an (updated_at, id) watermark past a batch of fetched rows
+
+    Args:
+        rows: Attendee rows
+        watermark: Current (updated_at, id), (None, None) if nothing was fetched yet
+
+    Returns:
+        The greater of the watermark and the newest row's (updated_at, id)
+    """
+    keys = [(row['updated_at'], row.get('id') or '') for row in rows if row.get('updated_at')]
+    if watermark[0] is not None:
+        keys.append((watermark[0], watermark[1] or ''))
+    return max(keys) if keys else (None, None)
+
+
+class PagedPreloader:
+    """
+    Downloads an event in pages keyed on ticket ID and writes each page as it arrives
+
+    Each page starts after the last ID of the one before, so a worker thread
+    fetches the next page while the calling thread stores the current one and
+    at most two pages are held in memory. The last stored ID is saved after each
+    page; an interrupted download resumes after it.
+    """
+
+    def __init__(self, db: DBManager, supabase: "SupabaseClient", page_size: int = config.SUPABASE_PAGE_SIZE):
+        """
+        Initialize the preloader
+
+        Args:
+            db: Local database manager
+            supabase: Supabase client
+            page_size: Rows per page; at most the server's row limit
+        """
+        self.db = db
+        self.supabase = supabase
+        self.page_size = page_size
+
+    def run(self, event_id: str, stop: Optional[threading.Event] = None,
+            on_page: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+            on_progress: Optional[Callable[[int, Optional[int]], None]] = None) -> Dict[str, Any]:
+        """
+        Download an event, resuming an interrupted download if there is one
+
+        Args:
+            event_id: ID of the event
+            stop: Event that interrupts the download when set
+            on_page: Called with each page after it is stored
+            on_progress: Called with (rows stored, total rows or None if unknown)
+
+        Returns:
+            Dictionary with this run's rows, inserted, updated and unchanged counts,
+            stored, the rows stored including those of an interrupted earlier run,
+            the (updated_at, id) watermark, and complete, False if interrupted
+
+        Raises:
+            ApiError: If a page request fails; the progress made is kept
+        """
+        progress = self.db.get_preload_progress(event_id)
+        last_id = progress["last_id"] if progress else None
+        stored = progress["rows"] if progress else 0
+        watermark = (progress["updated_at"], progress["id"]) if progress else (None, None)
+        if last_id is not None:
+            logging.info(f"Resuming download of event {event_id} after ticket {last_id}")
+        try:
+            total = self.supabase.count_tickets(event_id)
+        except ApiError as e:
+            logging.warning(f"Couldn't count tickets, progress will have no total: {e}")
+            total = None
+
+        result = {"rows": 0, "inserted": 0, "updated": 0, "unchanged": 0, "complete": False}
+        complete = False
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="preload") as executor:
+            future = executor.submit(self.supabase.fetch_ticket_page, event_id, last_id, self.page_size)
+            try:
+                while future is not None and not (stop and stop.is_set()):
+                    rows = future.result()
+                    complete = len(rows) < self.page_size
+                    # Request the next page before storing this one; nothing exists past a short page
+                    future = None if complete else executor.submit(
+                        self.supabase.fetch_ticket_page, event_id, rows[-1]['id'], self.page_size)
+
+                    if rows:
+                        counts = self.db.preload_tickets(rows)
+                        for key in ("inserted", "updated", "unchanged"):
+                            result[key] += counts[key]
+                        watermark = advance_watermark(rows, watermark)
+                        last_id = rows[-1]['id']
+                        if on_page is not None:
+                            on_page(rows)
+                    result["rows"] += len(rows)
+                    stored += len(rows)
+
+                    if last_id is not None:
+                        self.db.set_preload_progress(event_id, last_id, stored, *watermark)
+                    if on_progress is not None:
+                        on_progress(stored, max(total, stored) if total is not None else None)
+            finally:
+                if future is not None:
+                    future.cancel()
+
+        result["watermark"] = watermark
+        result["stored"] = stored
+        if not complete:
+            logging.info(f"Download of event {event_id} interrupted after ticket {last_id}")
+            return result
+        self.db.set_preload_progress(event_id, None)
+        result["complete"] = True
+        logging.info(f"Downloaded {stored} tickets for event {event_id}: {result['inserted']} inserted, "
+                     f"{result['updated']} updated, {result['unchanged']} unchanged")
+        return result
@@ -0,0 +1,171 @@
+"""
+EventHive Preprocessing Cascade
+Image enhancements retried under a per-frame time budget when a plain decode fails,
+for low-light scenes and glossy phone screens.
+"""
+
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import cv2
+
+from .decoders import DecodedSymbol
+
+
+def _clahe(gray):
+    """Local contrast equalization for dim or unevenly lit codes"""
+    return cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8)).apply(gray)
+
+
+def _adaptive_threshold(gray):
+    """Binarize against the local mean to cut through glare gradients"""
+    return cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 5)
+
+
+def _invert(gray):
+    """Light-on-dark codes from dark-mode screens"""
+    return cv2.bitwise_not(gray)
+
+
+def _sharpen(gray):
+    """Unsharp mask for slightly defocused codes"""
+    blurred = cv2.GaussianBlur(gray, (0, 0), 3)
+    return cv2.addWeighted(gray, 1.5, blurred, -0.5, 0)
+
+
+# Available steps in their default order
+PREPROCESS_STEPS: Dict[str, Callable[[Any], Any]] = {
+    "clahe": _clahe,
+    "adaptive": _adaptive_threshold,
+    "invert": _invert,
+    "sharpen": _sharpen,
+}
+
+
+class PreprocessStepStats:
+    """
+    Success rate, cost and recent success of one cascade step
+    """
+
+    def __init__(self, smoothing: float = 0.1):
+        """
+        Initialize counters
+
+        Args:
+            smoothing: Weight of the newest attempt in the recent success score
+        """
+        self.smoothing = smoothing
+        self.attempts = 0
+        self.hits = 0
+        self.total_time = 0.0
+        self.recent = 0.0
+
+    def record(self, hit: bool, elapsed: float):
+        """
+        Record one attempt
+
+        Args:
+            hit: Whether the step's output decoded
+            elapsed: Time spent preprocessing and decoding, in seconds
+        """
+        self.attempts += 1
+        self.hits += 1 if hit else 0
+        self.total_time += elapsed
+        self.recent += self.smoothing * ((1.0 if hit else 0.0) - self.recent)
+
+    @property
+    def avg_time(self) -> float:
+        """Average cost of an attempt in seconds"""
+        return self.total_time / self.attempts if self.attempts else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the current counters
+
+        Returns:
+            Dictionary with attempts, hits, hit rate, average cost in milliseconds and recent success
+        """
+        return {
+            "attempts": self.attempts,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.attempts if self.attempts else 0.0,
+            "avg_ms": self.avg_time * 1000,
+            "recent": round(self.recent, 3)
+        }
+
+
+class PreprocessCascade:
+    """
+    Tries enhancement steps in order of recent success until one decodes or the budget runs out
+    """
+
+    def __init__(self, steps: Iterable[str] = tuple(PREPROCESS_STEPS), budget_ms: float = 15.0):
+        """
+        Initialize the cascade
+
+        Args:
+            steps: Names of the steps to use, from PREPROCESS_STEPS; also the tie-break order
+            budget_ms: Time allowed per frame; a step is only started while budget remains
+
+        Raises:
+            ValueError: If a step name is unknown
+        """
+        self.steps = list(steps)
+        unknown = [name for name in self.steps if name not in PREPROCESS_STEPS]
+        if unknown:
+            raise ValueError(f"Unknown preprocessing steps: {', '.join(unknown)}")
+        self.budget = budget_ms / 1000
+        self.stats = {name: PreprocessStepStats() for name in self.steps}
+        self.runs = 0
+        self.rescued = 0
+        self.budget_exhausted = 0
+
+    def order(self) -> List[str]:
+        """
+        Current step order: most recently successful first, cheaper first on ties
+
+        Returns:
+            Step names in the order they will be tried
+        """
+        return sorted(self.steps, key=lambda name: (-self.stats[name].recent, self.stats[name].avg_time))
+
+    def run(self, gray, decode: Callable[[Any], List[DecodedSymbol]]) -> Tuple[List[DecodedSymbol], Optional[str]]:
+        """
+        Run the cascade on a frame the plain decode missed
+
+        Args:
+            gray: Grayscale image
+            decode: Decodes a preprocessed image into symbols
+
+        Returns:
+            Tuple of (symbols, name of the step that produced them)
+        """
+        self.runs += 1
+        deadline = time.perf_counter() + self.budget
+        for name in self.order():
+            start = time.perf_counter()
+            if start >= deadline:
+                self.budget_exhausted += 1
+                break
+            symbols = decode(PREPROCESS_STEPS[name](gray))
+            self.stats[name].record(bool(symbols), time.perf_counter() - start)
+            if symbols:
+                self.rescued += 1
+                return symbols, name
+        return [], None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cascade counters
+
+        Returns:
+            Dictionary with runs, frames rescued, runs cut short by the budget,
+            the current order and per-step counters
+        """
+        return {
+            "runs": self.runs,
+            "rescued": self.rescued,
+            "budget_exhausted": self.budget_exhausted,
+            "order": self.order(),
+            "steps": {name: stats.snapshot() for name, stats in self.stats.items()}
+        }
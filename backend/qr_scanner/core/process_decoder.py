@@ -0,0 +1,246 @@
+"""
+EventHive Process-Pool Decoder
+Fans frame decoding out to worker processes, passing frames through shared memory.
+"""
+
+import itertools
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .scanner import FrameAnalysis, decode_symbols, decode_downscaled_first, to_grayscale
+from .decoders import DecoderBackend, create_decoder
+
+# Shared memory segments attached by this worker process, keyed by frame slot
+_attached_segments: Dict[int, shared_memory.SharedMemory] = {}
+# Frame slot IDs handed out by the parent process
+_slot_ids = itertools.count()
+# Decoder backends created by this worker process, keyed by spec
+_decoders: Dict[str, DecoderBackend] = {}
+
+
+def _decode_shared_frame(slot_id: int, shm_name: str, shape: Tuple[int, ...], downscale_min_width: Optional[int],
+                         decoder_spec: str = "pyzbar") -> FrameAnalysis:
+    """
+    Decode a grayscale frame stored in a shared memory segment (runs in a worker process)
+
+    Args:
+        slot_id: ID of the frame slot; a new segment name for it means the slot grew
+        shm_name: Name of the shared memory segment holding the frame
+        shape: Shape of the frame array
+        downscale_min_width: Minimum width for a half-resolution first pass, or None to disable it
+        decoder_spec: Decoder backend name (see decoders.create_decoder)
+
+    Returns:
+        FrameAnalysis for the frame
+    """
+    shm = _attached_segments.get(slot_id)
+    if shm is None or shm.name != shm_name:
+        if shm is not None:
+            # The parent replaced the slot's segment; let go of the old one
+            shm.close()
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _attached_segments[slot_id] = shm
+    image = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+    decoder = _decoders.get(decoder_spec)
+    if decoder is None:
+        decoder = _decoders[decoder_spec] = create_decoder(decoder_spec)
+
+    start = time.perf_counter()
+    if downscale_min_width is None:
+        symbols, strategy = decode_symbols(image, decoder=decoder), "full"
+    else:
+        symbols, strategy = decode_downscaled_first(image, downscale_min_width, decoder)
+    return FrameAnalysis(symbols, time.perf_counter() - start, strategy if symbols else None)
+
+
+class _FrameSlot:
+    """A reusable shared memory buffer holding one frame in flight"""
+
+    def __init__(self, nbytes: int):
+        self.id = next(_slot_ids)
+        self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+
+    def write(self, gray) -> Tuple[int, ...]:
+        """
+        Copy a grayscale frame into the slot, growing it if needed
+
+        Args:
+            gray: Grayscale frame array
+
+        Returns:
+            Shape of the stored frame
+        """
+        if gray.nbytes > self.shm.size:
+            self.release()
+            self.shm = shared_memory.SharedMemory(create=True, size=gray.nbytes)
+        np.ndarray(gray.shape, dtype=np.uint8, buffer=self.shm.buf)[...] = gray
+        return gray.shape
+
+    def read(self, shape: Tuple[int, ...]):
+        """Return a copy of the frame currently stored in the slot"""
+        return np.ndarray(shape, dtype=np.uint8, buffer=self.shm.buf).copy()
+
+    def release(self):
+        """Free the underlying shared memory"""
+        self.shm.close()
+        self.shm.unlink()
+
+
+class ProcessPoolDecoder:
+    """
+    Decodes frames on a pool of worker processes and returns results in frame order
+    """
+
+    def __init__(self, workers: int = 0, downscale_first: bool = True, downscale_min_width: int = 960,
+                 decoder: str = "pyzbar"):
+        """
+        Start the worker pool
+
+        Args:
+            workers: Number of worker processes (0 = one per CPU core, minus one)
+            downscale_first: Try a half-resolution decode before full resolution
+            downscale_min_width: Frames narrower than this skip the half-resolution pass
+            decoder: Default decoder backend name for submitted frames
+        """
+        self.workers = workers if workers > 0 else max(1, (os.cpu_count() or 2) - 1)
+        self.downscale_min_width = downscale_min_width if downscale_first else None
+        self.decoder = decoder
+        self._fallback_decoders: Dict[str, DecoderBackend] = {}
+        methods = multiprocessing.get_all_start_methods()
+        # Forking a process that already runs capture and GUI threads is unsafe
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        self._free_slots: List[_FrameSlot] = []
+        self._pending = deque()
+        self.broken = False
+        logging.info(f"Process-pool decoder started with {self.workers} workers")
+
+    @property
+    def in_flight(self) -> int:
+        """Number of frames submitted but not yet collected"""
+        return len(self._pending)
+
+    def submit(self, frame, decoder: Optional[str] = None):
+        """
+        Queue a frame for decoding
+
+        Args:
+            frame: BGR or grayscale frame
+            decoder: Decoder backend name for this frame (defaults to the pool's)
+        """
+        gray = to_grayscale(frame)
+        slot = self._free_slots.pop() if self._free_slots else _FrameSlot(gray.nbytes)
+        shape = slot.write(gray)
+        decoder = decoder or self.decoder
+
+        future = None
+        if not self.broken:
+            try:
+                future = self._executor.submit(_decode_shared_frame, slot.id, slot.shm.name, shape,
+                                               self.downscale_min_width, decoder)
+            except Exception as e:
+                self._mark_broken(e)
+        self._pending.append((future, slot, shape, decoder))
+
+    def collect(self, block: bool = False) -> List[FrameAnalysis]:
+        """
+        Collect finished results in submission order
+
+        Args:
+            block: Wait for at least the oldest frame to finish
+
+        Returns:
+            List of frame analyses, oldest first
+        """
+        results = []
+        while self._pending:
+            future, slot, shape, decoder = self._pending[0]
+            if future is not None and not future.done() and not (block and not results):
+                break
+            self._pending.popleft()
+            results.append(self._resolve(future, slot, shape, decoder))
+            self._free_slots.append(slot)
+        return results
+
+    def decode(self, frame) -> FrameAnalysis:
+        """
+        Decode a single frame synchronously
+
+        Args:
+            frame: BGR or grayscale frame
+
+        Returns:
+            FrameAnalysis for the frame
+        """
+        self.submit(frame)
+        results = []
+        while self._pending:
+            results.extend(self.collect(block=True))
+        return results[-1]
+
+    def close(self):
+        """Stop the workers and free all shared memory"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        for future, slot, shape, decoder in self._pending:
+            slot.release()
+        for slot in self._free_slots:
+            slot.release()
+        self._pending.clear()
+        self._free_slots = []
+
+    def _resolve(self, future, slot: _FrameSlot, shape: Tuple[int, ...], decoder_spec: str) -> FrameAnalysis:
+        """Get a worker result, decoding in-process if the pool has failed"""
+        if future is not None:
+            try:
+                return future.result()
+            except Exception as e:
+                self._mark_broken(e)
+
+        start = time.perf_counter()
+        symbols, strategy = [], None
+        try:
+            decoder = self._fallback_decoders.get(decoder_spec)
+            if decoder is None:
+                decoder = self._fallback_decoders[decoder_spec] = create_decoder(decoder_spec)
+            if self.downscale_min_width is None:
+                symbols, strategy = decode_symbols(slot.read(shape), decoder=decoder), "full"
+            else:
+                symbols, strategy = decode_downscaled_first(slot.read(shape), self.downscale_min_width, decoder)
+        except Exception as e:
+            logging.error(f"QR decoding error: {e}")
+        return FrameAnalysis(symbols, time.perf_counter() - start, strategy if symbols else None)
+
+    def _mark_broken(self, error: Exception):
+        """Switch to in-process decoding after a pool failure"""
+        if not self.broken:
+            logging.error(f"Decode worker pool failed, falling back to in-process decoding: {error}")
+            self.broken = True
+
+
+def create_decode_pool(mode: str, workers: int = 0, **options) -> Optional[ProcessPoolDecoder]:
+    """
+    Create the decode backend selected in the configuration
+
+    Args:
+        mode: "process_pool" to decode on worker processes, anything else for in-process decoding
+        workers: Number of worker processes (0 = automatic)
+        **options: Extra ProcessPoolDecoder options
+
+    Returns:
+        ProcessPoolDecoder, or None when decoding should stay in-process
+    """
+    if mode != "process_pool":
+        return None
+    try:
+        return ProcessPoolDecoder(workers, **options)
+    except Exception as e:
+        logging.warning(f"Process-pool decoder unavailable, decoding in-process: {e}")
+        return None
@@ -0,0 +1,252 @@
+"""
+EventHive Revocation Filter
+Compact set of revoked QR codes and ticket IDs (refunds, cancellations) that
+offline scanners check before admitting anyone.
+"""
+
+import hashlib
+import math
+import sqlite3
+import struct
+import threading
+import zlib
+from typing import Any, Dict, Iterable
+
+# Attendee verification statuses that mean the ticket must not be admitted
+REVOKED_STATUSES = ("revoked", "cancelled", "refunded")
+
+
+def is_revoked_row(row: Dict[str, Any]) -> bool:
+    """
+    Check whether an attendee row has been revoked
+
+    Args:
+        row: booking_attendees row
+
+    Returns:
+        True if the row's verification status revokes the ticket
+    """
+    return (row.get("verification_status") or "").lower() in REVOKED_STATUSES
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings using double hashing
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 1e-6):
+        """
+        Size the filter
+
+        Args:
+            capacity: Number of items the error rate is guaranteed for
+            error_rate: False positive probability at capacity
+        """
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        """Bit positions for an item"""
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1, h2 = struct.unpack(">QQ", digest)
+        h2 |= 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str):
+        """
+        Add an item
+
+        Args:
+            item: Item to add
+        """
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        """Check whether an item may have been added (no false negatives)"""
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevocationFilter:
+    """
+    Bloom filter of revoked codes plus exact sets for changes since it was built
+
+    The Bloom filter is rebuilt from the full revocation list when an event is
+    loaded; revocations reported by the poller afterwards go to an exact
+    overflow set, and tickets reinstated since the build are listed exactly so
+    they are not held back by the Bloom filter.
+    """
+
+    _HEADER = struct.Struct(">4sBBdIIIII")
+    _MAGIC = b"EHRF"
+    _VERSION = 2
+
+    def __init__(self, revoked: Iterable[str] = (), error_rate: float = 1e-6, slack: float = 0.5):
+        """
+        Build the filter
+
+        Args:
+            revoked: Revoked QR codes and ticket IDs
+            error_rate: False positive probability while within capacity
+            slack: Extra capacity reserved for later revocations, as a fraction of the initial count
+        """
+        self.error_rate = error_rate
+        self.slack = slack
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.rebuild(revoked)
+
+    def rebuild(self, revoked: Iterable[str]):
+        """
+        Replace the contents with a full revocation list
+
+        Args:
+            revoked: Every revoked QR code and ticket ID
+        """
+        revoked = list(revoked)
+        bloom = BloomFilter(max(1024, int(len(revoked) * (1 + self.slack))), self.error_rate)
+        for qr_code in revoked:
+            bloom.add(qr_code)
+        with self._lock:
+            self.bloom = bloom
+            self.overflow = set()
+            self.reinstated = set()
+
+    def load(self, conn: sqlite3.Connection):
+        """
+        Rebuild from the local booking_attendees table
+
+        Both the QR code and the ID of each revoked row are added, since a signed
+        ticket's payload differs from the QR code stored for it.
+
+        Args:
+            conn: SQLite connection
+        """
+        placeholders = ",".join("?" * len(REVOKED_STATUSES))
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT qr_code, id FROM booking_attendees WHERE lower(verification_status) IN ({placeholders})",
+                       REVOKED_STATUSES)
+        self.rebuild(key for row in cursor.fetchall() for key in row if key)
+
+    def __contains__(self, qr_code: str) -> bool:
+        """Check whether a QR code or ticket ID is revoked"""
+        if qr_code in self.reinstated:
+            return False
+        revoked = qr_code in self.overflow or qr_code in self.bloom
+        if revoked:
+            self.hits += 1
+        return revoked
+
+    def update(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """
+        Apply revocation changes from polled attendee rows
+
+        Args:
+            rows: booking_attendees rows
+
+        Returns:
+            Number of revocations added
+        """
+        added = 0
+        with self._lock:
+            for row in rows:
+                revoked = is_revoked_row(row)
+                new = False
+                for key in (row.get("qr_code"), row.get("id")):
+                    if not key:
+                        continue
+                    if revoked:
+                        self.reinstated.discard(key)
+                        if key not in self.overflow and key not in self.bloom:
+                            self.overflow.add(key)
+                            new = True
+                    elif key in self.overflow:
+                        self.overflow.discard(key)
+                    elif key in self.bloom:
+                        # Cannot be removed from the Bloom filter; may also be a false positive
+                        self.reinstated.add(key)
+                added += new
+        return added
+
+    @property
+    def needs_rebuild(self) -> bool:
+        """Whether the exact sets have grown enough that the filter should be rebuilt"""
+        return self.bloom.count + len(self.overflow) > self.bloom.capacity or len(self.reinstated) > 1024
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the filter for distribution to other scanners
+
+        Returns:
+            Header, Bloom bit array and the compressed exact sets
+        """
+        with self._lock:
+            overflow = zlib.compress("\n".join(sorted(self.overflow)).encode())
+            reinstated = zlib.compress("\n".join(sorted(self.reinstated)).encode())
+        header = self._HEADER.pack(self._MAGIC, self._VERSION, self.bloom.hashes, self.error_rate, self.bloom.size,
+                                   self.bloom.capacity, self.bloom.count, len(overflow), len(reinstated))
+        return header + bytes(self.bloom.bits) + overflow + reinstated
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "RevocationFilter":
+        """
+        Load a serialized filter
+
+        Args:
+            data: Output of to_bytes
+
+        Returns:
+            The filter
+
+        Raises:
+            ValueError: If the data is not a serialized filter
+        """
+        if len(data) < cls._HEADER.size:
+            raise ValueError("Truncated revocation filter")
+        (magic, version, hashes, error_rate, size, capacity, count,
+         overflow_len, reinstated_len) = cls._HEADER.unpack_from(data)
+        if magic != cls._MAGIC or version != cls._VERSION:
+            raise ValueError("Not a revocation filter")
+        if not 0 < error_rate < 1:
+            raise ValueError("Invalid revocation filter error rate")
+        bits_len = (size + 7) // 8
+        if len(data) != cls._HEADER.size + bits_len + overflow_len + reinstated_len:
+            raise ValueError("Truncated revocation filter")
+
+        # Later rebuilds keep the sender's false positive rate
+        result = cls(error_rate=error_rate)
+        bloom = result.bloom
+        bloom.capacity, bloom.size, bloom.hashes, bloom.count = capacity, size, hashes, count
+        offset = cls._HEADER.size
+        bloom.bits = bytearray(data[offset:offset + bits_len])
+        offset += bits_len
+        result.overflow = _decode_set(data[offset:offset + overflow_len])
+        result.reinstated = _decode_set(data[offset + overflow_len:])
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get filter counters
+
+        Returns:
+            Dictionary with Bloom entries, exact set sizes, serialized size and hits
+        """
+        return {
+            "bloom_entries": self.bloom.count,
+            "overflow": len(self.overflow),
+            "reinstated": len(self.reinstated),
+            "bytes": len(self.bloom.bits),
+            "hits": self.hits
+        }
+
+
+def _decode_set(data: bytes) -> set:
+    """Decompress a newline-joined set of codes"""
+    text = zlib.decompress(data).decode()
+    return set(text.split("\n")) if text else set()
@@ -0,0 +1,135 @@
+"""
+EventHive Runtime Wiring
+Builds scanners and decode backends from config.py for the GUI and the headless daemon.
+"""
+
+from typing import Optional, TYPE_CHECKING
+
+from .scanner import QRScanner
+from .decoders import DecoderCalibrator
+from .preprocess import PreprocessCascade
+from .camera import CameraManager
+from .checkin import CheckInService
+from .pipeline import VerifyWorker
+from .attendee_index import AttendeeIndex
+from .tickets import parse_keyring
+from .revocation import RevocationFilter
+from .process_decoder import ProcessPoolDecoder, create_decode_pool
+from ..db.database import DBManager
+from .. import config
+
+if TYPE_CHECKING:
+    from ..api.supabase_client import SupabaseClient
+
+
+def create_scanner(supabase: Optional["SupabaseClient"] = None, db: Optional[DBManager] = None,
+                   event_id: Optional[str] = None) -> QRScanner:
+    """
+    Create a scanner configured from config.py
+
+    Args:
+        supabase: Supabase client for online verification, if this scanner verifies
+        db: DB manager for local verification, if this scanner verifies; also
+            builds the scanner's attendee index and revocation filter from it
+        event_id: Event admitted by this scanner (defaults to config.EVENT_ID)
+
+    Returns:
+        Configured QRScanner
+    """
+    index = None
+    revocations = None
+    if db is not None:
+        index = AttendeeIndex()
+        index.load(db)
+        revocations = RevocationFilter(error_rate=config.REVOCATION_ERROR_RATE)
+        revocations.load(db.reader())
+    return QRScanner(
+        config.HMAC_SECRET, supabase, db,
+        roi_tracking=config.DECODE_ROI_TRACKING,
+        downscale_first=config.DECODE_DOWNSCALE_FIRST,
+        downscale_min_width=config.DECODE_DOWNSCALE_MIN_WIDTH,
+        gating=config.DECODE_GATING,
+        scan_cooldown=config.SCAN_COOLDOWN_SEC,
+        dedup_capacity=config.SCAN_DEDUP_CAPACITY,
+        decoder=config.DECODE_BACKEND,
+        calibrator=create_calibrator(),
+        cascade=PreprocessCascade(config.DECODE_CASCADE_STEPS, config.DECODE_CASCADE_BUDGET_MS) if config.DECODE_CASCADE else None,
+        index=index,
+        keyring=parse_keyring(config.TICKET_KEYS, config.HMAC_SECRET),
+        revocations=revocations,
+        event_id=event_id or config.EVENT_ID
+    )
+
+
+def create_verify_worker(checkin: CheckInService) -> VerifyWorker:
+    """
+    Create the verification worker configured from config.py
+
+    Args:
+        checkin: Check-in service whose verification runs on the worker
+
+    Returns:
+        VerifyWorker that bulk-prefetches online lookups for bursts of scans
+    """
+    return VerifyWorker(
+        checkin.verify_and_check_in,
+        queue_size=config.VERIFY_QUEUE_SIZE,
+        batch_handler=checkin.prefetch,
+        batch_done=checkin.end_batch,
+        batch_window=config.VERIFY_BATCH_WINDOW_MS / 1000,
+        batch_size=config.SUPABASE_BULK_CHUNK_SIZE
+    )
+
+
+def create_calibrator() -> Optional[DecoderCalibrator]:
+    """
+    Create a decoder calibrator configured from config.py
+
+    Returns:
+        DecoderCalibrator, or None when calibration is disabled
+    """
+    if config.DECODE_CALIBRATION_FRAMES <= 0:
+        return None
+    return DecoderCalibrator(
+        config.DECODE_CALIBRATION_CANDIDATES,
+        frames=config.DECODE_CALIBRATION_FRAMES,
+        target_hit_rate=config.DECODE_CALIBRATION_TARGET
+    )
+
+
+def create_camera_manager() -> CameraManager:
+    """
+    Create the camera manager configured from config.py
+
+    Returns:
+        CameraManager persisting its state to config.CAMERA_STATE_PATH
+    """
+    probe_indexes = sorted(set(range(3)) | set(config.CAMERA_INDEXES))
+    return CameraManager(
+        config.CAMERA_STATE_PATH,
+        width=config.CAMERA_WIDTH,
+        height=config.CAMERA_HEIGHT,
+        fps=config.CAMERA_FPS,
+        fourcc=config.CAMERA_FOURCC,
+        buffer_size=config.CAMERA_BUFFER_SIZE,
+        probe_indexes=probe_indexes
+    )
+
+
+def create_lane_decode_pool(lane_count: int) -> Optional[ProcessPoolDecoder]:
+    """
+    Create one lane's decode backend, splitting the configured workers between lanes
+
+    Args:
+        lane_count: Number of camera lanes sharing the machine
+
+    Returns:
+        ProcessPoolDecoder, or None when decoding should stay in-process
+    """
+    workers = max(1, config.DECODE_WORKERS // max(1, lane_count)) if config.DECODE_WORKERS else 0
+    return create_decode_pool(
+        config.DECODE_MODE, workers,
+        downscale_first=config.DECODE_DOWNSCALE_FIRST,
+        downscale_min_width=config.DECODE_DOWNSCALE_MIN_WIDTH,
+        decoder=config.DECODE_BACKEND
+    )
@@ -3,23 +3,156 @@ Core QR scanning functionality for EventHive
 """
 
 import cv2
-from pyzbar import pyzbar
 import hmac
 import hashlib
 import logging
 import json
 import time
 import os
-from typing import Dict, Optional, Tuple, Any, List, Union
+from typing import Dict, Optional, Tuple, Any, List, Union, NamedTuple, Callable, TYPE_CHECKING
 
-from ..utils.error_handler import ScannerError
-from ..api.supabase_client import SupabaseClient
+from ..utils.error_handler import ScannerError, ValidationError
+from ..utils.cache import TTLCache
+from ..utils.latency import LatencyTracker
 from ..db.database import DBManager
+from .gating import FrameGate
+from .decoders import DecodedSymbol, DecoderBackend, DecoderCalibrator, PyzbarDecoder, create_decoder
+from .preprocess import PreprocessCascade
+from .camera import CameraManager
+from .attendee_index import AttendeeIndex, IndexReconciler
+from .tickets import TicketKeyring, is_signed_ticket
+from .revocation import RevocationFilter
+
+if TYPE_CHECKING:
+    # The Supabase SDK is slow to import; only callers that go online need it
+    from ..api.supabase_client import SupabaseClient
+
+
+class FrameAnalysis(NamedTuple):
+    """Result of a single decode pass over a frame"""
+    symbols: List[DecodedSymbol]
+    decode_time: float
+    strategy: Optional[str] = None
+    skipped: Optional[str] = None
+
+    @property
+    def payload(self) -> Optional[str]:
+        """Payload of the first decoded symbol, if any"""
+        return self.symbols[0].data if self.symbols else None
+
+
+# Stateless default backend shared by callers that do not choose one
+_default_decoder = PyzbarDecoder()
+
+
+def decode_symbols(image, offset: Tuple[int, int] = (0, 0), scale: float = 1,
+                   decoder: Optional[DecoderBackend] = None) -> List[DecodedSymbol]:
+    """
+    Decode all symbols in an image
+    
+    Args:
+        image: Grayscale image array
+        offset: (x, y) position of the image within the original frame
+        scale: Factor mapping image coordinates back to the original frame
+        decoder: Decoder backend to use (defaults to pyzbar)
+        
+    Returns:
+        List of decoded symbols in original frame coordinates
+    """
+    symbols = (decoder or _default_decoder).decode(image)
+    ox, oy = offset
+    if ox == 0 and oy == 0 and scale == 1:
+        return symbols
+    return [
+        symbol._replace(
+            rect=(int(symbol.rect[0] * scale) + ox, int(symbol.rect[1] * scale) + oy,
+                  int(symbol.rect[2] * scale), int(symbol.rect[3] * scale)),
+            polygon=[(int(x * scale) + ox, int(y * scale) + oy) for x, y in symbol.polygon]
+        )
+        for symbol in symbols
+    ]
+
+
+def to_grayscale(frame):
+    """Convert a BGR frame to grayscale, passing grayscale frames through"""
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+
+
+def decode_downscaled_first(gray, min_width: int = 960,
+                            decoder: Optional[DecoderBackend] = None) -> Tuple[List[DecodedSymbol], str]:
+    """
+    Decode a grayscale frame at half resolution, falling back to full resolution
+    
+    Args:
+        gray: Grayscale frame
+        min_width: Frames narrower than this are only decoded at full resolution
+        decoder: Decoder backend to use (defaults to pyzbar)
+        
+    Returns:
+        Tuple of (symbols, name of the strategy that produced them)
+    """
+    height, width = gray.shape[:2]
+    if width >= min_width:
+        half = cv2.resize(gray, (width // 2, height // 2), interpolation=cv2.INTER_AREA)
+        symbols = decode_symbols(half, scale=2, decoder=decoder)
+        if symbols:
+            return symbols, "half"
+    return decode_symbols(gray, decoder=decoder), "full"
+
+
+class DecodeStrategyStats:
+    """
+    Hit rate and cost counters for one decode strategy
+    """
+    
+    def __init__(self):
+        """Initialize counters"""
+        self.attempts = 0
+        self.hits = 0
+        self.total_time = 0.0
+        
+    def record(self, hit: bool, elapsed: float):
+        """
+        Record one decode attempt
+        
+        Args:
+            hit: Whether the attempt decoded at least one symbol
+            elapsed: Time spent in seconds
+        """
+        self.attempts += 1
+        self.hits += 1 if hit else 0
+        self.total_time += elapsed
+        
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the current counters
+        
+        Returns:
+            Dictionary with attempts, hits, hit rate and average cost in milliseconds
+        """
+        return {
+            "attempts": self.attempts,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.attempts if self.attempts else 0.0,
+            "avg_ms": self.total_time * 1000 / self.attempts if self.attempts else 0.0
+        }
+
 
 class QRScanner:
     """Core QR scanner functionality with Supabase integration"""
     
-    def __init__(self, hmac_secret: str, supabase_client: Optional[SupabaseClient] = None, db_manager: Optional[DBManager] = None):
+    # Consecutive misses after which the tracked region is forgotten
+    ROI_MAX_MISSES = 10
+    # Margin added around the last symbol, as a fraction of its size
+    ROI_MARGIN = 0.5
+    
+    def __init__(self, hmac_secret: str, supabase_client: Optional["SupabaseClient"] = None, db_manager: Optional[DBManager] = None,
+                 roi_tracking: bool = True, downscale_first: bool = True, downscale_min_width: int = 960,
+                 gating: bool = False, scan_cooldown: float = 2, dedup_capacity: int = 1024,
+                 decoder: Union[str, DecoderBackend] = "pyzbar", calibrator: Optional[DecoderCalibrator] = None,
+                 cascade: Optional[PreprocessCascade] = None, index: Optional[AttendeeIndex] = None,
+                 keyring: Optional[TicketKeyring] = None, revocations: Optional[RevocationFilter] = None,
+                 latency: Optional[LatencyTracker] = None, event_id: Optional[str] = None):
         """
         Initialize QR scanner
         
@@ -27,34 +160,208 @@ class QRScanner:
             hmac_secret: Secret key for HMAC validation
             supabase_client: Optional Supabase client for online verification
             db_manager: Optional DB manager for local verification
+            roi_tracking: Try a cropped decode around the last symbol first
+            downscale_first: Try a half-resolution decode before full resolution
+            downscale_min_width: Frames narrower than this skip the half-resolution pass
+            gating: Skip idle and motion-blurred frames before decoding
+            scan_cooldown: Seconds during which the same QR code is suppressed
+            dedup_capacity: Number of distinct recent codes remembered
+            decoder: Decoder backend or backend name (see decoders.create_decoder)
+            calibrator: Optional calibrator fed with live frames to pick the decoder backend
+            cascade: Optional preprocessing cascade tried when the plain decode finds nothing
+            index: Optional in-memory attendee index answering verification before
+                Supabase and the local database
+            keyring: Optional ticket keys; signed tickets are then validated offline
+            revocations: Optional filter of refunded and cancelled codes, checked before
+                any code is accepted
+            latency: Tracker receiving per-stage verification timings (a new one by default)
+            event_id: Event admitted at this gate; signed tickets for any other event,
+                or while no event is set, are refused
         """
         self.hmac_secret = hmac_secret
         self.supabase = supabase_client
         self.db = db_manager
-        self.last_scan_time = 0
-        self.scan_cooldown = 2  # seconds between scans to prevent duplicates
+        # Per-code duplicate suppression; different codes are processed immediately
+        self.recent_scans = TTLCache(dedup_capacity, scan_cooldown)
+        
+        # Decode strategies
+        self.roi_tracking = roi_tracking
+        self.downscale_first = downscale_first
+        self.downscale_min_width = downscale_min_width
+        self.roi: Optional[Tuple[int, int, int, int]] = None
+        self.roi_misses = 0
+        self.strategy_stats = {name: DecodeStrategyStats() for name in ("roi", "half", "full")}
+        self.gate = FrameGate() if gating else None
+        self.decoder = create_decoder(decoder)
+        self.calibrator = calibrator
+        self.cascade = cascade
+        self.index = index
+        self.reconciler: Optional[IndexReconciler] = None
+        self.keyring = keyring
+        self.revocations = revocations
+        self.latency = latency or LatencyTracker()
+        self.event_id = event_id or None
+        # Online results fetched in bulk for the payloads of the current verification batch
+        self._prefetched: Dict[str, Tuple[bool, Optional[Dict[str, Any]], str]] = {}
         logging.info("QR scanner initialized")
         
-    def scan_image(self, frame) -> Optional[str]:
+    def analyze_frame(self, frame) -> FrameAnalysis:
         """
-        Scan an image for QR codes
+        Decode every symbol in a frame in a single pass
         
         Args:
             frame: Image frame to scan
             
         Returns:
-            QR code string if found, None otherwise
+            FrameAnalysis with all decoded symbols and the decode time in seconds
         """
+        start = time.perf_counter()
+        symbols, strategy = [], None
         try:
-            barcodes = pyzbar.decode(frame)
-            for barcode in barcodes:
-                qr_data = barcode.data.decode('utf-8')
-                logging.debug(f"QR code found: {qr_data}")
-                return qr_data
-            return None
+            # Convert once; every strategy works on the same grayscale frame
+            gray = to_grayscale(frame)
+            if self.gate is not None:
+                decode, reason = self.gate.should_decode(gray)
+                if not decode:
+                    return FrameAnalysis([], time.perf_counter() - start, skipped=reason)
+            self.feed_calibrator(gray)
+            symbols, strategy = self._decode_strategies(gray)
         except Exception as e:
             logging.error(f"QR decoding error: {e}")
-            return None
+        if self.gate is not None:
+            self.gate.record_result(bool(symbols))
+        self._track_roi(symbols, frame.shape)
+        analysis = FrameAnalysis(symbols, time.perf_counter() - start, strategy)
+        
+        for symbol in symbols:
+            logging.debug(f"{symbol.symbol_type} found via {strategy} in {analysis.decode_time * 1000:.1f}ms: {symbol.data}")
+        return analysis
+        
+    def feed_calibrator(self, gray):
+        """
+        Offer a frame to the decoder calibration, switching backend once it decides
+        
+        Calibration runs in the background; the chosen backend is adopted on the
+        first frame offered after it finished.
+        
+        Args:
+            gray: Grayscale frame that passed gating
+        """
+        if self.calibrator is None:
+            return
+        if not self.calibrator.done:
+            self.calibrator.add_frame(gray)
+        elif self.calibrator.result is not None and self.decoder is not self.calibrator.result.backend:
+            self.decoder = self.calibrator.result.backend
+        
+    def get_decode_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get hit rate and cost of each decode strategy
+        
+        Returns:
+            Dictionary mapping strategy name ("roi", "half", "full") to its counters,
+            plus "gate" with skipped-frame counters when gating is enabled, "cascade"
+            with preprocessing step counters when the cascade is enabled and
+            "decoder" with the active backend and any calibration measurements
+        """
+        stats = {name: stats.snapshot() for name, stats in self.strategy_stats.items()}
+        if self.gate is not None:
+            stats["gate"] = self.gate.get_stats()
+        if self.cascade is not None:
+            stats["cascade"] = self.cascade.get_stats()
+        stats["decoder"] = {"backend": self.decoder.name}
+        if self.calibrator is not None and self.calibrator.result is not None:
+            stats["decoder"]["calibration"] = self.calibrator.result.stats
+        return stats
+        
+    def get_dedup_stats(self) -> Dict[str, Any]:
+        """
+        Get counters of the per-code duplicate suppression cache
+        
+        Returns:
+            Dictionary with size, capacity, ttl, hits, misses and evictions
+        """
+        return self.recent_scans.get_stats()
+        
+    def _decode_strategies(self, gray) -> Tuple[List[DecodedSymbol], Optional[str]]:
+        """
+        Run the decode strategies from cheapest to most expensive
+        
+        Args:
+            gray: Grayscale frame
+            
+        Returns:
+            Tuple of (symbols, name of the strategy that produced them)
+        """
+        height, width = gray.shape[:2]
+        
+        if self.roi_tracking and self.roi is not None:
+            x0, y0, x1, y1 = self.roi
+            symbols = self._attempt("roi", lambda: decode_symbols(gray[y0:y1, x0:x1], offset=(x0, y0), decoder=self.decoder))
+            if symbols:
+                return symbols, "roi"
+        
+        half = None
+        if self.downscale_first and width >= self.downscale_min_width:
+            half = cv2.resize(gray, (width // 2, height // 2), interpolation=cv2.INTER_AREA)
+            symbols = self._attempt("half", lambda: decode_symbols(half, scale=2, decoder=self.decoder))
+            if symbols:
+                return symbols, "half"
+        
+        symbols = self._attempt("full", lambda: decode_symbols(gray, decoder=self.decoder))
+        if symbols or self.cascade is None:
+            return symbols, "full" if symbols else None
+        
+        # Enhancement passes work on the half-resolution frame when there is one, keeping them cheap
+        image, scale = (half, 2) if half is not None else (gray, 1)
+        symbols, step = self.cascade.run(image, lambda enhanced: decode_symbols(enhanced, scale=scale, decoder=self.decoder))
+        return symbols, f"cascade:{step}" if symbols else None
+        
+    def _attempt(self, strategy: str, decode: Callable[[], List[DecodedSymbol]]) -> List[DecodedSymbol]:
+        """Run one decode strategy and record its outcome"""
+        start = time.perf_counter()
+        symbols = decode()
+        self.strategy_stats[strategy].record(bool(symbols), time.perf_counter() - start)
+        return symbols
+        
+    def _track_roi(self, symbols: List[DecodedSymbol], shape: Tuple[int, ...]):
+        """
+        Remember the region around the last decoded symbol
+        
+        Args:
+            symbols: Symbols decoded from the current frame
+            shape: Shape of the frame
+        """
+        if not symbols:
+            self.roi_misses += 1
+            if self.roi_misses >= self.ROI_MAX_MISSES:
+                self.roi = None
+            return
+        
+        height, width = shape[:2]
+        left, top, w, h = symbols[0].rect
+        mx, my = int(w * self.ROI_MARGIN), int(h * self.ROI_MARGIN)
+        x0, y0 = max(0, left - mx), max(0, top - my)
+        x1, y1 = min(width, left + w + mx), min(height, top + h + my)
+        
+        # A region covering most of the frame saves nothing over a full decode
+        if (x1 - x0) * (y1 - y0) > 0.5 * width * height:
+            self.roi = None
+        else:
+            self.roi = (x0, y0, x1, y1)
+        self.roi_misses = 0
+        
+    def scan_image(self, frame) -> Optional[str]:
+        """
+        Scan an image for QR codes
+        
+        Args:
+            frame: Image frame to scan
+            
+        Returns:
+            QR code string if found, None otherwise
+        """
+        return self.analyze_frame(frame).payload
             
     def verify_signature(self, payload: Dict[str, str]) -> bool:
         """
@@ -121,15 +428,22 @@ class QRScanner:
             - Dictionary with verification details
             - Message explaining the result
         """
-        # Prevent rapid scanning of the same code
-        current_time = time.time()
-        if current_time - self.last_scan_time < self.scan_cooldown:
-            return False, {"status": "cooldown"}, "Please wait between scans"
-            
-        self.last_scan_time = current_time
+        with self.latency.span("verify"):
+            return self._verify_qr_code(qr_data)
+    
+    def _verify_qr_code(self, qr_data: str) -> Tuple[bool, Dict[str, Any], str]:
+        """Body of verify_qr_code; every stage is timed separately"""
+        # Prevent rapid re-scanning of the same code
+        if self.recent_scans.check_and_add(qr_data):
+            return False, {"status": "cooldown"}, "Code already scanned moments ago"
+        
+        # Signed tickets carry everything needed to decide validity
+        if self.keyring is not None and is_signed_ticket(qr_data.strip()):
+            return self.verify_signed_ticket(qr_data.strip())
         
         # Step 1: Parse the QR data
-        parsed_data = self.parse_qr_data(qr_data)
+        with self.latency.span("parse"):
+            parsed_data = self.parse_qr_data(qr_data)
         if parsed_data is None:
             return False, {"status": "parse_error"}, "Failed to parse QR data"
             
@@ -139,7 +453,8 @@ class QRScanner:
         # Step 3: Check signature if applicable
         if isinstance(parsed_data, dict) and 'signature' in parsed_data:
             # QR contains signature for verification
-            signature_valid = self.verify_signature(parsed_data)
+            with self.latency.span("signature"):
+                signature_valid = self.verify_signature(parsed_data)
             result_data["signature_verified"] = signature_valid
             
             if not signature_valid:
@@ -151,15 +466,41 @@ class QRScanner:
             # Simple QR code (just the QR string)
             result_data["qr_code"] = qr_data if isinstance(parsed_data, str) else str(parsed_data)
             
-        # Step 4: Verify against Supabase if available
+        # Use QR code directly or extract from parsed data
+        verification_qr = qr_data
+        if isinstance(parsed_data, dict) and 'qr_code' in parsed_data:
+            verification_qr = parsed_data['qr_code']
+        
+        if self.revocations is not None:
+            with self.latency.span("revocation"):
+                revoked = verification_qr in self.revocations
+            if revoked:
+                result_data["revoked"] = True
+                return False, result_data, "Ticket has been revoked"
+        
+        # Step 4: Answer from the in-memory index; Supabase is only consulted in the background
+        if self.index is not None and self.index.loaded:
+            with self.latency.span("index"):
+                attendee = self.index.lookup(verification_qr)
+            if attendee is not None:
+                result_data["qr_code"] = verification_qr
+                result_data["attendee"] = attendee.to_dict(verification_qr)
+                result_data["event_id"] = attendee.event_id
+                result_data["verified_local"] = True
+                self.reconcile(verification_qr)
+                if attendee.checked_in:
+                    return False, result_data, f"Attendee already checked in at {attendee.checked_in_at}"
+                return True, result_data, "QR code valid"
+        
+        # Step 5: Verify against Supabase if available
         if self.supabase:
             try:
-                # Use QR code directly or extract from parsed data
-                verification_qr = qr_data
-                if isinstance(parsed_data, dict) and 'qr_code' in parsed_data:
-                    verification_qr = parsed_data['qr_code']
-                
-                is_valid, attendee_data, message = self.supabase.verify_qr_code(verification_qr)
+                prefetched = self._prefetched.pop(verification_qr, None)
+                if prefetched is not None:
+                    is_valid, attendee_data, message = prefetched
+                else:
+                    with self.latency.span("supabase"):
+                        is_valid, attendee_data, message = self.supabase.verify_qr_code(verification_qr)
                 
                 # Add Supabase data to result
                 if attendee_data:
@@ -175,20 +516,19 @@ class QRScanner:
                 logging.error(f"Supabase verification error: {e}")
                 # Continue to local verification
         
-        # Step 5: Verify against local database if available
+        # Step 6: Verify against local database if available
         if self.db:
             try:
-                # Use QR code directly or extract from parsed data
-                verification_qr = qr_data
-                if isinstance(parsed_data, dict) and 'qr_code' in parsed_data:
-                    verification_qr = parsed_data['qr_code']
-                    
                 # Check if in local database
-                if self.db.is_attendee_in_db(verification_qr):
+                with self.latency.span("sqlite"):
+                    record = self.db.lookup_attendee(verification_qr)
+                if record is not None:
                     result_data["verified_local"] = True
+                    result_data["attendee"] = record.to_dict()
+                    result_data["event_id"] = record.event_id
                     
                     # Check if already checked in
-                    if self.db.is_attendee_checked_in(verification_qr):
+                    if record.checked_in:
                         return False, result_data, "Attendee already checked in (local database)"
                     
                     return True, result_data, "QR code valid (local database)"
@@ -198,20 +538,142 @@ class QRScanner:
             except Exception as e:
                 logging.error(f"Local verification error: {e}")
                 
-        # Step 6: If we've reached here without verification, check if signature was valid
+        # Step 7: If we've reached here without verification, check if signature was valid
         if result_data.get("signature_verified", False):
             return True, result_data, "QR code valid (signature verified)"
             
-        # Step 7: Last resort - if it's a simple QR code with no verification method
+        # Step 8: Last resort - if it's a simple QR code with no verification method
         if isinstance(parsed_data, str):
             return True, result_data, "QR code accepted (no verification method)"
             
         # Default case - reject
         return False, result_data, "QR code could not be verified"
 
+    def verify_signed_ticket(self, qr_code: str) -> Tuple[bool, Dict[str, Any], str]:
+        """
+        Verify a signed ticket without any network or database access
+        
+        The signature and validity window decide validity; the attendee index,
+        when present, supplies the attendee and catches repeat check-ins.
+        
+        Args:
+            qr_code: Signed ticket payload
+            
+        Returns:
+            Tuple of (is_valid, verification details, message) as for verify_qr_code
+        """
+        result_data = {"raw_qr": qr_code, "qr_code": qr_code}
+        try:
+            with self.latency.span("signature"):
+                ticket = self.keyring.decode(qr_code)
+        except ValidationError as e:
+            result_data["signature_verified"] = False
+            return False, result_data, str(e)
+        result_data["signature_verified"] = True
+        result_data["event_id"] = ticket.event_id
+        result_data["ticket"] = ticket._asdict()
+        
+        # Every event shares the signing keys, so the signature alone does not
+        # say the ticket is for this gate
+        if self.event_id is None:
+            return False, result_data, "No event selected for this scanner"
+        if ticket.event_id != self.event_id:
+            return False, result_data, "Ticket is for a different event"
+        # The stored row may carry a QR code other than this payload, so the ticket ID is checked too
+        if self.revocations is not None and (qr_code in self.revocations or ticket.ticket_id in self.revocations):
+            result_data["revoked"] = True
+            return False, result_data, "Ticket has been revoked"
+        if not ticket.is_current():
+            expired = time.time() > ticket.valid_until
+            return False, result_data, "Ticket expired" if expired else "Ticket not yet valid"
+        
+        attendee = {"id": ticket.ticket_id, "event_id": ticket.event_id, "qr_code": qr_code,
+                    "ticket_type": ticket.ticket_type, "checked_in": False}
+        if self.index is not None:
+            with self.latency.span("index"):
+                record = self.index.lookup(qr_code) or self.index.get_by_id(ticket.ticket_id)
+            if record is None:
+                # Remember the ticket so a second scan is caught as a repeat
+                self.index.update([attendee])
+                record = self.index.get(qr_code)
+            attendee = record.to_dict(qr_code)
+            self.reconcile(qr_code)
+        result_data["attendee"] = attendee
+        
+        if attendee["checked_in"]:
+            return False, result_data, f"Attendee already checked in at {attendee.get('checked_in_at')}"
+        return True, result_data, "Ticket valid (signature verified)"
+    
+    def prefetch_online(self, payloads: List[str]) -> int:
+        """
+        Look up in bulk the payloads of a batch that will need online verification
+        
+        Codes answered offline (signed tickets, revoked or indexed codes) are skipped;
+        verify_qr_code then uses the prefetched results instead of one request per code.
+        The results belong to this batch only; clear_prefetched drops those left unused.
+        
+        Args:
+            payloads: Decoded QR payloads about to be verified
+            
+        Returns:
+            Number of codes looked up
+        """
+        self._prefetched = {}
+        if self.supabase is None:
+            return 0
+        codes = []
+        for qr_data in payloads:
+            if self.keyring is not None and is_signed_ticket(qr_data.strip()):
+                continue
+            parsed_data = self.parse_qr_data(qr_data)
+            code = parsed_data['qr_code'] if isinstance(parsed_data, dict) and 'qr_code' in parsed_data else qr_data
+            if not isinstance(code, str) or code in codes:
+                continue
+            if self.revocations is not None and code in self.revocations:
+                continue
+            if self.index is not None and self.index.loaded and self.index.get(code) is not None:
+                continue
+            codes.append(code)
+        # A single code gains nothing from the bulk path
+        if len(codes) < 2:
+            return 0
+        with self.latency.span("supabase_bulk"):
+            self._prefetched = self.supabase.bulk_verify_qr_codes(codes)
+        logging.info(f"Verified {len(codes)} queued codes in bulk")
+        return len(codes)
+    
+    def clear_prefetched(self):
+        """Drop prefetched results the batch did not use, so later scans look up fresh state"""
+        self._prefetched = {}
+
+    def reconcile(self, qr_code: str):
+        """
+        Queue a code answered from the index for a background check against Supabase
+        
+        Args:
+            qr_code: QR code to check
+        """
+        if self.supabase is None or self.index is None:
+            return
+        if self.reconciler is None or self.reconciler.supabase is not self.supabase:
+            if self.reconciler is not None:
+                self.reconciler.stop()
+            self.reconciler = IndexReconciler(self.index, self.supabase, db=self.db, revocations=self.revocations)
+            self.reconciler.start()
+        self.reconciler.submit(qr_code)
+    
+    def close(self):
+        """Stop background reconciliation"""
+        if self.reconciler is not None:
+            self.reconciler.stop()
+            self.reconciler = None
+    
     def get_camera_device(self, camera_index: int = 0) -> Tuple[cv2.VideoCapture, int, int]:
         """
-        Initialize a camera device
+        Initialize a camera device in low-latency mode
+        
+        Applications should prefer a shared CameraManager, which also remembers
+        the configuration that worked for next time.
         
         Args:
             camera_index: Index of the camera to use
@@ -219,12 +681,4 @@ class QRScanner:
         Returns:
             Tuple of (capture device, width, height)
         """
-        cap = cv2.VideoCapture(camera_index)
-        if not cap.isOpened():
-            raise ValueError(f"Unable to open camera {camera_index}")
-            
-        # Get video dimensions
-        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        
-        return cap, width, height
+        return CameraManager().open(camera_index)
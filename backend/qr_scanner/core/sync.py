@@ -0,0 +1,215 @@
+"""
+EventHive Sync Engine
+Background synchronisation between the local database and Supabase.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from ..api.supabase_client import SupabaseClient
+from ..db.database import DBManager
+from .. import config
+from .attendee_index import AttendeeIndex
+from .preload import PagedPreloader, advance_watermark
+from .revocation import RevocationFilter
+
+
+class SyncEngine:
+    """
+    Pushes offline scans to Supabase and keeps the local ticket cache fresh
+    """
+
+    def __init__(self, db: DBManager, supabase: SupabaseClient, sync_interval: float = 30, poll_interval: float = 10,
+                 index: Optional[AttendeeIndex] = None, revocations: Optional[RevocationFilter] = None,
+                 full_sync_interval: float = config.FULL_SYNC_INTERVAL_SEC):
+        """
+        Initialize the sync engine
+
+        Args:
+            db: Local database manager
+            supabase: Supabase client
+            sync_interval: Seconds between offline scan sync attempts
+            poll_interval: Seconds between ticket update polls
+            index: Attendee index kept in step with the local database
+            revocations: Revocation filter kept in step with the local database
+            full_sync_interval: Seconds between full re-downloads; polls in between
+                fetch only rows changed since the stored watermark
+        """
+        self.db = db
+        self.supabase = supabase
+        self.index = index
+        self.revocations = revocations
+        self.sync_interval = sync_interval
+        self.poll_interval = poll_interval
+        self.full_sync_interval = full_sync_interval
+        self.current_event_id: Optional[str] = None
+        self._stop = threading.Event()
+        self._threads = []
+        # One full download per event at a time
+        self._full_sync_locks: Dict[str, threading.Lock] = {}
+        self._full_sync_locks_lock = threading.Lock()
+
+    def start(self):
+        """Start the sync and polling threads"""
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self.sync_offline_scans, name="sync-scans", daemon=True),
+            # Polling instead of realtime subscriptions
+            threading.Thread(target=self.poll_for_ticket_updates, name="sync-poll", daemon=True)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        """Ask the background threads to exit"""
+        self._stop.set()
+
+    def load_event(self, event_id: str, on_progress: Optional[Callable[[int, Optional[int]], None]] = None) -> int:
+        """
+        Bring the local database up to date with an event's tickets
+
+        Downloads every ticket unless the event was fully synced within
+        full_sync_interval (for instance before a restart), in which case only
+        rows changed since the stored watermark are fetched. An interrupted
+        download is resumed.
+
+        Args:
+            event_id: ID of the event to load
+            on_progress: Called with (rows stored, total rows or None) during a download
+
+        Returns:
+            Number of tickets stored locally for the event
+        """
+        state = self.db.get_sync_state(event_id)
+        if state and time.time() - state["full_sync_at"] < self.full_sync_interval:
+            self._sync_changes(event_id)
+        elif not self._full_sync(event_id, on_progress=on_progress):
+            logging.warning(f"No tickets found for event {event_id}")
+            return 0
+        if self.index is not None:
+            self.index.load(self.db)
+        if self.revocations is not None:
+            self.revocations.load(self.db.reader())
+        self.current_event_id = event_id
+        count = self.db.count_attendees(event_id)
+        logging.info(f"Loaded {count} tickets for event {event_id}")
+        return count
+
+    def _full_sync(self, event_id: str, on_page: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+                   on_progress: Optional[Callable[[int, Optional[int]], None]] = None) -> int:
+        """
+        Stream every ticket of an event into the database and restart the watermark from them
+
+        Args:
+            event_id: ID of the event
+            on_page: Called with each stored page
+            on_progress: Called with (rows stored, total rows or None)
+
+        Returns:
+            Number of tickets downloaded, including those stored before an
+            interrupted download resumed, or by a download that finished while
+            this one waited for it
+        """
+        requested_at = time.time()
+        with self._full_sync_locks_lock:
+            lock = self._full_sync_locks.setdefault(event_id, threading.Lock())
+        with lock:
+            state = self.db.get_sync_state(event_id)
+            if state and state["full_sync_at"] >= requested_at:
+                return self.db.count_attendees(event_id)
+            result = PagedPreloader(self.db, self.supabase).run(event_id, stop=self._stop,
+                                                                on_page=on_page, on_progress=on_progress)
+            # A resumed download may find nothing left to fetch; it is complete all the same
+            if result["complete"]:
+                self.db.set_sync_state(event_id, *result["watermark"], full_sync_at=time.time())
+        return result["stored"]
+
+    def _sync_changes(self, event_id: str) -> List[Dict[str, Any]]:
+        """
+        Fetch and store the tickets changed since the event's watermark
+
+        Args:
+            event_id: ID of the event
+
+        Returns:
+            The changed tickets
+        """
+        state = self.db.get_sync_state(event_id) or {"updated_at": None, "id": None}
+        tickets = self.supabase.fetch_ticket_changes(event_id, state["updated_at"], state["id"])
+        if tickets:
+            self.db.preload_tickets(tickets)
+            self.db.set_sync_state(event_id, *advance_watermark(tickets, (state["updated_at"], state["id"])))
+        return tickets
+
+    def sync_offline_scans(self):
+        """Background thread to sync offline scan logs"""
+        while not self._stop.is_set():
+            try:
+                # Get unsynced scans
+                unsynced = self.db.get_unsynced_scans()
+
+                for scan_id, qr_code, scanner_id, scanned_at in unsynced:
+                    # Push to Supabase
+                    success = self.supabase.push_scan(qr_code, scanner_id)
+                    if success:
+                        # Mark as synced
+                        self.db.mark_scan_synced(scan_id)
+                        logging.info(f"Synced scan {scan_id} for QR code {qr_code}")
+                    else:
+                        logging.warning(f"Failed to sync scan {scan_id} for QR code {qr_code}")
+            except Exception as e:
+                logging.error(f"Sync error: {e}")
+
+            self._stop.wait(self.sync_interval)
+
+    def _update_revocations(self, tickets: list):
+        """Apply polled refunds and cancellations to the revocation filter"""
+        if self.revocations is None:
+            return
+        added = self.revocations.update(tickets)
+        if added:
+            logging.info(f"{added} tickets revoked for event {self.current_event_id}")
+        if self.revocations.needs_rebuild:
+            self.revocations.load(self.db.reader())
+
+    def poll_event(self, event_id: str) -> int:
+        """
+        Fetch an event's ticket changes, or everything when a full sync is due
+
+        Args:
+            event_id: ID of the event
+
+        Returns:
+            Number of tickets fetched
+        """
+        state = self.db.get_sync_state(event_id)
+        if state is None or time.time() - state["full_sync_at"] >= self.full_sync_interval:
+            # Full reconciliation catches rows whose updated_at went backwards or was missing
+            count = self._full_sync(event_id, on_page=self._apply_tickets)
+        else:
+            tickets = self._sync_changes(event_id)
+            self._apply_tickets(tickets)
+            count = len(tickets)
+        logging.debug(f"Polled {count} tickets for event {event_id}")
+        return count
+
+    def _apply_tickets(self, tickets: List[Dict[str, Any]]):
+        """Merge fetched tickets into the attendee index and revocation filter"""
+        if not tickets:
+            return
+        if self.index is not None:
+            self.index.update(tickets)
+        self._update_revocations(tickets)
+
+    def poll_for_ticket_updates(self):
+        """Poll for ticket updates as an alternative to realtime subscriptions"""
+        while not self._stop.is_set():
+            try:
+                if self.current_event_id:
+                    self.poll_event(self.current_event_id)
+            except Exception as e:
+                logging.error(f"Error polling for ticket updates: {e}")
+
+            self._stop.wait(self.poll_interval)
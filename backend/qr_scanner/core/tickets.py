@@ -0,0 +1,228 @@
+"""
+EventHive Signed Tickets
+Compact, versioned binary ticket payloads that the scanner can validate offline.
+
+A v2 ticket is "EH2:" followed by the unpadded base32 encoding of:
+
+    version    1 byte   (2)
+    key_id     1 byte   signing key, so keys can be rotated
+    ticket_id 16 bytes  booking_attendees.id as a UUID
+    event_id  16 bytes  events.id as a UUID
+    type       1 byte   index into TICKET_TYPES
+    valid_from 4 bytes  unix seconds
+    valid_to   4 bytes  unix seconds
+    mac       10 bytes  truncated HMAC-SHA256 of everything above
+
+Base32 stays inside the QR alphanumeric character set, so the 89-character
+payload encodes in far fewer modules than JSON with a hex signature.
+"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import struct
+import time
+import uuid
+from typing import Dict, NamedTuple, Optional, Union
+
+from ..utils.error_handler import ValidationError
+
+TICKET_PREFIX = "EH2:"
+TICKET_VERSION = 2
+MAC_LENGTH = 10
+
+# Ticket types by their one-byte code; new types are only ever appended
+TICKET_TYPES = ("general", "vip", "premium", "student", "staff", "early_bird")
+
+_BODY = struct.Struct(">BB16s16sBII")
+_TICKET_LENGTH = _BODY.size + MAC_LENGTH
+
+
+class SignedTicket(NamedTuple):
+    """Fields carried by a v2 ticket"""
+    ticket_id: str
+    event_id: str
+    ticket_type: str
+    valid_from: int
+    valid_until: int
+    key_id: int = 0
+
+    def is_current(self, now: Optional[float] = None, leeway: float = 300) -> bool:
+        """
+        Check the validity window
+
+        Args:
+            now: Unix time to check against (defaults to the current time)
+            leeway: Seconds of clock skew tolerated at either end
+
+        Returns:
+            True if the ticket may be used now
+        """
+        now = time.time() if now is None else now
+        return self.valid_from - leeway <= now <= self.valid_until + leeway
+
+
+def is_signed_ticket(qr_data: str) -> bool:
+    """
+    Check whether a payload uses the signed ticket format
+
+    Args:
+        qr_data: Decoded QR payload
+
+    Returns:
+        True if the payload has the v2 prefix
+    """
+    return qr_data.startswith(TICKET_PREFIX)
+
+
+class TicketKeyring:
+    """
+    Signing keys by key ID, with the HMAC key schedule computed once per key
+    """
+
+    def __init__(self, keys: Dict[int, Union[str, bytes]], active_key_id: Optional[int] = None):
+        """
+        Initialize the keyring
+
+        Args:
+            keys: Secrets by key ID (0-255)
+            active_key_id: Key used to issue new tickets (defaults to the highest ID)
+
+        Raises:
+            ValueError: If no keys are given or the active key is unknown
+        """
+        self._macs: Dict[int, "hmac.HMAC"] = {}
+        for key_id, secret in keys.items():
+            self.add_key(key_id, secret)
+        if not self._macs:
+            raise ValueError("A ticket keyring needs at least one key")
+        self.active_key_id = max(self._macs) if active_key_id is None else active_key_id
+        if self.active_key_id not in self._macs:
+            raise ValueError(f"Active ticket key {self.active_key_id} is not in the keyring")
+
+    def add_key(self, key_id: int, secret: Union[str, bytes]):
+        """
+        Add or replace a key; tickets signed with it verify from now on
+
+        Args:
+            key_id: Key ID (0-255)
+            secret: Key material
+        """
+        if not 0 <= key_id <= 255:
+            raise ValueError(f"Ticket key ID {key_id} is out of range")
+        if isinstance(secret, str):
+            secret = secret.encode()
+        self._macs[key_id] = hmac.new(secret, digestmod=hashlib.sha256)
+
+    def remove_key(self, key_id: int):
+        """
+        Retire a key; tickets signed with it no longer verify
+
+        Args:
+            key_id: Key ID
+
+        Raises:
+            ValueError: If the key is the active signing key
+        """
+        if key_id == self.active_key_id:
+            raise ValueError("Cannot remove the active ticket key")
+        self._macs.pop(key_id, None)
+
+    @property
+    def key_ids(self):
+        """IDs of the keys tickets may be signed with"""
+        return sorted(self._macs)
+
+    def _mac(self, key_id: int, body: bytes) -> bytes:
+        """Truncated MAC of a ticket body, from a copy of the cached key state"""
+        mac = self._macs[key_id].copy()
+        mac.update(body)
+        return mac.digest()[:MAC_LENGTH]
+
+    def encode(self, ticket: SignedTicket) -> str:
+        """
+        Issue a ticket payload signed with the active key
+
+        The ticket's own key_id is ignored.
+
+        Args:
+            ticket: Ticket fields
+
+        Returns:
+            QR payload string
+
+        Raises:
+            ValueError: If an ID is not a UUID or the ticket type is unknown
+        """
+        try:
+            type_code = TICKET_TYPES.index(ticket.ticket_type.lower())
+        except ValueError:
+            raise ValueError(f"Unknown ticket type {ticket.ticket_type!r}; choose from {', '.join(TICKET_TYPES)}")
+        body = _BODY.pack(
+            TICKET_VERSION, self.active_key_id,
+            uuid.UUID(ticket.ticket_id).bytes, uuid.UUID(ticket.event_id).bytes,
+            type_code, ticket.valid_from, ticket.valid_until
+        )
+        raw = body + self._mac(self.active_key_id, body)
+        return TICKET_PREFIX + base64.b32encode(raw).decode("ascii").rstrip("=")
+
+    def decode(self, qr_data: str) -> SignedTicket:
+        """
+        Verify and unpack a ticket payload
+
+        Args:
+            qr_data: QR payload string
+
+        Returns:
+            The ticket fields
+
+        Raises:
+            ValidationError: If the payload is malformed, uses an unknown key or
+                its MAC does not match
+        """
+        if not is_signed_ticket(qr_data):
+            raise ValidationError("Not a signed ticket")
+        text = qr_data[len(TICKET_PREFIX):]
+        try:
+            raw = base64.b32decode(text + "=" * (-len(text) % 8))
+        except (binascii.Error, ValueError):
+            raise ValidationError("Malformed ticket encoding")
+        if len(raw) != _TICKET_LENGTH:
+            raise ValidationError("Malformed ticket length")
+
+        body, mac = raw[:_BODY.size], raw[_BODY.size:]
+        version, key_id, ticket_id, event_id, type_code, valid_from, valid_until = _BODY.unpack(body)
+        if version != TICKET_VERSION:
+            raise ValidationError(f"Unsupported ticket version {version}")
+        if key_id not in self._macs:
+            raise ValidationError(f"Ticket signed with unknown key {key_id}")
+        if not hmac.compare_digest(mac, self._mac(key_id, body)):
+            raise ValidationError("Invalid signature")
+
+        ticket_type = TICKET_TYPES[type_code] if type_code < len(TICKET_TYPES) else f"type{type_code}"
+        return SignedTicket(str(uuid.UUID(bytes=ticket_id)), str(uuid.UUID(bytes=event_id)),
+                            ticket_type, valid_from, valid_until, key_id)
+
+
+def parse_keyring(spec: str, default_secret: str) -> TicketKeyring:
+    """
+    Build a keyring from a "id:secret,id:secret" specification
+
+    Args:
+        spec: Comma-separated key ID and secret pairs; empty uses default_secret as key 0
+        default_secret: Secret used when spec is empty
+
+    Returns:
+        Keyring whose active key is the highest ID
+
+    Raises:
+        ValueError: If an entry is malformed
+    """
+    keys: Dict[int, str] = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        key_id, sep, secret = entry.partition(":")
+        if not sep or not key_id.strip().isdigit() or not secret:
+            raise ValueError(f"Malformed ticket key entry {entry!r}; expected id:secret")
+        keys[int(key_id)] = secret
+    return TicketKeyring(keys or {0: default_secret})
@@ -0,0 +1,474 @@
+"""
+EventHive Headless Scanner Daemon
+Runs the scan pipeline without a GUI for kiosks that only drive a turnstile relay or LED.
+Results go to plugins; a local socket reports status. Never imports tkinter.
+
+Usage:
+    python -m backend.qr_scanner.daemon --cameras 0 --event <event-id>
+    python -m backend.qr_scanner.daemon --status
+"""
+
+import argparse
+import importlib
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from . import __version__, config
+from .core.checkin import CheckInService
+from .core.pipeline import ScanPipeline
+from .core.runtime import create_scanner, create_lane_decode_pool, create_camera_manager, create_verify_worker
+from .db.database import DBManager
+from .utils.error_handler import ScannerError
+from .utils.helpers import setup_logging
+
+
+class ResultPlugin:
+    """
+    Base class for daemon result plugins
+
+    Plugins run on the daemon's dispatch thread and should return quickly;
+    anything slow (network, GPIO pulses with sleeps) belongs on the plugin's own thread.
+    """
+
+    def on_start(self, daemon: "ScannerDaemon"):
+        """
+        Called once after the daemon has started
+
+        Args:
+            daemon: The running daemon
+        """
+        pass
+
+    def on_result(self, lane: str, result: Dict[str, Any]):
+        """
+        Called for every verification result
+
+        Args:
+            lane: Name of the camera lane that scanned the code
+            result: Dictionary returned by CheckInService.verify_and_check_in
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Called once when the daemon shuts down"""
+        pass
+
+
+class CallbackPlugin(ResultPlugin):
+    """Adapts a plain callback(lane, result) to the plugin interface"""
+
+    def __init__(self, callback: Callable[[str, Dict[str, Any]], None]):
+        self.callback = callback
+
+    def on_result(self, lane: str, result: Dict[str, Any]):
+        self.callback(lane, result)
+
+
+class LogPlugin(ResultPlugin):
+    """Logs every scan result"""
+
+    def on_result(self, lane: str, result: Dict[str, Any]):
+        status = "VALID" if result.get("is_valid") else "INVALID"
+        logging.info(f"[{lane}] {status} {result.get('qr_code', '')[:30]} - {result.get('message', '')}")
+
+
+def load_plugin(spec: str) -> ResultPlugin:
+    """
+    Load a result plugin from a "package.module:attribute" spec
+
+    Args:
+        spec: Module path and attribute; a class is instantiated without arguments,
+            a plain function is wrapped in a CallbackPlugin
+
+    Returns:
+        The plugin instance
+
+    Raises:
+        ValueError: If the spec is malformed or does not name a plugin
+    """
+    module_name, _, attribute = spec.partition(":")
+    if not module_name or not attribute:
+        raise ValueError(f"Plugin spec must look like package.module:attribute, got {spec!r}")
+    target = getattr(importlib.import_module(module_name), attribute)
+    if isinstance(target, type):
+        target = target()
+    if isinstance(target, ResultPlugin):
+        return target
+    if callable(target):
+        return CallbackPlugin(target)
+    raise ValueError(f"{spec} is not a ResultPlugin or callable")
+
+
+class _StatusHandler(socketserver.StreamRequestHandler):
+    """Writes one line of JSON status and closes the connection"""
+
+    def handle(self):
+        status = self.server.status_provider()
+        self.wfile.write(json.dumps(status).encode("utf-8") + b"\n")
+
+
+class _TCPStatusServer(socketserver.TCPServer):
+    allow_reuse_address = True
+
+
+class StatusServer:
+    """
+    Local socket that answers every connection with the daemon's status as JSON
+    """
+
+    def __init__(self, address: str, status_provider: Callable[[], Dict[str, Any]]):
+        """
+        Bind the status socket
+
+        Args:
+            address: Unix socket path, or a TCP port number bound on 127.0.0.1
+            status_provider: Returns the status dictionary to report
+        """
+        self.address = address
+        if address.isdigit():
+            self._server = _TCPStatusServer(("127.0.0.1", int(address)), _StatusHandler)
+        else:
+            # A socket file left behind by a crashed run would block the bind
+            if os.path.exists(address):
+                os.unlink(address)
+            self._server = socketserver.UnixStreamServer(address, _StatusHandler)
+        self._server.status_provider = status_provider
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Serve status requests on a background thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.5,),
+                                        name="daemon-status", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop serving and remove the socket"""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread = None
+        self._server.server_close()
+        if not self.address.isdigit() and os.path.exists(self.address):
+            os.unlink(self.address)
+
+
+def query_status(address: str, timeout: float = 2.0) -> Dict[str, Any]:
+    """
+    Read the status of a running daemon
+
+    Args:
+        address: Status socket path or TCP port number
+        timeout: Socket timeout in seconds
+
+    Returns:
+        Status dictionary reported by the daemon
+    """
+    if address.isdigit():
+        sock = socket.create_connection(("127.0.0.1", int(address)), timeout)
+    else:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        sock.connect(address)
+    with sock, sock.makefile("rb") as f:
+        return json.loads(f.readline())
+
+
+def notify_systemd(state: str) -> bool:
+    """
+    Send a state update to systemd (sd_notify protocol)
+
+    Args:
+        state: Notification such as "READY=1" or "WATCHDOG=1"
+
+    Returns:
+        True if the notification was sent, False when not running under systemd
+    """
+    address = os.environ.get("NOTIFY_SOCKET")
+    if not address or not hasattr(socket, "AF_UNIX"):
+        return False
+    if address.startswith("@"):
+        address = "\0" + address[1:]
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.connect(address)
+            sock.sendall(state.encode("utf-8"))
+        return True
+    except OSError as e:
+        logging.warning(f"systemd notification failed: {e}")
+        return False
+
+
+class ScannerDaemon:
+    """
+    Headless scanner: camera lanes, verification and sync without a GUI
+    """
+
+    def __init__(self, camera_indexes: Iterable[int], db: Optional[DBManager] = None,
+                 plugins: Optional[List[ResultPlugin]] = None, status_address: Optional[str] = None,
+                 event_id: str = "", go_online: bool = True, dispatch_interval: float = 0.02):
+        """
+        Initialize the daemon
+
+        Args:
+            camera_indexes: Cameras to open, one lane each
+            db: Local database manager (defaults to config.DB_PATH)
+            plugins: Result plugins (defaults to logging each result)
+            status_address: Status socket path or TCP port, or None to disable it
+            event_id: Event whose tickets are loaded once Supabase is reachable
+            go_online: Connect to Supabase in the background after startup
+            dispatch_interval: Seconds between result dispatch rounds
+        """
+        self.db = db if db is not None else DBManager(config.DB_PATH)
+        # Supabase is attached later so startup never waits on the network
+        self.scanner = create_scanner(None, self.db, event_id)
+        self.checkin = CheckInService(self.scanner, self.db)
+        self.verifier = create_verify_worker(self.checkin)
+        self.camera_indexes = list(camera_indexes)
+        self.cameras = create_camera_manager()
+        self.plugins = plugins if plugins is not None else [LogPlugin()]
+        self.status_server = StatusServer(status_address, self.get_status) if status_address else None
+        self.event_id = event_id
+        self.go_online = go_online
+        self.dispatch_interval = dispatch_interval
+
+        self.lanes: List[ScanPipeline] = []
+        self.sync = None
+        self.online = False
+        self.results_dispatched = 0
+        self.last_result: Optional[Dict[str, Any]] = None
+        self.started_at: Optional[float] = None
+        self._stop = threading.Event()
+
+    def add_lane(self, capture, decode_pool=None) -> ScanPipeline:
+        """
+        Add a camera lane fed by an already opened capture
+
+        Args:
+            capture: cv2.VideoCapture-like object
+            decode_pool: Optional process pool for this lane's decoding
+
+        Returns:
+            The lane's pipeline
+        """
+        lane = ScanPipeline(create_scanner(), self.verifier, decode_pool=decode_pool,
+                            name=f"lane{len(self.lanes) + 1}")
+        lane.set_capture(capture)
+        self.lanes.append(lane)
+        return lane
+
+    def start(self):
+        """
+        Open the cameras and start all workers
+
+        Raises:
+            ScannerError: If cameras were requested but none could be opened
+        """
+        self.started_at = time.monotonic()
+        for camera_index in self.camera_indexes:
+            try:
+                capture, width, height = self.cameras.open(camera_index)
+            except Exception as e:
+                logging.error(f"Camera error: {e}")
+                continue
+            self.add_lane(capture, create_lane_decode_pool(len(self.camera_indexes)))
+        if self.camera_indexes and not self.lanes:
+            raise ScannerError("No camera could be opened")
+
+        self.verifier.start()
+        for lane in self.lanes:
+            lane.start()
+        for plugin in self.plugins:
+            plugin.on_start(self)
+        if self.status_server is not None:
+            self.status_server.start()
+        if self.go_online:
+            threading.Thread(target=self._connect_online, name="daemon-online", daemon=True).start()
+
+        notify_systemd("READY=1")
+        logging.info(f"Scanner daemon started with {len(self.lanes)} lane(s) "
+                     f"in {time.monotonic() - self.started_at:.2f}s")
+
+    def run(self):
+        """Dispatch results until stop() is called, then shut down"""
+        watchdog = int(os.environ.get("WATCHDOG_USEC", "0")) / 2e6
+        last_ping = time.monotonic()
+        try:
+            while not self._stop.wait(self.dispatch_interval):
+                self.dispatch_results()
+                if watchdog and time.monotonic() - last_ping >= watchdog:
+                    notify_systemd("WATCHDOG=1")
+                    last_ping = time.monotonic()
+        finally:
+            self.shutdown()
+
+    def stop(self):
+        """Ask run() to return; safe to call from a signal handler"""
+        self._stop.set()
+
+    def shutdown(self):
+        """Stop all workers, release the cameras and close the plugins"""
+        self._stop.set()
+        notify_systemd("STOPPING=1")
+        if self.status_server is not None:
+            self.status_server.stop()
+        if self.sync is not None:
+            self.sync.stop()
+        for lane in self.lanes:
+            lane.stop()
+            capture = lane.set_capture(None)
+            if capture is not None:
+                capture.release()
+            if lane.decode_pool is not None:
+                lane.decode_pool.close()
+        self.verifier.stop()
+        self.scanner.close()
+        try:
+            self.scanner.latency.dump(config.LATENCY_REPORT_PATH, {"scanner_id": self.checkin.scanner_id})
+        except OSError as e:
+            logging.warning(f"Could not write latency report: {e}")
+        for plugin in self.plugins:
+            try:
+                plugin.close()
+            except Exception as e:
+                logging.error(f"Plugin {type(plugin).__name__} failed to close: {e}")
+        logging.info("Scanner daemon stopped")
+
+    def dispatch_results(self) -> int:
+        """
+        Hand finished verification results to every plugin
+
+        Returns:
+            Number of results dispatched
+        """
+        count = 0
+        for lane in self.lanes:
+            for result in lane.get_results():
+                count += 1
+                self.results_dispatched += 1
+                self.last_result = result
+                for plugin in self.plugins:
+                    try:
+                        plugin.on_result(lane.name, result)
+                    except Exception as e:
+                        logging.error(f"Plugin {type(plugin).__name__} failed: {e}")
+        return count
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Get the daemon status reported on the status socket
+
+        Returns:
+            Dictionary with uptime, connectivity, counters and per-lane stage and decode stats
+        """
+        return {
+            "version": __version__,
+            "scanner_id": self.checkin.scanner_id,
+            "uptime_s": round(time.monotonic() - self.started_at, 1) if self.started_at else 0.0,
+            "online": self.online,
+            "event_id": self.sync.current_event_id if self.sync is not None else (self.event_id or None),
+            "scan_count": self.checkin.scan_count,
+            "results": self.results_dispatched,
+            "last_result": self.last_result,
+            "verify": self.verifier.stats.snapshot(),
+            "latency": self.scanner.latency.get_stats(),
+            "index": self.scanner.index.get_stats() if self.scanner.index is not None else None,
+            "revocations": self.scanner.revocations.get_stats() if self.scanner.revocations is not None else None,
+            "lanes": {
+                lane.name: {
+                    "stages": {stage: stats for stage, stats in lane.get_stats().items() if stage != "verify"},
+                    "decode": lane.scanner.get_decode_stats()
+                }
+                for lane in self.lanes
+            }
+        }
+
+    def _connect_online(self):
+        """Connect to Supabase, then start syncing and load the configured event"""
+        try:
+            # Imported here because the Supabase SDK alone takes longer to load than the rest of startup
+            from .api.supabase_client import SupabaseClient
+            from .core.sync import SyncEngine
+            supabase = SupabaseClient(config.SUPABASE_URL, config.SUPABASE_KEY)
+        except Exception as e:
+            logging.error(f"Supabase unavailable, running offline: {e}")
+            return
+        if self._stop.is_set():
+            return
+
+        self.scanner.supabase = supabase
+        self.checkin.supabase = supabase
+        self.online = supabase.connection_verified
+        self.sync = SyncEngine(self.db, supabase, index=self.scanner.index,
+                               revocations=self.scanner.revocations)
+        self.sync.start()
+        if self.event_id:
+            try:
+                self.sync.load_event(self.event_id)
+            except Exception as e:
+                logging.error(f"Error loading tickets: {e}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(description="Run the EventHive QR scanner without a GUI")
+    parser.add_argument("--cameras", default=",".join(str(i) for i in config.CAMERA_INDEXES),
+                        help="Comma-separated camera indexes, one lane each")
+    parser.add_argument("--event", default=config.EVENT_ID, help="Event whose tickets are loaded at startup")
+    parser.add_argument("--plugin", action="append", help="Result plugin as package.module:attribute (repeatable)")
+    parser.add_argument("--status-socket", default=config.DAEMON_STATUS_SOCKET,
+                        help="Unix socket path or TCP port for status queries (empty to disable)")
+    parser.add_argument("--offline", action="store_true", help="Do not connect to Supabase")
+    parser.add_argument("--status", action="store_true", help="Print the status of a running daemon and exit")
+    args = parser.parse_args(argv)
+
+    if args.status:
+        try:
+            print(json.dumps(query_status(args.status_socket), indent=2))
+            return 0
+        except OSError as e:
+            print(f"Error: cannot reach scanner daemon at {args.status_socket}: {e}", file=sys.stderr)
+            return 1
+
+    setup_logging(config.LOG_DIR, getattr(logging, config.LOG_LEVEL.upper(), logging.INFO))
+    try:
+        plugins = [LogPlugin()] + [load_plugin(spec) for spec in (args.plugin or config.DAEMON_PLUGINS)]
+    except (ImportError, AttributeError, ValueError) as e:
+        logging.error(f"Failed to load plugin: {e}")
+        return 1
+
+    daemon = ScannerDaemon(
+        [int(i) for i in args.cameras.split(",") if i.strip()],
+        plugins=plugins,
+        status_address=args.status_socket or None,
+        event_id=args.event,
+        go_online=not args.offline
+    )
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+    signal.signal(signal.SIGINT, lambda signum, frame: daemon.stop())
+    try:
+        daemon.start()
+    except ScannerError as e:
+        logging.error(f"Scanner daemon failed to start: {e}")
+        daemon.shutdown()
+        return 1
+    daemon.run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
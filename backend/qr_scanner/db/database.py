@@ -5,10 +5,69 @@ Handles all SQLite operations for offline-first validation and logging.
 
 import sqlite3
 import logging
+import threading
 import time
 import os
 from pathlib import Path
-from ..config import DB_PATH
+from typing import Any, Dict, NamedTuple, Optional
+from ..config import DB_PATH, DB_BUSY_TIMEOUT_MS, DB_CACHE_KB
+
+
+class AttendeeRecord(NamedTuple):
+    """Attendee row joined with its event, as returned by DBManager.lookup_attendee"""
+    id: str
+    event_id: str
+    qr_code: str
+    attendee_name: str
+    attendee_email: str
+    ticket_type: str
+    checked_in: bool
+    checked_in_at: Optional[str]
+    updated_at: Optional[str]
+    verification_status: Optional[str]
+    event_name: Optional[str]
+    event_date: Optional[str]
+    venue: Optional[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to the attendee dictionary format used in verification results
+
+        Returns:
+            Dictionary of the record's fields
+        """
+        return self._asdict()
+
+
+# Outcomes of a conditional check-in
+CHECKIN_ADMITTED = "admitted"
+CHECKIN_DUPLICATE = "duplicate"
+CHECKIN_NOT_FOUND = "not_found"
+
+# Attendee IDs per lookup of stored rows, within SQLite's bound parameter limit
+_PRELOAD_CHUNK = 500
+
+# Single indexed lookup (idx_qr_code) backing every local attendee query
+_LOOKUP_ATTENDEE = """
+    SELECT ba.id, ba.event_id, ba.qr_code, ba.attendee_name, ba.attendee_email, ba.ticket_type,
+           ba.checked_in, ba.checked_in_at, ba.updated_at, ba.verification_status,
+           e.name, e.event_date, e.venue
+    FROM booking_attendees ba
+    LEFT JOIN events e ON ba.event_id = e.id
+    WHERE ba.qr_code=?
+"""
+
+
+# Upsert assignments for an incoming booking_attendees row; a local check-in is
+# never undone by server state that is behind it
+_MERGE_ATTENDEE = """
+    event_id=excluded.event_id, qr_code=excluded.qr_code, attendee_name=excluded.attendee_name,
+    attendee_email=excluded.attendee_email, ticket_type=excluded.ticket_type,
+    checked_in_at=CASE WHEN checked_in=1 AND excluded.checked_in=0 THEN checked_in_at ELSE excluded.checked_in_at END,
+    checked_in=MAX(checked_in, excluded.checked_in),
+    updated_at=excluded.updated_at, verification_status=excluded.verification_status
+"""
+
 
 class DBManager:
     """
@@ -27,14 +86,59 @@ class DBManager:
         db_dir = Path(db_path).parent
         os.makedirs(db_dir, exist_ok=True)
         
-        # Connect to database
-        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # The single writer connection; every write holds _write_lock. In WAL
+        # mode readers on their own connections never wait for it.
+        self.conn = self._connect()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._write_lock = threading.Lock()
         self.create_tables()
+        
+        # Read connections, one per thread, keyed by the thread that opened them
+        self._local = threading.local()
+        self._readers = {}
+        self._readers_lock = threading.Lock()
         logging.info(f"Database initialized at {db_path}")
 
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the shared pragmas"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=DB_BUSY_TIMEOUT_MS / 1000)
+        conn.execute(f"PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS}")
+        # Durable across application crashes; a power loss may drop the last commits
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{DB_CACHE_KB}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    def reader(self) -> sqlite3.Connection:
+        """
+        Get the calling thread's read-only connection
+        
+        Returns:
+            Connection opened on first use by this thread
+        """
+        conn = getattr(self._local, "conn", None)
+        # close() drops the registry entry; the thread-local one would be a closed connection
+        if conn is None or self._readers.get(threading.current_thread()) is not conn:
+            conn = self._connect()
+            conn.execute("PRAGMA query_only=1")
+            self._local.conn = conn
+            # Cursor reused by lookup_attendee on every scan
+            self._local.lookup_cursor = conn.cursor()
+            with self._readers_lock:
+                # Close the connections of threads that have ended, so short-lived
+                # loader and preload threads don't each leave one open
+                for thread in [t for t in self._readers if not t.is_alive()]:
+                    self._readers.pop(thread).close()
+                self._readers[threading.current_thread()] = conn
+        return conn
+
     def create_tables(self):
         """Create necessary tables if they don't exist"""
-        cursor = self.conn.cursor()
+        with self._write_lock:
+            self._create_tables(self.conn.cursor())
+
+    def _create_tables(self, cursor: sqlite3.Cursor):
+        """Run the schema statements"""
         cursor.execute('''CREATE TABLE IF NOT EXISTS booking_attendees (
             id TEXT PRIMARY KEY,
             event_id TEXT,
@@ -66,8 +170,44 @@ class DBManager:
             scanned_at TEXT,
             synced INTEGER DEFAULT 0
         )''')
+        
+        # Incremental sync position per event: the (updated_at, id) of the newest
+        # row fetched, and when the last full download finished
+        cursor.execute('''CREATE TABLE IF NOT EXISTS sync_state (
+            event_id TEXT PRIMARY KEY,
+            watermark_updated_at TEXT,
+            watermark_id TEXT,
+            full_sync_at REAL
+        )''')
+        
+        # Position of an interrupted paged download, so it resumes where it stopped
+        cursor.execute('''CREATE TABLE IF NOT EXISTS preload_progress (
+            event_id TEXT PRIMARY KEY,
+            last_id TEXT,
+            rows INTEGER,
+            watermark_updated_at TEXT,
+            watermark_id TEXT
+        )''')
         self.conn.commit()
 
+    def lookup_attendee(self, qr_code: str) -> Optional[AttendeeRecord]:
+        """
+        Look up an attendee and their event in one query
+        
+        Args:
+            qr_code: QR code of the attendee
+            
+        Returns:
+            AttendeeRecord, or None if the QR code is not in the local database
+        """
+        self.reader()
+        cursor = self._local.lookup_cursor
+        cursor.execute(_LOOKUP_ATTENDEE, (qr_code,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return AttendeeRecord(*row[:6], row[6] == 1, *row[7:])
+
     def is_attendee_checked_in(self, qr_code: str) -> bool:
         """
         Check if an attendee has already been checked in
@@ -78,10 +218,8 @@ class DBManager:
         Returns:
             True if already checked in, False otherwise
         """
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT checked_in FROM booking_attendees WHERE qr_code=?", (qr_code,))
-        row = cursor.fetchone()
-        return row is not None and row[0] == 1
+        record = self.lookup_attendee(qr_code)
+        return record is not None and record.checked_in
 
     def mark_attendee_checked_in(self, qr_code: str):
         """
@@ -91,12 +229,82 @@ class DBManager:
             qr_code: QR code of the attendee
         """
         timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
-        cursor = self.conn.cursor()
-        cursor.execute("UPDATE booking_attendees SET checked_in=1, checked_in_at=?, updated_at=? WHERE qr_code=?", 
-                      (timestamp, timestamp, qr_code))
-        self.conn.commit()
+        with self._write_lock:
+            cursor = self.conn.cursor()
+            # updated_at stays the server's version, so the next preload can tell whether the row changed
+            cursor.execute("UPDATE booking_attendees SET checked_in=1, checked_in_at=? WHERE qr_code=?",
+                          (timestamp, qr_code))
+            self.conn.commit()
         logging.info(f"Attendee with QR code {qr_code} marked as checked in")
 
+    def check_in_attendee(self, qr_code: str, scanner_id: Optional[str] = None,
+                          attendee: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Check an attendee in only if they are not checked in yet
+        
+        The conditional UPDATE is the verdict: when two lanes race on one ticket
+        exactly one of them changes the row. The scan log entry is written in the
+        same transaction unless the check-in is a duplicate.
+        
+        Args:
+            qr_code: QR code of the attendee
+            scanner_id: ID of the scanner device to log the scan under, if any
+            attendee: Attendee fields (id, event_id, ticket_type) for a ticket that
+                may not be in the local database yet, such as a signed ticket. The
+                row is created if missing and matched by ID as well as QR code,
+                so the check-in survives restarts and later preloads.
+            
+        Returns:
+            CHECKIN_ADMITTED, CHECKIN_DUPLICATE, or CHECKIN_NOT_FOUND if the QR
+            code is not in the local database
+        """
+        timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
+        attendee_id = attendee.get('id') if attendee else None
+        with self._write_lock:
+            cursor = self.conn.cursor()
+            if attendee_id:
+                cursor.execute("""
+                    INSERT OR IGNORE INTO booking_attendees
+                    (id, event_id, qr_code, ticket_type, checked_in, verification_status)
+                    VALUES (?, ?, ?, ?, 0, 'pending')
+                    """, (attendee_id, attendee.get('event_id', ''), qr_code, attendee.get('ticket_type', '')))
+            cursor.execute("UPDATE booking_attendees SET checked_in=1, checked_in_at=? "
+                           "WHERE (qr_code=? OR id=?) AND checked_in=0", (timestamp, qr_code, attendee_id))
+            if cursor.rowcount >= 1:
+                outcome = CHECKIN_ADMITTED
+            else:
+                cursor.execute("SELECT 1 FROM booking_attendees WHERE qr_code=? OR id=?", (qr_code, attendee_id))
+                outcome = CHECKIN_DUPLICATE if cursor.fetchone() else CHECKIN_NOT_FOUND
+            if scanner_id is not None and outcome != CHECKIN_DUPLICATE:
+                cursor.execute("INSERT INTO scans_local (qr_code, scanner_id, scanned_at, synced) VALUES (?, ?, ?, 0)",
+                               (qr_code, scanner_id, timestamp))
+            self.conn.commit()
+        logging.info(f"Check-in for QR code {qr_code}: {outcome}")
+        return outcome
+
+    def settle_online_check_in(self, qr_code: str, scanner_id: str, outcome: str):
+        """
+        Apply the online verdict to a scan just admitted locally
+        
+        An online admission means the scan needs no later sync. An online
+        duplicate means another device admitted the ticket first, so the scan is
+        dropped from the log; the attendee stays checked in, as they are.
+        
+        Args:
+            qr_code: QR code that was checked in
+            scanner_id: ID the scan was logged under
+            outcome: Result of the online check-in
+        """
+        with self._write_lock:
+            cursor = self.conn.cursor()
+            if outcome == CHECKIN_ADMITTED:
+                cursor.execute("UPDATE scans_local SET synced=1 WHERE qr_code=? AND scanner_id=? AND synced=0",
+                               (qr_code, scanner_id))
+            elif outcome == CHECKIN_DUPLICATE:
+                cursor.execute("DELETE FROM scans_local WHERE qr_code=? AND scanner_id=? AND synced=0",
+                               (qr_code, scanner_id))
+            self.conn.commit()
+
     def add_scan_log(self, qr_code: str, scanner_id: str):
         """
         Add a scan log entry
@@ -105,60 +313,97 @@ class DBManager:
             qr_code: QR code that was scanned
             scanner_id: ID of the scanner device
         """
-        cursor = self.conn.cursor()
-        cursor.execute("INSERT INTO scans_local (qr_code, scanner_id, scanned_at, synced) VALUES (?, ?, ?, 0)",
-                       (qr_code, scanner_id, time.strftime('%Y-%m-%d %H:%M:%S')))
-        self.conn.commit()
+        with self._write_lock:
+            cursor = self.conn.cursor()
+            cursor.execute("INSERT INTO scans_local (qr_code, scanner_id, scanned_at, synced) VALUES (?, ?, ?, 0)",
+                           (qr_code, scanner_id, time.strftime('%Y-%m-%d %H:%M:%S')))
+            self.conn.commit()
         logging.debug(f"Scan log added for QR code {qr_code}")
 
-    def preload_tickets(self, attendees: list):
+    def preload_tickets(self, attendees: list) -> Dict[str, int]:
         """
         Preload attendee data to local database
         
+        All rows are written in one transaction with executemany. Rows whose
+        server updated_at matches the stored one are skipped, each event is
+        written once, and a local check-in is kept even if the incoming row has
+        not caught up with it yet, including when a row with a new ID takes
+        over an existing QR code.
+        
         Args:
             attendees: List of attendee data dictionaries
+            
+        Returns:
+            Dictionary with inserted, updated and unchanged row counts
         """
-        cursor = self.conn.cursor()
+        events = {}
+        rows = {}
         for a in attendees:
-            # First, store event data if present
+            # Store each event once, whichever attendee carries it
             if 'event' in a and isinstance(a['event'], dict):
                 event = a['event']
-                cursor.execute("""
-                    INSERT OR REPLACE INTO events
-                    (id, name, event_date, venue, organizer_id, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        event.get('id', ''),
-                        event.get('name', ''),
-                        event.get('event_date', ''),
-                        event.get('venue', ''),
-                        event.get('organizer_id', ''),
-                        event.get('updated_at', '')
-                    )
-                )
-            
-            # Then store attendee data
-            cursor.execute("""
-                INSERT OR REPLACE INTO booking_attendees 
-                (id, event_id, qr_code, attendee_name, attendee_email, ticket_type, checked_in, checked_in_at, updated_at, verification_status) 
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    a.get('id', ''), 
-                    a.get('event_id', ''),
-                    a.get('qr_code', ''),
-                    a.get('attendee_name', ''),
-                    a.get('attendee_email', ''),
-                    a.get('ticket_type', ''),
-                    1 if a.get('checked_in') else 0,
-                    a.get('checked_in_at', ''),
-                    a.get('updated_at', ''),
-                    a.get('verification_status', 'pending')
+                events[event.get('id', '')] = (
+                    event.get('id', ''),
+                    event.get('name', ''),
+                    event.get('event_date', ''),
+                    event.get('venue', ''),
+                    event.get('organizer_id', ''),
+                    event.get('updated_at', '')
                 )
+            rows[a.get('id', '')] = (
+                a.get('id', ''),
+                a.get('event_id', ''),
+                a.get('qr_code', ''),
+                a.get('attendee_name', ''),
+                a.get('attendee_email', ''),
+                a.get('ticket_type', ''),
+                1 if a.get('checked_in') else 0,
+                a.get('checked_in_at', ''),
+                a.get('updated_at', ''),
+                a.get('verification_status', 'pending')
             )
-        self.conn.commit()
-        logging.info(f"Preloaded {len(attendees)} attendees to local database")
+        
+        with self._write_lock:
+            cursor = self.conn.cursor()
+            stored = {}
+            ids = list(rows)
+            for start in range(0, len(ids), _PRELOAD_CHUNK):
+                chunk = ids[start:start + _PRELOAD_CHUNK]
+                cursor.execute(f"SELECT id, updated_at FROM booking_attendees WHERE id IN ({','.join('?' * len(chunk))})",
+                               chunk)
+                stored.update(cursor.fetchall())
+            
+            inserts, updates = [], []
+            for attendee_id, row in rows.items():
+                if attendee_id not in stored:
+                    inserts.append(row)
+                elif not row[8] or row[8] != stored[attendee_id]:
+                    updates.append(row)
+            
+            with self.conn:
+                cursor.executemany("""
+                    INSERT INTO events
+                    (id, name, event_date, venue, organizer_id, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        name=excluded.name, event_date=excluded.event_date, venue=excluded.venue,
+                        organizer_id=excluded.organizer_id, updated_at=excluded.updated_at
+                    """, events.values())
+                # An upsert rather than INSERT OR REPLACE: replacing deletes the row
+                # holding a colliding qr_code, and its local check-in with it
+                cursor.executemany(f"""
+                    INSERT INTO booking_attendees
+                    (id, event_id, qr_code, attendee_name, attendee_email, ticket_type, checked_in, checked_in_at, updated_at, verification_status)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET {_MERGE_ATTENDEE}
+                    ON CONFLICT(qr_code) DO UPDATE SET id=excluded.id, {_MERGE_ATTENDEE}
+                    """, inserts + updates)
+        
+        counts = {"inserted": len(inserts), "updated": len(updates),
+                  "unchanged": len(rows) - len(inserts) - len(updates)}
+        logging.info(f"Preloaded {len(attendees)} attendees to local database: "
+                     f"{counts['inserted']} inserted, {counts['updated']} updated, {counts['unchanged']} unchanged")
+        return counts
         
     def get_unsynced_scans(self):
         """
@@ -167,9 +412,20 @@ class DBManager:
         Returns:
             List of tuples with scan data
         """
-        cursor = self.conn.cursor()
+        cursor = self.reader().cursor()
         cursor.execute("SELECT scan_id, qr_code, scanner_id, scanned_at FROM scans_local WHERE synced=0")
         return cursor.fetchall()
+
+    def count_scans(self) -> int:
+        """
+        Count the scans logged on this device
+        
+        Returns:
+            Number of scan log entries
+        """
+        cursor = self.reader().cursor()
+        cursor.execute("SELECT COUNT(*) FROM scans_local")
+        return cursor.fetchone()[0]
         
     def mark_scan_synced(self, scan_id: int):
         """
@@ -178,9 +434,10 @@ class DBManager:
         Args:
             scan_id: ID of the scan to mark
         """
-        cursor = self.conn.cursor()
-        cursor.execute("UPDATE scans_local SET synced=1 WHERE scan_id=?", (scan_id,))
-        self.conn.commit()
+        with self._write_lock:
+            cursor = self.conn.cursor()
+            cursor.execute("UPDATE scans_local SET synced=1 WHERE scan_id=?", (scan_id,))
+            self.conn.commit()
         logging.debug(f"Scan {scan_id} marked as synced")
         
     def is_attendee_in_db(self, qr_code: str) -> bool:
@@ -193,10 +450,7 @@ class DBManager:
         Returns:
             True if attendee exists, False otherwise
         """
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT id FROM booking_attendees WHERE qr_code=?", (qr_code,))
-        row = cursor.fetchone()
-        return row is not None
+        return self.lookup_attendee(qr_code) is not None
         
     def get_attendee_by_qr(self, qr_code: str) -> dict:
         """
@@ -208,21 +462,8 @@ class DBManager:
         Returns:
             Dictionary with attendee data or None if not found
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT ba.*, e.name as event_name, e.event_date, e.venue
-            FROM booking_attendees ba
-            LEFT JOIN events e ON ba.event_id = e.id
-            WHERE ba.qr_code=?
-        """, (qr_code,))
-        row = cursor.fetchone()
-        
-        if not row:
-            return None
-            
-        # Convert row to dictionary
-        columns = [col[0] for col in cursor.description]
-        return {columns[i]: row[i] for i in range(len(columns))}
+        record = self.lookup_attendee(qr_code)
+        return record.to_dict() if record else None
         
     def verify_qr_code(self, qr_code: str) -> tuple:
         """
@@ -234,14 +475,12 @@ class DBManager:
         Returns:
             Tuple of (is_valid, message)
         """
-        if not self.is_attendee_in_db(qr_code):
+        record = self.lookup_attendee(qr_code)
+        if record is None:
             return False, "QR code not found in local database"
             
-        if self.is_attendee_checked_in(qr_code):
+        if record.checked_in:
             return False, "Attendee already checked in"
-            
-        # Get attendee details for event validation if needed
-        attendee = self.get_attendee_by_qr(qr_code)
         
         # You could add additional validation here (e.g., check event date)
         
@@ -255,11 +494,109 @@ class DBManager:
             qr_code: QR code of the attendee
             status: New verification status
         """
-        cursor = self.conn.cursor()
-        cursor.execute("UPDATE booking_attendees SET verification_status=? WHERE qr_code=?", (status, qr_code))
-        self.conn.commit()
+        with self._write_lock:
+            cursor = self.conn.cursor()
+            cursor.execute("UPDATE booking_attendees SET verification_status=? WHERE qr_code=?", (status, qr_code))
+            self.conn.commit()
         logging.info(f"Updated verification status to '{status}' for QR code {qr_code}")
         
+    def get_sync_state(self, event_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the stored incremental sync position for an event
+        
+        Args:
+            event_id: ID of the event
+            
+        Returns:
+            Dictionary with updated_at, id and full_sync_at, or None if the event
+            has never been synced
+        """
+        cursor = self.reader().cursor()
+        cursor.execute("SELECT watermark_updated_at, watermark_id, full_sync_at FROM sync_state WHERE event_id=?",
+                       (event_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return {"updated_at": row[0], "id": row[1], "full_sync_at": row[2] or 0.0}
+
+    def set_sync_state(self, event_id: str, updated_at: Optional[str], last_id: Optional[str],
+                       full_sync_at: Optional[float] = None):
+        """
+        Store the incremental sync position for an event
+        
+        Args:
+            event_id: ID of the event
+            updated_at: updated_at of the newest row fetched
+            last_id: ID of that row, breaking ties between rows with the same updated_at
+            full_sync_at: Unix time a full download finished; None keeps the stored time
+        """
+        with self._write_lock:
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                INSERT INTO sync_state (event_id, watermark_updated_at, watermark_id, full_sync_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(event_id) DO UPDATE SET
+                    watermark_updated_at=excluded.watermark_updated_at,
+                    watermark_id=excluded.watermark_id,
+                    full_sync_at=COALESCE(excluded.full_sync_at, sync_state.full_sync_at)
+                """, (event_id, updated_at, last_id, full_sync_at))
+            self.conn.commit()
+
+    def get_preload_progress(self, event_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the resume position of an unfinished paged download
+        
+        Args:
+            event_id: ID of the event
+            
+        Returns:
+            Dictionary with last_id, the number of rows stored so far and their
+            updated_at and id watermark, or None if no download is unfinished
+        """
+        cursor = self.reader().cursor()
+        cursor.execute("SELECT last_id, rows, watermark_updated_at, watermark_id FROM preload_progress "
+                       "WHERE event_id=?", (event_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return {"last_id": row[0], "rows": row[1], "updated_at": row[2], "id": row[3]}
+
+    def set_preload_progress(self, event_id: str, last_id: Optional[str], rows: int = 0,
+                             updated_at: Optional[str] = None, watermark_id: Optional[str] = None):
+        """
+        Store or clear the resume position of a paged download
+        
+        Args:
+            event_id: ID of the event
+            last_id: Highest ticket ID stored, the next page starts after it; None
+                clears the position once the download has finished
+            rows: Rows stored so far
+            updated_at: updated_at watermark of the rows stored so far
+            watermark_id: ID tie-breaker of that watermark
+        """
+        with self._write_lock:
+            cursor = self.conn.cursor()
+            if last_id is None:
+                cursor.execute("DELETE FROM preload_progress WHERE event_id=?", (event_id,))
+            else:
+                cursor.execute("INSERT OR REPLACE INTO preload_progress VALUES (?, ?, ?, ?, ?)",
+                               (event_id, last_id, rows, updated_at, watermark_id))
+            self.conn.commit()
+
+    def count_attendees(self, event_id: str) -> int:
+        """
+        Count the attendees stored for an event
+        
+        Args:
+            event_id: ID of the event
+            
+        Returns:
+            Number of attendees
+        """
+        cursor = self.reader().cursor()
+        cursor.execute("SELECT COUNT(*) FROM booking_attendees WHERE event_id=?", (event_id,))
+        return cursor.fetchone()[0]
+        
     def get_event_attendees(self, event_id: str, checked_in_only: bool = False):
         """
         Get all attendees for an event
@@ -271,7 +608,7 @@ class DBManager:
         Returns:
             List of attendee data dictionaries
         """
-        cursor = self.conn.cursor()
+        cursor = self.reader().cursor()
         query = "SELECT * FROM booking_attendees WHERE event_id=?"
         if checked_in_only:
             query += " AND checked_in=1"
@@ -286,5 +623,10 @@ class DBManager:
         ]
     
     def close(self):
-        """Close the database connection"""
-        self.conn.close()
+        """Close the writer and every thread's read connection"""
+        with self._readers_lock:
+            readers, self._readers = self._readers, {}
+        for conn in readers.values():
+            conn.close()
+        with self._write_lock:
+            self.conn.close()
@@ -5,20 +5,166 @@ A graphical QR code scanner for event check-in
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-import PIL.Image, PIL.ImageTk
-import cv2
-from pyzbar import pyzbar
 import logging
 import time
 import threading
 import os
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable
 
 from ..db.database import DBManager
 from ..api.supabase_client import SupabaseClient
 from ..core.scanner import QRScanner
+from ..core.pipeline import ScanPipeline, VerifyWorker
+from ..core.checkin import CheckInService
+from ..core.runtime import create_scanner, create_lane_decode_pool, create_camera_manager, create_verify_worker
+from ..core.camera import CameraManager
+from ..core.sync import SyncEngine
+from .components import ScanResultDisplay, VideoDisplay
 from .. import config
 
+
+class CameraLane:
+    """One camera with its own capture/decode workers, preview and result panel"""
+    
+    def __init__(self, parent_frame, lane_number: int, camera_index: int, scanner: QRScanner,
+                 verifier: VerifyWorker, cameras: CameraManager, decode_pool=None):
+        """
+        Initialize a camera lane
+        
+        Args:
+            parent_frame: Frame the lane panel is placed in
+            lane_number: 1-based lane number shown in the panel title
+            camera_index: Index of the camera to open
+            scanner: Scanner holding this lane's decode state
+            verifier: Verification worker shared by all lanes
+            cameras: Camera manager shared by all lanes
+            decode_pool: Optional process pool for this lane's decoding
+        """
+        self.scanner = scanner
+        self.cameras = cameras
+        self.decode_pool = decode_pool
+        self.pipeline = ScanPipeline(scanner, verifier, decode_pool=decode_pool, name=f"lane{lane_number}",
+                                     on_result=self.deliver_result)
+        self.vid = None
+        self.camera_index: Optional[int] = None
+        
+        self.frame = ttk.LabelFrame(parent_frame, text=f"Lane {lane_number}", padding=5)
+        self.frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
+        
+        # Camera selection and lane counters
+        header = ttk.Frame(self.frame)
+        header.pack(fill=tk.X)
+        ttk.Label(header, text="Camera:").pack(side=tk.LEFT, padx=5)
+        self.camera_var = tk.StringVar(value=str(camera_index))
+        self.camera_combo = ttk.Combobox(header, textvariable=self.camera_var, width=5)
+        self.set_camera_choices(cameras.available)
+        self.camera_combo.pack(side=tk.LEFT, padx=5)
+        self.camera_combo.bind("<<ComboboxSelected>>", self.change_camera)
+        self.stats_var = tk.StringVar()
+        ttk.Label(header, textvariable=self.stats_var).pack(side=tk.RIGHT, padx=5)
+        
+        self.video = VideoDisplay(self.frame, max_fps=config.PREVIEW_FPS)
+        self.results = ScanResultDisplay(self.frame)
+    
+    def start(self):
+        """Open the camera and start the lane's workers"""
+        self.start_camera()
+        self.pipeline.start()
+    
+    def start_camera(self):
+        """Initialize the camera capture"""
+        self.release_camera()
+        
+        try:
+            camera_index = int(self.camera_var.get())
+            self.vid, width, height = self.cameras.open(camera_index)
+            self.camera_index = camera_index
+            self.pipeline.set_capture(self.vid)
+            logging.info(f"Camera {camera_index} started with resolution {width}x{height}")
+        except Exception as e:
+            messagebox.showerror("Camera Error", f"Failed to open camera: {str(e)}")
+            logging.error(f"Camera error: {e}")
+            self.vid = None
+    
+    def release_camera(self):
+        """Detach and release the lane's camera, if any"""
+        previous = self.pipeline.set_capture(None)
+        if self.camera_index is not None:
+            self.cameras.release(self.camera_index, previous)
+        elif previous is not None:
+            previous.release()
+        self.vid = None
+        self.camera_index = None
+    
+    def change_camera(self, event=None):
+        """Handle camera change"""
+        self.start_camera()
+    
+    def set_camera_choices(self, devices: List[int]):
+        """
+        Offer the probed cameras in the camera selector
+        
+        Args:
+            devices: Available camera indexes
+        """
+        choices = {str(device) for device in devices} | {self.camera_var.get()}
+        self.camera_combo.configure(values=sorted(choices, key=int))
+    
+    def update(self):
+        """Render the newest frame"""
+        frame, analysis = self.pipeline.get_preview()
+        if frame is not None:
+            rects = [symbol.rect for symbol in analysis.symbols] if analysis is not None else []
+            self.video.update_frame(frame, rects=rects)
+    
+    def deliver_result(self, result: Dict[str, Any]):
+        """
+        Hand a verification result to the Tk thread
+        
+        Called on the verification worker, so the preview never waits on verification I/O.
+        
+        Args:
+            result: Dictionary returned by CheckInService.verify_and_check_in
+        """
+        self.frame.after(0, self.show_scan_result, result)
+    
+    def show_scan_result(self, result: Dict[str, Any]):
+        """
+        Display a verification result produced by the pipeline
+        
+        Args:
+            result: Dictionary returned by CheckInService.verify_and_check_in
+        """
+        qr_code = result["qr_code"]
+        qr_code = qr_code[:30] + "..." if len(qr_code) > 30 else qr_code
+        if result["is_valid"]:
+            self.results.show_valid_result(qr_code, result["event_id"], result["attendee"], result["message"])
+        else:
+            self.results.show_invalid_result(qr_code, result["message"], result["event_id"], result["attendee"])
+    
+    def refresh_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Update the lane's fps readout
+        
+        Returns:
+            The lane's pipeline counters
+        """
+        stats = self.pipeline.get_stats()
+        text = f"capture {stats['capture']['fps']:.0f}fps | decode {stats['decode']['fps']:.0f}fps"
+        cascade = self.scanner.get_decode_stats().get("cascade")
+        if cascade is not None:
+            text += f" | rescued {cascade['rescued']}/{cascade['runs']}"
+        self.stats_var.set(text)
+        return stats
+    
+    def close(self):
+        """Stop the lane's workers and release its camera"""
+        self.pipeline.stop()
+        self.release_camera()
+        if self.decode_pool is not None:
+            self.decode_pool.close()
+
+
 class QRScannerApp:
     """Main GUI application for QR scanner"""
     
@@ -48,31 +194,33 @@ class QRScannerApp:
         # Initialize core components
         self.db = DBManager(config.DB_PATH)
         self.supabase = SupabaseClient(config.SUPABASE_URL, config.SUPABASE_KEY)
-        self.scanner = QRScanner(config.HMAC_SECRET, self.supabase, self.db)
+        # The verifying scanner is shared by all lanes
+        self.scanner = create_scanner(self.supabase, self.db)
+        self.checkin = CheckInService(self.scanner, self.db, self.supabase)
+        self.sync = SyncEngine(self.db, self.supabase, index=self.scanner.index,
+                               revocations=self.scanner.revocations)
         
-        # Video capture
-        self.vid = None  # Will be initialized later
-        self.camera_index = config.CAMERA_INDEX
+        # Verification runs off the Tk thread on one worker shared by all camera lanes
+        self.verifier = create_verify_worker(self.checkin)
+        self.camera_indexes = config.CAMERA_INDEXES
+        self.cameras = create_camera_manager()
         
         # Create GUI elements
         self.create_widgets()
         
         # Status variables
-        self.last_scan_time = 0
-        self.scan_cooldown = config.SCAN_COOLDOWN_SEC
-        self.processing_qr = False
-        self.current_event_id = None
+        self.last_stats_update = 0
         
-        # Start sync thread
-        self.sync_thread = threading.Thread(target=self.sync_offline_scans, daemon=True)
-        self.sync_thread.start()
+        # Start background sync and polling
+        self.sync.start()
         
-        # Start polling thread instead of realtime subscriptions
-        self.polling_thread = threading.Thread(target=self.poll_for_ticket_updates, daemon=True)
-        self.polling_thread.start()
-        
-        # Start camera
-        self.start_camera()
+        # Start cameras
+        self.verifier.start()
+        for lane in self.lanes:
+            lane.start()
+        # Look for other cameras without holding up startup
+        self.cameras.probe_async(lambda devices: self.window.after(0, lambda: self.set_camera_choices(devices)))
+        self.window.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # Update loop
         self.update()
@@ -97,64 +245,20 @@ class QRScannerApp:
         self.load_button = ttk.Button(self.controls_frame, text="Load Tickets", command=self.load_event_tickets)
         self.load_button.pack(side=tk.LEFT, padx=5)
         
-        # Camera selection
-        ttk.Label(self.controls_frame, text="Camera:").pack(side=tk.LEFT, padx=5)
-        self.camera_var = tk.StringVar(value=str(self.camera_index))
-        self.camera_combo = ttk.Combobox(self.controls_frame, textvariable=self.camera_var, width=5, values=["0", "1", "2"])
-        self.camera_combo.pack(side=tk.LEFT, padx=5)
-        self.camera_combo.bind("<<ComboboxSelected>>", self.change_camera)
-        
         # Status label
         self.status_var = tk.StringVar(value="Ready to scan")
         self.status_label = ttk.Label(self.controls_frame, textvariable=self.status_var, font=("Arial", 12))
         self.status_label.pack(side=tk.RIGHT, padx=10)
         
-        # Video frame
-        self.video_frame = ttk.Frame(self.main_frame, borderwidth=2, relief="groove")
-        self.video_frame.pack(fill=tk.BOTH, expand=True, pady=10)
-        
-        # Canvas for video display
-        self.canvas = tk.Canvas(self.video_frame, bg="black")
-        self.canvas.pack(fill=tk.BOTH, expand=True)
-        
-        # Results frame
-        self.results_frame = ttk.Frame(self.main_frame)
-        self.results_frame.pack(fill=tk.X, pady=10)
-        
-        # Scan result display
-        self.result_frame = ttk.LabelFrame(self.results_frame, text="Last Scan Result", padding=10)
-        self.result_frame.pack(fill=tk.X)
-        
-        # Grid for ticket details
-        self.result_grid = ttk.Frame(self.result_frame)
-        self.result_grid.pack(fill=tk.X, padx=5, pady=5)
-        
-        # QR Code
-        ttk.Label(self.result_grid, text="QR Code:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=2)
-        self.ticket_id_var = tk.StringVar()
-        ttk.Label(self.result_grid, textvariable=self.ticket_id_var, font=("Arial", 10, "bold")).grid(row=0, column=1, sticky=tk.W, padx=5, pady=2)
-        
-        # Event ID
-        ttk.Label(self.result_grid, text="Event ID:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=2)
-        self.event_id_result_var = tk.StringVar()
-        ttk.Label(self.result_grid, textvariable=self.event_id_result_var).grid(row=1, column=1, sticky=tk.W, padx=5, pady=2)
-        
-        # Attendee Info
-        ttk.Label(self.result_grid, text="Attendee:").grid(row=2, column=0, sticky=tk.W, padx=5, pady=2)
-        self.issued_to_var = tk.StringVar()
-        ttk.Label(self.result_grid, textvariable=self.issued_to_var).grid(row=2, column=1, sticky=tk.W, padx=5, pady=2)
-        
-        # Status
-        ttk.Label(self.result_grid, text="Status:").grid(row=3, column=0, sticky=tk.W, padx=5, pady=2)
-        self.ticket_status_var = tk.StringVar()
-        self.ticket_status_label = ttk.Label(self.result_grid, textvariable=self.ticket_status_var, font=("Arial", 11, "bold"))
-        self.ticket_status_label.grid(row=3, column=1, sticky=tk.W, padx=5, pady=2)
-        
-        # Message
-        ttk.Label(self.result_grid, text="Message:").grid(row=4, column=0, sticky=tk.W, padx=5, pady=2)
-        self.message_var = tk.StringVar()
-        self.message_label = ttk.Label(self.result_grid, textvariable=self.message_var)
-        self.message_label.grid(row=4, column=1, sticky=tk.W, padx=5, pady=2)
+        # One panel per camera lane
+        self.lanes_frame = ttk.Frame(self.main_frame)
+        self.lanes_frame.pack(fill=tk.BOTH, expand=True, pady=10)
+        
+        self.lanes = []
+        for number, camera_index in enumerate(self.camera_indexes, start=1):
+            decode_pool = create_lane_decode_pool(len(self.camera_indexes))
+            self.lanes.append(CameraLane(self.lanes_frame, number, camera_index,
+                                         create_scanner(), self.verifier, self.cameras, decode_pool))
         
         # Status bar
         self.status_bar = ttk.Frame(self.window)
@@ -167,23 +271,22 @@ class QRScannerApp:
         self.scan_count_var = tk.StringVar(value="Scans: 0")
         ttk.Label(self.status_bar, textvariable=self.scan_count_var).pack(side=tk.RIGHT, padx=5, pady=2)
         
-    def start_camera(self):
-        """Initialize the camera capture"""
-        if self.vid is not None:
-            self.vid.release()
+        self.pipeline_stats_var = tk.StringVar()
+        ttk.Label(self.status_bar, textvariable=self.pipeline_stats_var).pack(side=tk.RIGHT, padx=5, pady=2)
         
-        try:
-            camera_index = int(self.camera_var.get())
-            self.vid, width, height = self.scanner.get_camera_device(camera_index)
-            logging.info(f"Camera {camera_index} started with resolution {width}x{height}")
-        except Exception as e:
-            messagebox.showerror("Camera Error", f"Failed to open camera: {str(e)}")
-            logging.error(f"Camera error: {e}")
-            self.vid = None
-    
-    def change_camera(self, event=None):
-        """Handle camera change"""
-        self.start_camera()
+        # p50/p95/p99 of the slowest verification stages
+        self.latency_var = tk.StringVar()
+        ttk.Label(self.status_bar, textvariable=self.latency_var).pack(side=tk.RIGHT, padx=5, pady=2)
+        
+    def set_camera_choices(self, devices: List[int]):
+        """
+        Update every lane's camera selector after a device probe
+        
+        Args:
+            devices: Available camera indexes
+        """
+        for lane in self.lanes:
+            lane.set_camera_choices(devices)
     
     def load_event_tickets(self):
         """Load ticket data for an event from Supabase"""
@@ -205,215 +308,68 @@ class QRScannerApp:
     def _load_tickets_thread(self, event_id):
         """Background thread for loading tickets"""
         try:
-            tickets = self.supabase.preload_tickets(event_id)
-            if tickets:
-                self.db.preload_tickets(tickets)
-                self.window.after(0, lambda: self.status_var.set(f"Loaded {len(tickets)} tickets"))
+            count = self.sync.load_event(event_id, on_progress=self._show_load_progress)
+            if count:
+                # Signed tickets are only admitted for the loaded event
+                self.scanner.event_id = event_id
+                self.window.after(0, lambda: self.status_var.set(f"Loaded {count} tickets"))
                 self.window.after(0, lambda: self.sync_status_var.set(f"Connected to Supabase - Event: {event_id}"))
-                logging.info(f"Loaded {len(tickets)} tickets for event {event_id}")
-                self.current_event_id = event_id
             else:
                 self.window.after(0, lambda: self.status_var.set("No tickets found"))
-                logging.warning(f"No tickets found for event {event_id}")
         except Exception as e:
             logging.error(f"Error loading tickets: {e}")
             self.window.after(0, lambda: self.status_var.set("Error loading tickets"))
     
-    def process_qr_code(self, qr_data):
-        """Process scanned QR code data"""
-        if self.processing_qr:
-            return
-        
-        self.processing_qr = True
-        try:
-            logging.info(f"Processing QR code: {qr_data[:20]}...")
-            
-            # Use the enhanced verification system
-            is_valid, result_data, message = self.scanner.verify_qr_code(qr_data)
-            
-            # Get the QR code value - might be in different places depending on format
-            qr_code = result_data.get("qr_code", qr_data.strip())
-            
-            # Update UI with QR code
-            self.ticket_id_var.set(qr_code[:30] + "..." if len(qr_code) > 30 else qr_code)
-            
-            # Handle attendee data display
-            attendee_data = None
-            
-            # Check if attendee data is in the result
-            if "attendee" in result_data:
-                attendee = result_data["attendee"]
-                event_id = attendee.get('event_id', '')
-                attendee_name = attendee.get('attendee_name', '')
-                attendee_email = attendee.get('attendee_email', '')
-                
-                # Update UI with attendee details
-                self.event_id_result_var.set(event_id)
-                self.issued_to_var.set(f"{attendee_name} ({attendee_email})")
-            else:
-                # Try to get from database
-                cursor = self.db.conn.cursor()
-                cursor.execute("SELECT * FROM booking_attendees WHERE qr_code=?", (qr_code,))
-                attendee_data = cursor.fetchone()
-                
-                if attendee_data:
-                    # Update UI with attendee details
-                    self.event_id_result_var.set(attendee_data[1])  # event_id
-                    self.issued_to_var.set(f"{attendee_data[3]} ({attendee_data[4]})")  # name and email
-                else:
-                    # No attendee data available
-                    self.event_id_result_var.set("")
-                    self.issued_to_var.set("Unknown")
-            
-            if is_valid:
-                # Valid QR code - mark as checked in
-                self.db.mark_attendee_checked_in(qr_code)
-                self.db.add_scan_log(qr_code, config.SCANNER_ID)
-                
-                # Update scan count
-                cursor = self.db.conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM scans_local")
-                count = cursor.fetchone()[0]
-                self.scan_count_var.set(f"Scans: {count}")
-                
-                # Show valid result
-                self.show_valid_result(f"Valid QR code: {message}")
-                
-                # Try to sync immediately
-                try:
-                    self.supabase.push_scan(qr_code, config.SCANNER_ID)
-                except Exception as e:
-                    logging.warning(f"Couldn't push scan, will sync later: {e}")
-            else:
-                # Invalid QR code
-                self.show_invalid_result(message)
-        
-        except Exception as e:
-            logging.error(f"Error processing QR code: {e}")
-            self.show_invalid_result(f"Error: {str(e)}")
-        finally:
-            self.processing_qr = False
+    def _show_load_progress(self, loaded, total):
+        """Report download progress from the loading thread"""
+        text = f"Loading tickets... {loaded}/{total}" if total else f"Loading tickets... {loaded}"
+        self.window.after(0, lambda: self.status_var.set(text))
     
-    def show_valid_result(self, message):
-        """
-        Display valid ticket result
+    def update(self):
+        """Render every lane and refresh the counters"""
+        for lane in self.lanes:
+            lane.update()
+        
+        # Refresh the per-stage counters about once a second
+        now = time.monotonic()
+        if now - self.last_stats_update >= 1.0:
+            self.last_stats_update = now
+            for lane in self.lanes:
+                lane.refresh_stats()
+            self.pipeline_stats_var.set(self.format_pipeline_stats({"verify": self.verifier.stats.snapshot()}))
+            self.scan_count_var.set(f"Scans: {self.checkin.scan_count}")
+            self.latency_var.set(self.scanner.latency.format_summary(("scan", "supabase", "sqlite", "push")))
         
-        Args:
-            message: Message to display
-        """
-        self.ticket_status_var.set("VALID")
-        self.ticket_status_label.configure(foreground="green")
-        self.message_var.set(message)
-        self.message_label.configure(foreground="green")
-        
-        # Flash green background
-        self.result_frame.configure(style="Valid.TLabelframe")
-        self.window.after(2000, lambda: self.result_frame.configure(style="TLabelframe"))
+        # Schedule the next update
+        self.window.after(15, self.update)  # Each lane throttles its own preview
     
-    def show_invalid_result(self, message):
+    @staticmethod
+    def format_pipeline_stats(stats: Dict[str, Dict[str, Any]]) -> str:
         """
-        Display invalid ticket result
+        Format pipeline counters for the status bar
         
         Args:
-            message: Message to display
-        """
-        self.ticket_status_var.set("INVALID")
-        self.ticket_status_label.configure(foreground="red")
-        self.message_var.set(message)
-        self.message_label.configure(foreground="red")
-        
-        # Flash red background
-        self.result_frame.configure(style="Invalid.TLabelframe")
-        self.window.after(2000, lambda: self.result_frame.configure(style="TLabelframe"))
-    
-    def sync_offline_scans(self):
-        """Background thread to sync offline scan logs"""
-        while True:
-            try:
-                # Get unsynced scans
-                unsynced = self.db.get_unsynced_scans()
-                
-                for scan_id, qr_code, scanner_id, scanned_at in unsynced:
-                    # Push to Supabase
-                    success = self.supabase.push_scan(qr_code, scanner_id)
-                    if success:
-                        # Mark as synced
-                        self.db.mark_scan_synced(scan_id)
-                        logging.info(f"Synced scan {scan_id} for QR code {qr_code}")
-                    else:
-                        logging.warning(f"Failed to sync scan {scan_id} for QR code {qr_code}")
-            except Exception as e:
-                logging.error(f"Sync error: {e}")
-            
-            # Sleep for 30 seconds before next sync attempt
-            time.sleep(30)
-    
-    def poll_for_ticket_updates(self):
-        """Poll for ticket updates as an alternative to realtime subscriptions"""
-        poll_interval = 10  # seconds
-        while True:
-            try:
-                if self.current_event_id:
-                    # Fetch latest tickets for the current event
-                    tickets = self.supabase.preload_tickets(self.current_event_id)
-                    if tickets:
-                        self.db.preload_tickets(tickets)
-                        logging.debug(f"Polled and updated {len(tickets)} tickets for event {self.current_event_id}")
-            except Exception as e:
-                logging.error(f"Error polling for ticket updates: {e}")
+            stats: Stage counters keyed by stage name
             
-            time.sleep(poll_interval)
+        Returns:
+            Compact one-line summary
+        """
+        return " | ".join(
+            f"{name} {stage['fps']:.0f}fps q{stage['queue_depth']}" for name, stage in stats.items()
+        )
     
-    def update(self):
-        """Update the video frame and process QR codes"""
-        if self.vid is not None and self.vid.isOpened():
-            ret, frame = self.vid.read()
-            if ret:
-                # Process frame for QR codes
-                qr_data = self.scanner.scan_image(frame)
-                
-                if qr_data:
-                    # Draw rectangle around QR code if found
-                    barcodes = pyzbar.decode(frame)
-                    for barcode in barcodes:
-                        (x, y, w, h) = barcode.rect
-                        cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
-                    
-                    # Process the QR code
-                    self.process_qr_code(qr_data)
-                
-                # Convert to RGB for tkinter
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                
-                # Resize to fit canvas
-                canvas_width = self.canvas.winfo_width()
-                canvas_height = self.canvas.winfo_height()
-                
-                if canvas_width > 1 and canvas_height > 1:  # Ensure canvas has valid dimensions
-                    # Calculate aspect ratio
-                    aspect_ratio = frame.shape[1] / frame.shape[0]
-                    
-                    # Determine new dimensions to maintain aspect ratio
-                    if canvas_width / canvas_height > aspect_ratio:
-                        # Canvas is wider than needed
-                        new_width = int(canvas_height * aspect_ratio)
-                        new_height = canvas_height
-                    else:
-                        # Canvas is taller than needed
-                        new_width = canvas_width
-                        new_height = int(canvas_width / aspect_ratio)
-                    
-                    # Resize frame
-                    frame_resized = cv2.resize(frame_rgb, (new_width, new_height))
-                    
-                    # Convert to ImageTk format
-                    self.photo = PIL.ImageTk.PhotoImage(image=PIL.Image.fromarray(frame_resized))
-                    
-                    # Update canvas
-                    self.canvas.create_image(canvas_width/2, canvas_height/2, image=self.photo, anchor=tk.CENTER)
-        
-        # Schedule the next update
-        self.window.after(15, self.update)  # ~60 fps
+    def on_close(self):
+        """Stop background workers and close the window"""
+        self.sync.stop()
+        for lane in self.lanes:
+            lane.close()
+        self.verifier.stop()
+        self.scanner.close()
+        try:
+            self.scanner.latency.dump(config.LATENCY_REPORT_PATH)
+        except OSError as e:
+            logging.warning(f"Could not write latency report: {e}")
+        self.window.destroy()
     
     def run(self):
         """Run the application"""
@@ -421,8 +377,9 @@ class QRScannerApp:
     
     def __del__(self):
         """Clean up resources"""
-        if self.vid is not None and self.vid.isOpened():
-            self.vid.release()
+        for lane in getattr(self, "lanes", []):
+            if lane.vid is not None and lane.vid.isOpened():
+                lane.release_camera()
 
 
 # Create custom styles
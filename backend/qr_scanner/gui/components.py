@@ -8,8 +8,11 @@ from tkinter import ttk
 import PIL.Image, PIL.ImageTk
 import cv2
 import logging
+import time
 from typing import Tuple, Optional, Any, Dict
 
+import numpy as np
+
 class ScanResultDisplay:
     """
     A UI component for displaying the result of a QR code scan
@@ -103,12 +106,85 @@ class ScanResultDisplay:
         self.frame.after(2000, lambda: self.frame.configure(style="TLabelframe"))
 
 
+class PreviewRenderer:
+    """
+    Scales frames into a preallocated RGBA buffer for display
+    
+    Buffers are only reallocated when the target size or frame shape changes,
+    so steady-state rendering allocates no pixel memory.
+    """
+    
+    def __init__(self):
+        """Initialize the renderer"""
+        self.size = (0, 0)
+        self.rgba = None
+        self._resized = None
+        self._layout_key = None
+        self._scale = (1.0, 1.0)
+    
+    def layout(self, canvas_size: Tuple[int, int], frame_shape: Tuple[int, ...]) -> bool:
+        """
+        Fit the frame into the canvas, keeping its aspect ratio
+        
+        Args:
+            canvas_size: Canvas width and height
+            frame_shape: Shape of the frames to be rendered
+            
+        Returns:
+            True if the buffers were reallocated
+        """
+        key = (canvas_size, frame_shape)
+        if key == self._layout_key:
+            return False
+        
+        canvas_width, canvas_height = canvas_size
+        frame_height, frame_width = frame_shape[:2]
+        aspect_ratio = frame_width / frame_height
+        
+        # Determine new dimensions to maintain aspect ratio
+        if canvas_width / canvas_height > aspect_ratio:
+            # Canvas is wider than needed
+            new_width, new_height = int(canvas_height * aspect_ratio), canvas_height
+        else:
+            # Canvas is taller than needed
+            new_width, new_height = canvas_width, int(canvas_width / aspect_ratio)
+        new_width, new_height = max(1, new_width), max(1, new_height)
+        
+        self.size = (new_width, new_height)
+        self._resized = np.empty((new_height, new_width, 3), dtype=np.uint8)
+        # RGBA so PIL can share the buffer instead of copying it
+        self.rgba = np.empty((new_height, new_width, 4), dtype=np.uint8)
+        self._scale = (new_width / frame_width, new_height / frame_height)
+        self._layout_key = key
+        return True
+    
+    def render(self, frame, rects=None):
+        """
+        Draw a frame into the RGBA buffer
+        
+        Args:
+            frame: OpenCV frame (BGR format) matching the current layout
+            rects: (left, top, width, height) boxes in frame coordinates to outline
+            
+        Returns:
+            The RGBA buffer
+        """
+        # Resize first so the color conversion touches the smaller image
+        cv2.resize(frame, self.size, dst=self._resized, interpolation=cv2.INTER_LINEAR)
+        cv2.cvtColor(self._resized, cv2.COLOR_BGR2RGBA, dst=self.rgba)
+        
+        sx, sy = self._scale
+        for x, y, w, h in rects or ():
+            cv2.rectangle(self.rgba, (int(x * sx), int(y * sy)), (int((x + w) * sx), int((y + h) * sy)), (0, 255, 0, 255), 2)
+        return self.rgba
+
+
 class VideoDisplay:
     """
     A UI component for displaying the camera video feed
     """
     
-    def __init__(self, parent_frame, width: int = 640, height: int = 480):
+    def __init__(self, parent_frame, width: int = 640, height: int = 480, max_fps: float = 15.0):
         """
         Initialize the video display
         
@@ -116,6 +192,7 @@ class VideoDisplay:
             parent_frame: The parent frame to place this component in
             width: Initial width of the canvas
             height: Initial height of the canvas
+            max_fps: Maximum preview refresh rate, independent of the decode rate
         """
         self.frame = ttk.Frame(parent_frame, borderwidth=2, relief="groove")
         self.frame.pack(fill=tk.BOTH, expand=True, pady=10)
@@ -123,60 +200,66 @@ class VideoDisplay:
         # Canvas for video display
         self.canvas = tk.Canvas(self.frame, width=width, height=height, bg="black")
         self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.canvas.bind("<Configure>", self._on_resize)
+        self.canvas_size = (width, height)
         
-        # For storing the photo image
+        # One canvas item and one photo image, reused for every frame
+        self.renderer = PreviewRenderer()
+        self.image_item = None
         self.photo = None
+        self._image = None
+        
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self._last_render = 0.0
+        self._last_frame = None
+        self.frames_rendered = 0
     
-    def update_frame(self, frame, draw_rects: bool = True):
+    def update_frame(self, frame, draw_rects: bool = True, rects=None):
         """
         Update the displayed frame
         
+        Frames arriving faster than max_fps, or the same frame again, are skipped.
+        
         Args:
             frame: OpenCV frame (BGR format)
             draw_rects: Whether to draw rectangles around detected QR codes
+            rects: (left, top, width, height) boxes of detected QR codes in frame coordinates
         
         Returns:
             Canvas width and height
         """
-        # Convert to RGB for tkinter
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        # Get current canvas dimensions
-        canvas_width = self.canvas.winfo_width()
-        canvas_height = self.canvas.winfo_height()
-        
-        # Use initial dimensions if canvas hasn't been drawn yet
-        if canvas_width <= 1:
-            canvas_width = self.canvas.winfo_reqwidth()
-        if canvas_height <= 1:
-            canvas_height = self.canvas.winfo_reqheight()
-        
-        # Calculate aspect ratio
-        aspect_ratio = frame.shape[1] / frame.shape[0]
-        
-        # Determine new dimensions to maintain aspect ratio
-        if canvas_width / canvas_height > aspect_ratio:
-            # Canvas is wider than needed
-            new_width = int(canvas_height * aspect_ratio)
-            new_height = canvas_height
+        now = time.monotonic()
+        if frame is self._last_frame or now - self._last_render < self.min_interval:
+            return self.canvas_size
+        self._last_frame = frame
+        self._last_render = now
+        
+        if self.renderer.layout(self.canvas_size, frame.shape):
+            self._create_image()
+        self.renderer.render(frame, rects if draw_rects else None)
+        
+        # Copies the shared buffer into the existing Tk photo; nothing new is created
+        self.photo.paste(self._image)
+        self.frames_rendered += 1
+        return self.canvas_size
+    
+    def _create_image(self):
+        """(Re)create the photo image for the renderer's current size"""
+        width, height = self.renderer.size
+        self._image = PIL.Image.frombuffer("RGBA", (width, height), self.renderer.rgba, "raw", "RGBA", 0, 1)
+        self.photo = PIL.ImageTk.PhotoImage(image=self._image)
+        center = (self.canvas_size[0] / 2, self.canvas_size[1] / 2)
+        if self.image_item is None:
+            self.image_item = self.canvas.create_image(*center, image=self.photo, anchor=tk.CENTER)
         else:
-            # Canvas is taller than needed
-            new_width = canvas_width
-            new_height = int(canvas_width / aspect_ratio)
-        
-        # Resize frame
-        frame_resized = cv2.resize(frame_rgb, (new_width, new_height))
-        
-        # Convert to ImageTk format
-        self.photo = PIL.ImageTk.PhotoImage(image=PIL.Image.fromarray(frame_resized))
-        
-        # Clear canvas
-        self.canvas.delete("all")
-        
-        # Update canvas
-        self.canvas.create_image(canvas_width/2, canvas_height/2, image=self.photo, anchor=tk.CENTER)
-        
-        return canvas_width, canvas_height
+            self.canvas.itemconfigure(self.image_item, image=self.photo)
+            self.canvas.coords(self.image_item, *center)
+    
+    def _on_resize(self, event):
+        """Remember the new canvas size; buffers are rebuilt on the next frame"""
+        if event.width > 1 and event.height > 1:
+            self.canvas_size = (event.width, event.height)
+            self._last_frame = None
 
 
 class StatusBar:
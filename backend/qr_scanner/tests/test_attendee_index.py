@@ -0,0 +1,150 @@
+"""
+EventHive Attendee Index Tests
+Unit tests for in-memory verification and background reconciliation
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+# Add the parent directory to the path to import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from backend.qr_scanner.core.attendee_index import AttendeeIndex, IndexReconciler
+from backend.qr_scanner.core.checkin import CheckInService
+from backend.qr_scanner.core.revocation import RevocationFilter
+from backend.qr_scanner.core.scanner import QRScanner
+from backend.qr_scanner.db.database import DBManager
+
+
+def attendee_row(qr_code, checked_in=False, **fields):
+    """Build a booking_attendees row as returned by Supabase"""
+    row = {
+        "id": f"id-{qr_code}", "event_id": "event-1", "qr_code": qr_code,
+        "attendee_name": "Ada Lovelace", "attendee_email": "ada@example.com",
+        "ticket_type": "general", "checked_in": checked_in, "checked_in_at": None
+    }
+    row.update(fields)
+    return row
+
+
+class FakeSupabase:
+    """Supabase stand-in that counts online verifications"""
+
+    def __init__(self, rows=()):
+        self.rows = {row["qr_code"]: row for row in rows}
+        self.verify_calls = 0
+
+    def verify_qr_code(self, qr_code):
+        self.verify_calls += 1
+        return False, None, "QR code not found in database"
+
+    def get_attendees_by_qr(self, qr_codes):
+        return {qr_code: self.rows[qr_code] for qr_code in qr_codes if qr_code in self.rows}
+
+    def check_in_attendee(self, qr_code, scanner_id):
+        return "admitted"
+
+    def push_scan(self, qr_code, scanner_id):
+        return True
+
+
+class TestAttendeeIndex(unittest.TestCase):
+    """
+    Tests for the attendee index
+    """
+
+    def setUp(self):
+        """Set up a temporary database with two attendees"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = DBManager(os.path.join(self.temp_dir.name, "test.db"))
+        self.db.preload_tickets([attendee_row("TICKET-1"), attendee_row("TICKET-2", checked_in=True)])
+        self.index = AttendeeIndex()
+        self.index.load(self.db)
+
+    def tearDown(self):
+        """Clean up the temporary directory"""
+        self.db.close()
+        self.temp_dir.cleanup()
+
+    def test_built_from_database(self):
+        """Test the index holds every attendee and its check-in state"""
+        self.assertEqual(len(self.index), 2)
+        self.assertFalse(self.index.lookup("TICKET-1").checked_in)
+        self.assertTrue(self.index.lookup("TICKET-2").checked_in)
+        self.assertIsNone(self.index.lookup("UNKNOWN"))
+        self.assertEqual(self.index.get_stats()["misses"], 1)
+
+    def test_poll_does_not_undo_local_check_in(self):
+        """Test a stale row from the poller keeps a local check-in"""
+        self.assertTrue(self.index.mark_checked_in("TICKET-1", "2026-01-01 10:00:00"))
+        self.assertFalse(self.index.mark_checked_in("TICKET-1"))
+
+        self.index.update([attendee_row("TICKET-1", attendee_name="Ada King"), attendee_row("TICKET-3")])
+        record = self.index.get("TICKET-1")
+        self.assertTrue(record.checked_in)
+        self.assertEqual(record.checked_in_at, "2026-01-01 10:00:00")
+        self.assertEqual(record.name, "Ada King")
+        self.assertIsNotNone(self.index.get("TICKET-3"))
+
+    def test_verify_answers_from_index(self):
+        """Test indexed codes are verified without the online check"""
+        supabase = FakeSupabase()
+        scanner = QRScanner("secret", supabase, self.db, scan_cooldown=0, index=self.index)
+        try:
+            is_valid, result, message = scanner.verify_qr_code("TICKET-1")
+            self.assertTrue(is_valid)
+            self.assertEqual(result["attendee"]["attendee_name"], "Ada Lovelace")
+            self.assertEqual(result["event_id"], "event-1")
+
+            is_valid, _, message = scanner.verify_qr_code("TICKET-2")
+            self.assertFalse(is_valid)
+            self.assertIn("already checked in", message)
+            self.assertEqual(supabase.verify_calls, 0)
+
+            # Codes the index does not know still go online
+            scanner.verify_qr_code("UNKNOWN")
+            self.assertEqual(supabase.verify_calls, 1)
+        finally:
+            scanner.close()
+
+    def test_check_in_updates_index(self):
+        """Test a local check-in is answered from the index on the next scan"""
+        scanner = QRScanner("secret", None, self.db, scan_cooldown=0, index=self.index)
+        service = CheckInService(scanner, self.db)
+        self.assertTrue(service.verify_and_check_in("TICKET-1")["is_valid"])
+
+        result = service.verify_and_check_in("TICKET-1")
+        self.assertFalse(result["is_valid"])
+        self.assertIn("already checked in", result["message"])
+        self.assertEqual(result["attendee"], "Ada Lovelace (ada@example.com)")
+
+    def test_reconcile_flags_check_in_elsewhere(self):
+        """Test reconciliation picks up a check-in made by another scanner"""
+        supabase = FakeSupabase([attendee_row("TICKET-1", checked_in=True, checked_in_at="2026-01-01 09:00:00")])
+        reconciler = IndexReconciler(self.index, supabase)
+
+        self.assertEqual(reconciler.reconcile(["TICKET-1", "UNKNOWN"]), 1)
+        self.assertTrue(self.index.get("TICKET-1").checked_in)
+        self.assertEqual((reconciler.reconciled, reconciler.conflicts), (1, 1))
+
+    def test_reconciled_rows_survive_reload(self):
+        """Test corrections reach the database and revocation filter, not just the index"""
+        supabase = FakeSupabase([attendee_row("TICKET-1", checked_in=True, checked_in_at="2026-01-01 09:00:00"),
+                                 attendee_row("TICKET-3", verification_status="refunded")])
+        self.db.preload_tickets([attendee_row("TICKET-3")])
+        self.index.load(self.db)
+        revocations = RevocationFilter()
+        IndexReconciler(self.index, supabase, db=self.db, revocations=revocations).reconcile(["TICKET-1", "TICKET-3"])
+        self.assertIn("TICKET-3", revocations)
+
+        self.index.load(self.db)
+        self.assertTrue(self.index.get("TICKET-1").checked_in)
+        revocations.load(self.db.reader())
+        self.assertIn("TICKET-3", revocations)
+
+
+if __name__ == '__main__':
+    unittest.main()
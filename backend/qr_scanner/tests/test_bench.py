@@ -0,0 +1,75 @@
+"""
+EventHive Replay Benchmark Tests
+Unit tests for the offline replay benchmark harness
+"""
+
+import unittest
+import os
+import json
+import tempfile
+from pathlib import Path
+import sys
+
+import cv2
+import numpy as np
+
+# Add the parent directory to the path to import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from backend.qr_scanner import bench
+from backend.qr_scanner.tests.test_scanner import make_qr_frame
+
+
+class TestReplayBenchmark(unittest.TestCase):
+    """
+    Tests for replaying recorded frames through the scanner
+    """
+
+    def setUp(self):
+        """Write a short recording as an image directory"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        code = make_qr_frame("bench-ticket")
+        blank = np.full_like(code, 255)
+        for i, frame in enumerate([code, code, blank, code]):
+            cv2.imwrite(os.path.join(self.temp_dir.name, f"frame_{i:03d}.png"), frame)
+
+    def tearDown(self):
+        """Remove the recording"""
+        self.temp_dir.cleanup()
+
+    def test_iter_frames_directory(self):
+        """Test reading image directories in name order with a frame limit"""
+        frames = list(bench.iter_frames(self.temp_dir.name))
+        self.assertEqual(len(frames), 4)
+        self.assertEqual(len(list(bench.iter_frames(self.temp_dir.name, max_frames=2))), 2)
+
+    def test_run_benchmark(self):
+        """Test the report covers each setting and is JSON serializable"""
+        report = bench.run_benchmark(self.temp_dir.name, ["full", "roi+downscale"], repeat=2)
+        json.dumps(report)
+
+        self.assertEqual(report["frames"], 4)
+        self.assertEqual([r["setting"] for r in report["results"]], ["full", "roi+downscale"])
+        for result in report["results"]:
+            self.assertEqual(result["frames"], 8)
+            self.assertEqual(result["hits"], 6)
+            self.assertAlmostEqual(result["hit_rate"], 0.75)
+            self.assertEqual(result["distinct_payloads"], 1)
+            self.assertGreater(result["fps"], 0)
+            self.assertLessEqual(result["latency_ms"]["p50"], result["latency_ms"]["max"])
+
+    def test_main_writes_json(self):
+        """Test the command-line entry point writes the JSON report"""
+        output = os.path.join(self.temp_dir.name, "report.json")
+        self.assertEqual(bench.main([self.temp_dir.name, "--settings", "full", "--output", output]), 0)
+        with open(output) as f:
+            self.assertEqual(json.load(f)["results"][0]["setting"], "full")
+
+    def test_unknown_setting(self):
+        """Test unknown settings are rejected"""
+        with self.assertRaises(ValueError):
+            bench.run_benchmark(self.temp_dir.name, ["nonexistent"])
+
+
+if __name__ == '__main__':
+    unittest.main()
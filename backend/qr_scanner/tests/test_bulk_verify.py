@@ -0,0 +1,165 @@
+"""
+EventHive Bulk Verification Tests
+Unit tests for coalescing queued scans into bulk Supabase lookups
+"""
+
+import json
+import threading
+import unittest
+from pathlib import Path
+import sys
+from urllib.parse import quote
+
+# Add the parent directory to the path to import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from backend.qr_scanner.api.supabase_client import SupabaseClient, chunk_filter_values, quote_filter_value
+from backend.qr_scanner.core.pipeline import VerifyWorker
+from backend.qr_scanner.core.scanner import QRScanner
+
+
+class FakeQuery:
+    """Records in.() filters and answers from a fixed set of rows"""
+
+    def __init__(self, rows, filters):
+        self.rows = rows
+        self.filters = filters
+
+    def table(self, name):
+        return self
+
+    def select(self, columns):
+        return self
+
+    def filter(self, column, expression):
+        self.filters.append(expression)
+        return self
+
+    def execute(self):
+        expression = self.filters[-1]
+        return type("Response", (), {"data": [row for qr_code, row in self.rows.items()
+                                              if quote_filter_value(qr_code) in expression]})()
+
+
+def make_client(rows):
+    """Build a SupabaseClient that talks to a FakeQuery instead of the network"""
+    client = SupabaseClient.__new__(SupabaseClient)
+    client.filters = []
+    client.client = FakeQuery(rows, client.filters)
+    client.connection_verified = True
+    return client
+
+
+class TestBulkLookup(unittest.TestCase):
+    """
+    Tests for quoting and chunking bulk lookups
+    """
+
+    def test_quoting(self):
+        """Test list syntax inside codes is quoted"""
+        self.assertEqual(quote_filter_value('a,b'), '"a,b"')
+        self.assertEqual(quote_filter_value('say "hi"\\'), '"say \\"hi\\"\\\\"')
+
+    def test_chunks_respect_limits(self):
+        """Test chunks stay under both the item and the encoded length caps"""
+        values = [f"booking-{i}|0|event|Guest, Name|VIP" for i in range(250)]
+        chunks = chunk_filter_values(values, max_items=100, max_length=2000)
+        self.assertEqual([value for chunk in chunks for value in chunk], values)
+        for chunk in chunks:
+            self.assertLessEqual(len(chunk), 100)
+            encoded = quote(f"in.({','.join(quote_filter_value(value) for value in chunk)})", safe="")
+            self.assertLessEqual(len(encoded), 2000)
+
+    def test_bulk_verify(self):
+        """Test bulk results match what verify_qr_code would report"""
+        rows = {"A,1": {"qr_code": "A,1", "checked_in": False},
+                "B(2)": {"qr_code": "B(2)", "checked_in": True, "checked_in_at": "10:00"}}
+        client = make_client(rows)
+        results = client.bulk_verify_qr_codes(["A,1", "B(2)", "C"])
+        self.assertEqual(results["A,1"][0::2], (True, "QR code valid"))
+        self.assertEqual(results["B(2)"][2], "Attendee already checked in at 10:00")
+        self.assertEqual(results["C"], (False, None, "QR code not found in database"))
+        self.assertEqual(len(client.filters), 1)
+
+
+class TestCoalescedVerification(unittest.TestCase):
+    """
+    Tests for gathering a verification backlog into one bulk lookup
+    """
+
+    def test_backlog_prefetched_in_bulk(self):
+        """Test queued scans share one request and each gets its own result"""
+        client = make_client({f"T{i}": {"qr_code": f"T{i}", "event_id": "event-1"} for i in range(5)})
+        client.verify_qr_code = lambda qr_code: self.fail("Codes should be prefetched")
+        scanner = QRScanner("secret", client, scan_cooldown=0)
+        batches = []
+
+        def prefetch(payloads):
+            batches.append(list(payloads))
+            scanner.prefetch_online(payloads)
+
+        started = threading.Event()
+        release = threading.Event()
+
+        def verify(qr_data):
+            if qr_data == "first":
+                started.set()
+                release.wait(2)
+                return None
+            return scanner.verify_qr_code(qr_data)
+
+        verifier = VerifyWorker(verify, queue_size=16, batch_handler=prefetch, batch_window=0.01)
+        verifier.start()
+        try:
+            verifier.submit("first")
+            self.assertTrue(started.wait(2))
+            # A backlog builds up behind the first scan
+            futures = [verifier.submit(f"T{i}") for i in range(5)]
+            release.set()
+            results = [future.result(timeout=2) for future in futures]
+        finally:
+            verifier.stop()
+
+        self.assertEqual(batches[-1], [f"T{i}" for i in range(5)])
+        self.assertEqual(len(client.filters), 1)
+        self.assertTrue(all(result[0] for result in results))
+        self.assertEqual([result[1]["qr_code"] for result in results], [f"T{i}" for i in range(5)])
+
+    def test_unused_prefetch_dropped_after_batch(self):
+        """Test a prefetched result left unused by its batch isn't reused by a later scan"""
+        client = make_client({f"T{i}": {"qr_code": f"T{i}", "event_id": "event-1"} for i in range(3)})
+        scanner = QRScanner("secret", client, scan_cooldown=0)
+        started = threading.Event()
+        release = threading.Event()
+
+        def verify(qr_data):
+            if qr_data == "first":
+                started.set()
+                release.wait(2)
+                return None
+            return scanner.verify_qr_code(qr_data)
+
+        verifier = VerifyWorker(verify, queue_size=16, batch_handler=scanner.prefetch_online,
+                                batch_window=0.01, batch_done=scanner.clear_prefetched)
+        verifier.start()
+        try:
+            verifier.submit("first")
+            self.assertTrue(started.wait(2))
+            # T2 is prefetched but its scan stops at the signature check
+            futures = [verifier.submit(payload) for payload in
+                       ("T0", "T1", json.dumps({"qr_code": "T2", "signature": "forged"}))]
+            release.set()
+            self.assertEqual(futures[2].result(timeout=2)[2], "Invalid signature")
+
+            # T2 is refunded meanwhile; a lone scan has to see that
+            client.verify_qr_code = lambda qr_code: (False, None, "QR code not found in database")
+            result = verifier.submit("T2").result(timeout=2)
+        finally:
+            verifier.stop()
+
+        self.assertEqual(len(client.filters), 1)
+        self.assertEqual(result[2], "QR code not found in database")
+
+
+if __name__ == '__main__':
+    unittest.main()
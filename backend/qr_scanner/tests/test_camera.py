@@ -0,0 +1,125 @@
+"""
+EventHive Camera Manager Tests
+Unit tests for capture negotiation, persistence and device probing
+"""
+
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+import sys
+from unittest import mock
+
+import cv2
+import numpy as np
+
+# Add the parent directory to the path to import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from backend.qr_scanner.core import camera
+from backend.qr_scanner.core.camera import CameraManager
+
+
+class FakeVideoCapture:
+    """
+    Stand-in for cv2.VideoCapture that records the settings it receives
+    """
+
+    # Indexes that open, and whether MJPG frames can be read from them
+    devices = {0: True, 2: True}
+    opened = []
+
+    def __init__(self, index, api=cv2.CAP_ANY):
+        self.index = index
+        self.api = api
+        self.props = {cv2.CAP_PROP_FRAME_WIDTH: 640, cv2.CAP_PROP_FRAME_HEIGHT: 480,
+                      cv2.CAP_PROP_FPS: 30, cv2.CAP_PROP_FOURCC: cv2.VideoWriter_fourcc(*"YUYV")}
+        self.settings = []
+        FakeVideoCapture.opened.append(self)
+
+    def isOpened(self):
+        return self.index in self.devices
+
+    def set(self, prop, value):
+        self.settings.append((prop, value))
+        self.props[prop] = value
+        return True
+
+    def get(self, prop):
+        return self.props.get(prop, 0)
+
+    def read(self):
+        if self.props[cv2.CAP_PROP_FOURCC] == cv2.VideoWriter_fourcc(*"MJPG") and not self.devices[self.index]:
+            return False, None
+        return True, np.zeros((4, 4, 3), dtype=np.uint8)
+
+    def release(self):
+        pass
+
+
+class TestCameraManager(unittest.TestCase):
+    """
+    Tests for the camera manager
+    """
+
+    def setUp(self):
+        """Patch OpenCV capture and use a temporary state file"""
+        FakeVideoCapture.devices = {0: True, 2: True}
+        FakeVideoCapture.opened = []
+        patcher = mock.patch.object(camera.cv2, "VideoCapture", FakeVideoCapture)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.state_path = os.path.join(self.temp_dir.name, "camera_state.json")
+
+    def test_low_latency_negotiation(self):
+        """Test MJPG is requested before the size and the driver buffer is kept to one frame"""
+        manager = CameraManager(self.state_path)
+        capture, width, height = manager.open(0)
+
+        props = [prop for prop, _ in capture.settings]
+        self.assertLess(props.index(cv2.CAP_PROP_FOURCC), props.index(cv2.CAP_PROP_FRAME_WIDTH))
+        self.assertIn((cv2.CAP_PROP_BUFFERSIZE, 1), capture.settings)
+        self.assertEqual((width, height), (1280, 720))
+        self.assertEqual(manager.known[0].fourcc, "MJPG")
+
+    def test_known_config_reused(self):
+        """Test a saved configuration is tried first by a new manager"""
+        CameraManager(self.state_path, width=800, height=600).open(0)
+        FakeVideoCapture.opened = []
+
+        capture, width, height = CameraManager(self.state_path).open(0)
+        self.assertEqual(len(FakeVideoCapture.opened), 1)
+        self.assertEqual((width, height), (800, 600))
+
+    def test_falls_back_to_driver_defaults(self):
+        """Test a camera that cannot stream MJPG is opened with its default format"""
+        FakeVideoCapture.devices = {0: False}
+        manager = CameraManager(self.state_path)
+        capture, width, height = manager.open(0)
+
+        self.assertEqual((width, height), (640, 480))
+        self.assertEqual(manager.known[0].fourcc, "YUYV")
+        with self.assertRaises(ValueError):
+            manager.open(1)
+
+    def test_probe_async_skips_cameras_in_use(self):
+        """Test background probing reports devices and leaves open cameras alone"""
+        manager = CameraManager(self.state_path, probe_indexes=range(4))
+        manager.open(0)
+        FakeVideoCapture.opened = []
+
+        found = []
+        done = threading.Event()
+        manager.probe_async(lambda devices: (found.extend(devices), done.set()))
+        self.assertTrue(done.wait(2))
+
+        self.assertEqual(found, [0, 2])
+        self.assertNotIn(0, [capture.index for capture in FakeVideoCapture.opened])
+        self.assertEqual(CameraManager(self.state_path).available, [0, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
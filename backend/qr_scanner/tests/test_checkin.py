@@ -0,0 +1,159 @@
+"""
+EventHive Check-In Tests
+Unit tests for conditional (compare-and-set) check-ins
+"""
+
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+import sys
+
+# Add the parent directory to the path to import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from backend.qr_scanner.api.supabase_client import SupabaseClient
+from backend.qr_scanner.core.attendee_index import AttendeeIndex
+from backend.qr_scanner.core.checkin import CheckInService
+from backend.qr_scanner.core.scanner import QRScanner
+from backend.qr_scanner.db.database import DBManager, CHECKIN_ADMITTED, CHECKIN_DUPLICATE, CHECKIN_NOT_FOUND
+from backend.qr_scanner.tests.test_attendee_index import FakeSupabase, attendee_row
+
+
+class FakeTable:
+    """Applies eq() filtered updates to in-memory rows like PostgREST"""
+
+    def __init__(self, rows, scans):
+        self.rows = rows
+        self.scans = scans
+        self.negate = False
+
+    def table(self, name):
+        self.name, self.filters, self.changes = name, {}, None
+        return self
+
+    def select(self, columns):
+        return self
+
+    def update(self, changes):
+        self.changes = changes
+        return self
+
+    def insert(self, row):
+        self.scans.append(row)
+        return self
+
+    @property
+    def not_(self):
+        self.negate = True
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = lambda field: field == value
+        return self
+
+    def is_(self, column, value):
+        negate, self.negate = self.negate, False
+        self.filters[column] = lambda field: (field is value) != negate
+        return self
+
+    def execute(self):
+        matched = [row for row in self.rows if all(test(row.get(k)) for k, test in self.filters.items())]
+        if self.changes:
+            for row in matched:
+                row.update(self.changes)
+        return type("Response", (), {"data": matched})()
+
+
+class TestConditionalCheckIn(unittest.TestCase):
+    """
+    Tests for admitting each ticket exactly once
+    """
+
+    def setUp(self):
+        """Set up a temporary database with one attendee"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = DBManager(os.path.join(self.temp_dir.name, "test.db"))
+        self.db.preload_tickets([attendee_row("TICKET-1")])
+
+    def tearDown(self):
+        """Clean up the temporary directory"""
+        self.db.close()
+        self.temp_dir.cleanup()
+
+    def test_racing_lanes_admit_once(self):
+        """Test concurrent check-ins of one ticket admit exactly one"""
+        outcomes = []
+        barrier = threading.Barrier(8)
+
+        def check_in(lane):
+            barrier.wait()
+            outcomes.append(self.db.check_in_attendee("TICKET-1", f"lane-{lane}"))
+
+        threads = [threading.Thread(target=check_in, args=(lane,)) for lane in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(outcomes.count(CHECKIN_ADMITTED), 1)
+        self.assertEqual(outcomes.count(CHECKIN_DUPLICATE), 7)
+        self.assertEqual(len(self.db.get_unsynced_scans()), 1)
+        self.assertEqual(self.db.check_in_attendee("UNKNOWN", "lane-0"), CHECKIN_NOT_FOUND)
+
+    def test_scan_count_follows_admissions(self):
+        """Test the scan count starts from the scan log and counts only admissions"""
+        self.db.preload_tickets([attendee_row("TICKET-2")])
+        self.db.check_in_attendee("TICKET-2", "gate-0")
+        scanner = QRScanner("secret", None, self.db, scan_cooldown=0)
+        service = CheckInService(scanner, self.db)
+        self.assertEqual(service.scan_count, 1)
+        service.verify_and_check_in("TICKET-1")
+        service.verify_and_check_in("TICKET-1")
+        self.assertEqual(service.scan_count, 2)
+
+    def test_online_duplicate_refused(self):
+        """Test a ticket already admitted by another device is refused and not logged as a scan"""
+        supabase = FakeSupabase()
+        supabase.check_in_attendee = lambda qr_code, scanner_id: CHECKIN_DUPLICATE
+        index = AttendeeIndex()
+        index.load(self.db)
+        scanner = QRScanner("secret", None, self.db, scan_cooldown=0, index=index)
+        service = CheckInService(scanner, self.db, supabase, scanner_id="gate-1")
+        result = service.verify_and_check_in("TICKET-1")
+        self.assertFalse(result["is_valid"])
+        self.assertEqual(result["message"], "Attendee already checked in (another scanner)")
+        self.assertEqual((service.scan_count, self.db.count_scans()), (0, 0))
+        self.assertFalse(index.get("TICKET-1").checked_in)
+
+    def test_online_admission_not_synced_again(self):
+        """Test a scan admitted online is counted once and left out of the offline sync"""
+        index = AttendeeIndex()
+        index.load(self.db)
+        scanner = QRScanner("secret", None, self.db, scan_cooldown=0, index=index)
+        service = CheckInService(scanner, self.db, FakeSupabase(), scanner_id="gate-1")
+        self.assertTrue(service.verify_and_check_in("TICKET-1")["is_valid"])
+        self.assertEqual((service.scan_count, self.db.count_scans()), (1, 1))
+        self.assertEqual(self.db.get_unsynced_scans(), [])
+        self.assertTrue(index.get("TICKET-1").checked_in)
+
+    def test_supabase_conditional_update(self):
+        """Test the online check-in admits once and records one scan"""
+        rows, scans = [{"qr_code": "TICKET-1", "checked_in": False}, {"qr_code": "TICKET-2", "checked_in": None}], []
+        client = SupabaseClient.__new__(SupabaseClient)
+        client.client = FakeTable(rows, scans)
+        client.connection_verified = True
+
+        self.assertEqual(client.check_in_attendee("TICKET-1", "gate-1"), CHECKIN_ADMITTED)
+        self.assertEqual(client.check_in_attendee("TICKET-1", "gate-2"), CHECKIN_DUPLICATE)
+        self.assertEqual(client.check_in_attendee("UNKNOWN", "gate-2"), CHECKIN_NOT_FOUND)
+        # A ticket whose checked_in was never set is not checked in yet
+        self.assertEqual(client.check_in_attendee("TICKET-2", "gate-2"), CHECKIN_ADMITTED)
+        self.assertEqual([scan["scanner_id"] for scan in scans], ["gate-1", "gate-2"])
+        # Syncing the first device's offline log later is not an error
+        self.assertTrue(client.push_scan("TICKET-1", "gate-1"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+EventHive Scanner Daemon Tests
+Unit tests for the headless scanner daemon
+"""
+
+import unittest
+import os
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+import sys
+from unittest.mock import patch
+
+# Add the parent directory to the path to import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from backend.qr_scanner import config, daemon
+from backend.qr_scanner.db.database import DBManager
+from backend.qr_scanner.tests.test_pipeline import FakeCapture
+from backend.qr_scanner.tests.test_scanner import make_qr_frame
+
+REPO_ROOT = str(Path(__file__).parent.parent.parent.parent)
+
+
+class RecordingPlugin(daemon.ResultPlugin):
+    """Plugin that keeps every result it receives"""
+
+    def __init__(self):
+        self.results = []
+        self.closed = False
+
+    def on_result(self, lane, result):
+        self.results.append((lane, result))
+
+    def close(self):
+        self.closed = True
+
+
+def record_result(lane, result):
+    """Plain callback used to test function plugins"""
+
+
+class TestScannerDaemon(unittest.TestCase):
+    """
+    Tests for running the scanner without a GUI
+    """
+
+    def setUp(self):
+        """Set up a temporary database and status socket"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = DBManager(os.path.join(self.temp_dir.name, "test.db"))
+        self.socket_path = os.path.join(self.temp_dir.name, "status.sock")
+        # Shutdown writes a latency report; keep it out of the repository's logs/.
+        # config reads the variable at import, so its attribute is patched as well.
+        report_path = os.path.join(self.temp_dir.name, "latency.json")
+        for patcher in (patch.dict(os.environ, {"EVENTHIVE_LATENCY_REPORT": report_path}),
+                        patch.object(config, "LATENCY_REPORT_PATH", report_path)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Clean up the temporary directory"""
+        self.db.close()
+        self.temp_dir.cleanup()
+
+    def test_does_not_import_tkinter(self):
+        """Test the daemon module never pulls in tkinter or the Supabase SDK"""
+        code = ("import sys; import backend.qr_scanner.daemon; "
+                "sys.exit(bool({'tkinter', 'supabase'} & set(sys.modules)))")
+        subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, check=True)
+
+    def test_load_plugin(self):
+        """Test plugin specs resolve to plugin classes and plain callbacks"""
+        plugin = daemon.load_plugin(f"{__name__}:RecordingPlugin")
+        self.assertIsInstance(plugin, RecordingPlugin)
+        callback = daemon.load_plugin(f"{__name__}:record_result")
+        self.assertIsInstance(callback, daemon.CallbackPlugin)
+        with self.assertRaises(ValueError):
+            daemon.load_plugin("no_attribute_given")
+
+    @unittest.skipUnless(hasattr(daemon.socket, "AF_UNIX"), "Unix sockets not available")
+    def test_results_reach_plugins_and_status_socket(self):
+        """Test scans are dispatched to plugins and reported on the status socket"""
+        plugin = RecordingPlugin()
+        scanner_daemon = daemon.ScannerDaemon([], db=self.db, plugins=[plugin],
+                                              status_address=self.socket_path, go_online=False)
+        scanner_daemon.add_lane(FakeCapture(make_qr_frame("daemon-ticket")))
+        scanner_daemon.start()
+        try:
+            deadline = time.time() + 5
+            while not plugin.results and time.time() < deadline:
+                scanner_daemon.dispatch_results()
+                time.sleep(0.02)
+
+            lane, result = plugin.results[0]
+            self.assertEqual(lane, "lane1")
+            self.assertEqual(result["qr_code"], "daemon-ticket")
+
+            status = daemon.query_status(self.socket_path)
+            self.assertEqual(status["results"], len(plugin.results))
+            self.assertEqual(status["last_result"]["qr_code"], "daemon-ticket")
+            self.assertIn("lane1", status["lanes"])
+        finally:
+            scanner_daemon.shutdown()
+
+        self.assertTrue(plugin.closed)
+        self.assertFalse(os.path.exists(self.socket_path))
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir.name, "latency.json")))
+
+
+if __name__ == '__main__':
+    unittest.main()
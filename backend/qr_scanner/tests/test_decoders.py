@@ -0,0 +1,158 @@
+"""
+EventHive Decoder Backend Tests
+Unit tests for the pluggable decoder backends and their calibration
+"""
+
+import time
+import unittest
+from pathlib import Path
+import sys
+
+import cv2
+import numpy as np
+
+# Add the parent directory to the path to import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from backend.qr_scanner.core.decoders import (
+    ChainedDecoder, DecoderBackend, DecoderCalibrator, calibrate_decoder, create_decoder
+)
+from backend.qr_scanner.core.scanner import QRScanner
+from backend.qr_scanner.tests.test_scanner import make_qr_frame
+
+
+class FakeDecoder(DecoderBackend):
+    """Backend with a fixed name that decodes only the frames it is told to"""
+
+    def __init__(self, name, hit_frames, delay=0):
+        self.name = name
+        self.hit_frames = hit_frames
+        self.delay = delay
+        self.calls = 0
+
+    def decode(self, image):
+        self.calls += 1
+        busy_until = cv2.getTickCount() + self.delay * cv2.getTickFrequency()
+        while cv2.getTickCount() < busy_until:
+            pass
+        if int(image[0, 0]) in self.hit_frames:
+            return [("code", "QRCODE", (0, 0, 1, 1), [])]
+        return []
+
+
+def numbered_frames(count):
+    """Tiny frames tagged with their index in the first pixel"""
+    return [np.full((4, 4), i, dtype=np.uint8) for i in range(count)]
+
+
+class TestDecoderBackends(unittest.TestCase):
+    """
+    Tests for the decoder backends
+    """
+
+    def setUp(self):
+        """Render a test code"""
+        self.gray = cv2.cvtColor(make_qr_frame("backend-ticket"), cv2.COLOR_BGR2GRAY)
+
+    def test_backends_decode(self):
+        """Test every built-in backend decodes the same code at the same place"""
+        for spec in ("pyzbar", "opencv", "opencv_multi", "opencv,pyzbar"):
+            symbols = create_decoder(spec).decode(self.gray)
+            self.assertEqual([s.data for s in symbols], ["backend-ticket"], spec)
+            left, top, width, height = symbols[0].rect
+            # The code occupies 40..190 in the 230px test frame
+            self.assertAlmostEqual(left, 40, delta=15, msg=spec)
+            self.assertAlmostEqual(width, 150, delta=30, msg=spec)
+
+    def test_create_decoder(self):
+        """Test chains are built from comma-separated names and unknown names rejected"""
+        chain = create_decoder("pyzbar, opencv")
+        self.assertIsInstance(chain, ChainedDecoder)
+        self.assertEqual(chain.name, "pyzbar,opencv")
+        with self.assertRaises(ValueError):
+            create_decoder("zxing")
+
+    def test_chain_falls_through(self):
+        """Test a chain tries the next backend only when the previous one misses"""
+        first, second = FakeDecoder("a", {1}), FakeDecoder("b", {1, 2})
+        chain = ChainedDecoder([first, second])
+        self.assertTrue(chain.decode(numbered_frames(2)[1]))
+        self.assertEqual(second.calls, 0)
+        self.assertEqual(chain.decode(numbered_frames(1)[0]), [])
+        self.assertEqual(second.calls, 1)
+
+    def test_scanner_uses_backend(self):
+        """Test QRScanner decodes through the configured backend"""
+        scanner = QRScanner("secret", decoder="opencv")
+        self.assertEqual(scanner.scan_image(make_qr_frame("backend-ticket")), "backend-ticket")
+        self.assertEqual(scanner.get_decode_stats()["decoder"]["backend"], "opencv")
+
+
+class TestDecoderCalibration(unittest.TestCase):
+    """
+    Tests for picking a backend from live frames
+    """
+
+    def test_picks_fastest_meeting_target(self):
+        """Test the cheapest backend that meets the hit-rate target wins"""
+        frames = numbered_frames(10)
+        reliable_slow = FakeDecoder("slow", {2, 3, 4, 5}, delay=0.002)
+        reliable_fast = FakeDecoder("fast", {2, 3, 4, 5})
+        unreliable = FakeDecoder("flaky", {2})
+        result = calibrate_decoder(frames, [reliable_slow, reliable_fast, unreliable], target_hit_rate=0.9)
+
+        self.assertEqual(result.backend.name, "fast")
+        self.assertEqual(result.reference_frames, 4)
+        self.assertAlmostEqual(result.stats["flaky"]["hit_rate"], 0.25)
+
+    def test_falls_back_to_most_reliable(self):
+        """Test the most reliable backend wins when none meets the target"""
+        frames = numbered_frames(10)
+        result = calibrate_decoder(frames, [FakeDecoder("a", {1}), FakeDecoder("b", {1, 2})], target_hit_rate=1.0)
+        self.assertEqual(result.backend.name, "b")
+
+    def test_no_codes_in_view(self):
+        """Test calibration keeps the configured backend when no code was seen"""
+        self.assertIsNone(calibrate_decoder(numbered_frames(5), [FakeDecoder("a", set())]))
+
+        calibrator = DecoderCalibrator([FakeDecoder("a", set())], frames=2, max_rounds=2)
+        scanner = QRScanner("secret", calibrator=calibrator)
+        for frame in numbered_frames(4):
+            scanner.feed_calibrator(frame)
+            calibrator.join(2)
+        self.assertTrue(calibrator.done)
+        self.assertEqual(scanner.decoder.name, "pyzbar")
+
+    def test_scanner_switches_backend(self):
+        """Test a scanner adopts the calibrated backend"""
+        calibrator = DecoderCalibrator(["pyzbar", "opencv"], frames=3)
+        scanner = QRScanner("secret", calibrator=calibrator)
+        frame = make_qr_frame("calibrated-ticket")
+        for _ in range(3):
+            self.assertEqual(scanner.scan_image(frame), "calibrated-ticket")
+        calibrator.join(5)
+
+        self.assertTrue(calibrator.done)
+        self.assertEqual(scanner.scan_image(frame), "calibrated-ticket")
+        self.assertIn(scanner.decoder.name, ("pyzbar", "opencv"))
+        self.assertIn("calibration", scanner.get_decode_stats()["decoder"])
+        self.assertEqual(scanner.scan_image(frame), "calibrated-ticket")
+
+    def test_round_does_not_block_decoding(self):
+        """Test a slow calibration round runs in the background"""
+        slow = FakeDecoder("slow", {0}, delay=0.3)
+        calibrator = DecoderCalibrator([slow], frames=2)
+        scanner = QRScanner("secret", calibrator=calibrator)
+        start = time.perf_counter()
+        for frame in numbered_frames(2):
+            scanner.feed_calibrator(frame)
+        self.assertLess(time.perf_counter() - start, 0.2)
+        self.assertFalse(calibrator.done)
+
+        calibrator.join(5)
+        scanner.feed_calibrator(numbered_frames(1)[0])
+        self.assertIs(scanner.decoder, slow)
+
+
+if __name__ == '__main__':
+    unittest.main()
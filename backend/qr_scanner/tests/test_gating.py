@@ -0,0 +1,70 @@
+"""
+EventHive Frame Gating Tests
+Unit tests for the motion and sharpness decode gate
+"""
+
+import unittest
+from pathlib import Path
+import sys
+
+import cv2
+import numpy as np
+
+# Add the parent directory to the path to import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from backend.qr_scanner.core.gating import FrameGate
+from backend.qr_scanner.core.scanner import QRScanner
+from backend.qr_scanner.tests.test_scanner import make_qr_frame
+
+
+class TestFrameGate(unittest.TestCase):
+    """
+    Tests for the frame gate
+    """
+
+    def setUp(self):
+        """Set up test environment"""
+        self.gate = FrameGate(idle_refresh=60)
+        self.rng = np.random.default_rng(0)
+
+    def test_idle_scene_skipped(self):
+        """Test that an unchanged scene is decoded once it settles, then skipped"""
+        frame = np.full((480, 640), 128, dtype=np.uint8)
+
+        self.assertTrue(self.gate.should_decode(frame)[0], "First frame has no reference")
+        self.assertTrue(self.gate.should_decode(frame)[0], "Settled scene is decoded once")
+        self.assertEqual(self.gate.should_decode(frame), (False, "idle"))
+        self.assertEqual(self.gate.get_stats()["skipped_idle"], 1)
+
+    def test_blurred_motion_skipped(self):
+        """Test that moving frames much blurrier than usual are skipped"""
+        for _ in range(5):
+            sharp = self.rng.integers(0, 256, (480, 640), dtype=np.uint8)
+            self.assertTrue(self.gate.should_decode(sharp)[0])
+
+        blurred = cv2.GaussianBlur(self.rng.integers(0, 256, (480, 640), dtype=np.uint8), (31, 31), 10)
+        self.assertEqual(self.gate.should_decode(blurred), (False, "blur"))
+        self.assertEqual(self.gate.get_stats()["skipped"], 1)
+
+    def test_hold_after_hit(self):
+        """Test that gating is bypassed while a code is in view"""
+        frame = np.full((480, 640), 128, dtype=np.uint8)
+        self.gate.should_decode(frame)
+        self.gate.record_result(True)
+        for _ in range(3):
+            self.assertTrue(self.gate.should_decode(frame)[0])
+
+    def test_scanner_integration(self):
+        """Test that the scanner reports gated frames"""
+        scanner = QRScanner("test_secret_key", gating=True)
+        blank = np.full((480, 640, 3), 255, dtype=np.uint8)
+        results = [scanner.analyze_frame(blank) for _ in range(3)]
+
+        self.assertEqual(results[2].skipped, "idle")
+        self.assertEqual(scanner.get_decode_stats()["gate"]["skipped"], 1)
+        self.assertEqual(scanner.analyze_frame(make_qr_frame("gated-ticket")).payload, "gated-ticket")
+
+
+if __name__ == '__main__':
+    unittest.main()
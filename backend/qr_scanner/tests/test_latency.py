@@ -0,0 +1,87 @@
+"""
+EventHive Latency Tracking Tests
+Unit tests for per-stage latency spans and percentiles
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+# Add the parent directory to the path to import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from backend.qr_scanner.core.checkin import CheckInService
+from backend.qr_scanner.core.scanner import QRScanner
+from backend.qr_scanner.db.database import DBManager
+from backend.qr_scanner.utils.latency import LatencyTracker
+from backend.qr_scanner.tests.test_attendee_index import attendee_row
+
+
+class FakeClock:
+    """Clock advanced by hand"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLatencyTracker(unittest.TestCase):
+    """
+    Tests for the latency tracker
+    """
+
+    def test_percentiles(self):
+        """Test nearest-rank percentiles over the rolling window"""
+        tracker = LatencyTracker(window=100)
+        for ms in range(1, 201):
+            tracker.record("verify", ms / 1000)
+        stats = tracker.get_stats()["verify"]
+        # Only the newest 100 samples (101..200 ms) count
+        self.assertEqual(stats["count"], 200)
+        self.assertEqual((stats["p50_ms"], stats["p95_ms"], stats["p99_ms"], stats["max_ms"]),
+                         (150.0, 195.0, 199.0, 200.0))
+
+    def test_span_and_summary(self):
+        """Test spans time their block and appear in the readout"""
+        clock = FakeClock()
+        tracker = LatencyTracker(clock=clock)
+        with tracker.span("supabase"):
+            clock.now += 0.120
+        with self.assertRaises(ValueError):
+            with tracker.span("sqlite"):
+                clock.now += 0.002
+                raise ValueError("query failed")
+
+        self.assertEqual(tracker.format_summary(["scan", "supabase", "sqlite"]),
+                         "supabase 120.0/120.0/120.0ms | sqlite 2.0/2.0/2.0ms")
+
+    def test_dump(self):
+        """Test the report file holds every stage"""
+        tracker = LatencyTracker()
+        tracker.record("parse", 0.0001)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "latency.json")
+            tracker.dump(path, {"scanner_id": "gate-1"})
+            with open(path) as f:
+                report = json.load(f)
+        self.assertEqual(report["scanner_id"], "gate-1")
+        self.assertEqual(report["stages"]["parse"]["count"], 1)
+
+    def test_verification_stages_recorded(self):
+        """Test a check-in records the scanner and check-in stages"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db = DBManager(os.path.join(temp_dir, "test.db"))
+            db.preload_tickets([attendee_row("TICKET-1")])
+            scanner = QRScanner("secret", None, db)
+            CheckInService(scanner, db).verify_and_check_in("TICKET-1")
+            db.close()
+        self.assertTrue({"scan", "verify", "parse", "sqlite", "checkin"} <= set(scanner.latency.get_stats()))
+
+
+if __name__ == '__main__':
+    unittest.main()
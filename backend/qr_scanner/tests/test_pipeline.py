@@ -0,0 +1,266 @@
+"""
+EventHive Scan Pipeline Tests
+Unit tests for the threaded capture -> decode -> verify pipeline
+"""
+
+import unittest
+import numpy as np
+import threading
+import time
+from pathlib import Path
+import sys
+
+# Add the parent directory to the path to import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from backend.qr_scanner.core.scanner import QRScanner
+from backend.qr_scanner.core.pipeline import DropOldestQueue, ScanPipeline, VerifyWorker
+from backend.qr_scanner.core import process_decoder
+from backend.qr_scanner.core.process_decoder import ProcessPoolDecoder, _FrameSlot, create_decode_pool
+from backend.qr_scanner.tests.test_scanner import make_qr_frame
+from backend.qr_scanner.tests.test_bulk_verify import make_client
+
+
+class FakeCapture:
+    """Minimal stand-in for cv2.VideoCapture that replays one frame"""
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.released = False
+
+    def isOpened(self):
+        return not self.released
+
+    def read(self):
+        time.sleep(0.005)
+        return True, self.frame
+
+    def release(self):
+        self.released = True
+
+
+class TestDropOldestQueue(unittest.TestCase):
+    """
+    Tests for the bounded drop-oldest queue
+    """
+
+    def test_drop_oldest(self):
+        """Test that a full queue discards its oldest item"""
+        queue = DropOldestQueue(2)
+        for item in (1, 2, 3):
+            queue.put(item)
+
+        self.assertEqual(queue.qsize(), 2)
+        self.assertEqual(queue.dropped, 1)
+        self.assertEqual(queue.get(timeout=0), 2)
+        self.assertEqual(queue.drain(), [3])
+        self.assertIsNone(queue.get(timeout=0.01), "Empty queue should time out")
+
+
+class TestVerifyWorker(unittest.TestCase):
+    """
+    Tests for the shared verification worker
+    """
+
+    def test_in_flight_payload_verified_once(self):
+        """Test resubmitting a payload under verification reuses its future"""
+        release = threading.Event()
+        calls = []
+
+        def handler(qr_data):
+            calls.append(qr_data)
+            release.wait(2)
+            return {"qr_code": qr_data}
+
+        verifier = VerifyWorker(handler)
+        verifier.start()
+        try:
+            replies = []
+            first = verifier.submit("ticket-1", replies.append)
+            second = verifier.submit(" ticket-1 ", replies.append)
+            self.assertIs(first, second)
+            release.set()
+            self.assertEqual(first.result(timeout=2), {"qr_code": "ticket-1"})
+
+            # Once finished, the payload is verified again
+            self.assertEqual(verifier.submit("ticket-1").result(timeout=2), {"qr_code": "ticket-1"})
+        finally:
+            verifier.stop()
+
+        self.assertEqual(calls, ["ticket-1", "ticket-1"])
+        self.assertEqual(replies, [{"qr_code": "ticket-1"}])
+        self.assertEqual(verifier.deduplicated, 1)
+        self.assertEqual(verifier.in_flight(), 0)
+
+    def test_dropped_payload_cancelled(self):
+        """Test a payload pushed out of a full queue has its future cancelled"""
+        verifier = VerifyWorker(lambda qr_data: {"qr_code": qr_data}, queue_size=1)
+        dropped = verifier.submit("first")
+        kept = verifier.submit("second")
+        self.assertTrue(dropped.cancelled())
+        verifier.start()
+        try:
+            self.assertEqual(kept.result(timeout=2), {"qr_code": "second"})
+        finally:
+            verifier.stop()
+
+
+class TestScanPipeline(unittest.TestCase):
+    """
+    Tests for the scan pipeline
+    """
+
+    def test_end_to_end(self):
+        """Test that frames flow from capture through verification"""
+        verified = []
+
+        def handler(qr_data):
+            verified.append(qr_data)
+            return {"qr_code": qr_data}
+
+        verifier = VerifyWorker(handler)
+        pipeline = ScanPipeline(QRScanner("test_secret_key"), verifier)
+        pipeline.set_capture(FakeCapture(make_qr_frame("pipeline-ticket")))
+        verifier.start()
+        pipeline.start()
+        try:
+            results = []
+            deadline = time.monotonic() + 5
+            while not results and time.monotonic() < deadline:
+                results = pipeline.get_results()
+                time.sleep(0.02)
+        finally:
+            pipeline.stop()
+            verifier.stop()
+
+        self.assertTrue(results, "Pipeline should produce a verification result")
+        self.assertEqual(results[0]["qr_code"], "pipeline-ticket")
+        frame, analysis = pipeline.get_preview()
+        self.assertIsNotNone(frame)
+        self.assertEqual(analysis.payload, "pipeline-ticket")
+
+        stats = pipeline.get_stats()
+        self.assertEqual(set(stats), {"capture", "decode", "verify"})
+        for stage in stats.values():
+            self.assertIn("fps", stage)
+            self.assertIn("queue_depth", stage)
+        self.assertGreater(stats["capture"]["total"], 0)
+
+    def test_lanes_share_verifier(self):
+        """Test that results are routed back to the lane that decoded them"""
+        verifier = VerifyWorker(lambda qr_data: {"qr_code": qr_data})
+        lanes = []
+        for payload in ("lane-a", "lane-b"):
+            lane = ScanPipeline(QRScanner("test_secret_key"), verifier, name=payload)
+            lane.set_capture(FakeCapture(make_qr_frame(payload)))
+            lanes.append(lane)
+
+        verifier.start()
+        for lane in lanes:
+            lane.start()
+        try:
+            results = {lane.name: [] for lane in lanes}
+            deadline = time.monotonic() + 5
+            while not all(results.values()) and time.monotonic() < deadline:
+                for lane in lanes:
+                    results[lane.name].extend(lane.get_results())
+                time.sleep(0.02)
+        finally:
+            for lane in lanes:
+                lane.stop()
+            verifier.stop()
+
+        for name, lane_results in results.items():
+            self.assertTrue(lane_results, f"Lane {name} should receive results")
+            self.assertEqual({result["qr_code"] for result in lane_results}, {name})
+
+    def test_every_code_in_frame_verified(self):
+        """Test a frame holding two tickets verifies both with one bulk lookup"""
+        client = make_client({code: {"qr_code": code, "event_id": "event-1"} for code in ("multi-a", "multi-b")})
+        client.verify_qr_code = lambda qr_code: self.fail("Codes should be prefetched")
+        scanner = QRScanner("test_secret_key", client, scan_cooldown=0)
+        verifier = VerifyWorker(lambda qr_data: scanner.verify_qr_code(qr_data)[1],
+                                batch_handler=scanner.prefetch_online, batch_window=0.01)
+        pipeline = ScanPipeline(scanner, verifier)
+        frame = np.hstack([make_qr_frame("multi-a"), make_qr_frame("multi-b")])
+        analysis = scanner.analyze_frame(frame)
+        self.assertEqual(len(analysis.symbols), 2)
+
+        # Both payloads are queued before the worker starts, so they form one backlog
+        pipeline._publish_analysis(analysis)
+        pipeline._publish_analysis(analysis)
+        verifier.start()
+        try:
+            results = []
+            deadline = time.monotonic() + 5
+            while len(results) < 2 and time.monotonic() < deadline:
+                results.extend(pipeline.get_results())
+                time.sleep(0.02)
+        finally:
+            verifier.stop()
+
+        self.assertEqual(sorted(result["qr_code"] for result in results), ["multi-a", "multi-b"])
+        self.assertEqual(len(client.filters), 1)
+        self.assertIn("multi-a", client.filters[0])
+        self.assertIn("multi-b", client.filters[0])
+        self.assertEqual(verifier.deduplicated, 2)
+
+
+class TestProcessPoolDecoder(unittest.TestCase):
+    """
+    Tests for the process-pool decode backend
+    """
+
+    def setUp(self):
+        """Start a small worker pool"""
+        self.decoder = ProcessPoolDecoder(workers=2)
+
+    def tearDown(self):
+        """Stop the pool and free shared memory"""
+        self.decoder.close()
+
+    def test_results_in_frame_order(self):
+        """Test that results come back in submission order"""
+        payloads = [f"ticket-{i}" for i in range(5)]
+        for payload in payloads:
+            self.decoder.submit(make_qr_frame(payload))
+
+        results = []
+        while self.decoder.in_flight:
+            results.extend(self.decoder.collect(block=True))
+
+        self.assertEqual([analysis.payload for analysis in results], payloads)
+        self.assertFalse(self.decoder.broken)
+
+    def test_fallback_when_pool_fails(self):
+        """Test that decoding continues in-process after the pool stops"""
+        self.decoder._executor.shutdown()
+
+        analysis = self.decoder.decode(make_qr_frame("fallback-ticket"))
+        self.assertTrue(self.decoder.broken)
+        self.assertEqual(analysis.payload, "fallback-ticket")
+
+    def test_grown_slot_detached(self):
+        """Test a worker drops its mapping of a slot's old segment when the slot grows"""
+        small, large = make_qr_frame("small", scale=2)[:, :, 0], make_qr_frame("large-ticket")[:, :, 0]
+        slot = _FrameSlot(small.nbytes)
+        try:
+            process_decoder._decode_shared_frame(slot.id, slot.shm.name, slot.write(small), None)
+            old = process_decoder._attached_segments[slot.id]
+
+            shape = slot.write(large)
+            analysis = process_decoder._decode_shared_frame(slot.id, slot.shm.name, shape, None)
+            self.assertEqual(analysis.payload, "large-ticket")
+            self.assertEqual(process_decoder._attached_segments[slot.id].name, slot.shm.name)
+            self.assertIsNone(old.buf)
+        finally:
+            process_decoder._attached_segments.pop(slot.id).close()
+            slot.release()
+
+    def test_inprocess_mode(self):
+        """Test that the default mode does not create a pool"""
+        self.assertIsNone(create_decode_pool("inprocess"))
+
+
+if __name__ == '__main__':
+    unittest.main()
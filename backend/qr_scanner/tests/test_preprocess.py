@@ -0,0 +1,67 @@
+"""
+EventHive Preprocessing Cascade Tests
+Unit tests for the budgeted preprocessing cascade
+"""
+
+import unittest
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# Add the parent directory to the path to import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from backend.qr_scanner.core.preprocess import PreprocessCascade
+from backend.qr_scanner.core.scanner import QRScanner
+from backend.qr_scanner.tests.test_scanner import make_qr_frame
+
+
+class TestPreprocessCascade(unittest.TestCase):
+    """
+    Tests for the preprocessing cascade
+    """
+
+    def test_rescues_inverted_code(self):
+        """Test a light-on-dark code missed by the plain decode is recovered"""
+        frame = 255 - make_qr_frame("dark-mode-ticket")
+        self.assertIsNone(QRScanner("secret").scan_image(frame))
+
+        scanner = QRScanner("secret", cascade=PreprocessCascade())
+        analysis = scanner.analyze_frame(frame)
+        self.assertEqual(analysis.payload, "dark-mode-ticket")
+        self.assertEqual(analysis.strategy, "cascade:invert")
+
+        stats = scanner.get_decode_stats()["cascade"]
+        self.assertEqual(stats["rescued"], 1)
+        self.assertEqual(stats["steps"]["invert"]["hits"], 1)
+
+    def test_order_adapts_to_recent_success(self):
+        """Test the step that has been succeeding moves to the front"""
+        cascade = PreprocessCascade()
+        frame = np.full((8, 8), 10, dtype=np.uint8)
+        # Only the inverted image "decodes"
+        decode = lambda image: ["code"] if image[0, 0] == 245 else []
+        for _ in range(3):
+            cascade.run(frame, decode)
+        self.assertEqual(cascade.order()[0], "invert")
+        self.assertEqual(cascade.stats["invert"].attempts, 3)
+        # Once first, it is the only step tried
+        self.assertEqual(cascade.stats["clahe"].attempts, 1)
+
+    def test_budget_limits_attempts(self):
+        """Test no further steps start once the budget is spent"""
+        cascade = PreprocessCascade(budget_ms=0)
+        symbols, step = cascade.run(np.zeros((8, 8), dtype=np.uint8), lambda image: [])
+        self.assertEqual((symbols, step), ([], None))
+        self.assertEqual(cascade.budget_exhausted, 1)
+        self.assertEqual(sum(s.attempts for s in cascade.stats.values()), 0)
+
+    def test_unknown_step(self):
+        """Test unknown step names are rejected"""
+        with self.assertRaises(ValueError):
+            PreprocessCascade(["clahe", "denoise"])
+
+
+if __name__ == '__main__':
+    unittest.main()
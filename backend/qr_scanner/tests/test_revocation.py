@@ -0,0 +1,107 @@
+"""
+EventHive Revocation Filter Tests
+Unit tests for the offline revocation filter
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+# Add the parent directory to the path to import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from backend.qr_scanner.core.revocation import BloomFilter, RevocationFilter
+from backend.qr_scanner.core.scanner import QRScanner
+from backend.qr_scanner.core.sync import SyncEngine
+from backend.qr_scanner.db.database import DBManager
+from backend.qr_scanner.tests.test_attendee_index import attendee_row
+
+
+class TestRevocationFilter(unittest.TestCase):
+    """
+    Tests for the Bloom filter and its exact overflow sets
+    """
+
+    def test_bloom_error_rate(self):
+        """Test added items are always found and others rarely are"""
+        bloom = BloomFilter(5000, error_rate=1e-3)
+        for i in range(5000):
+            bloom.add(f"revoked-{i}")
+        self.assertTrue(all(f"revoked-{i}" in bloom for i in range(5000)))
+        false_positives = sum(f"valid-{i}" in bloom for i in range(20000))
+        self.assertLess(false_positives, 60)
+
+    def test_poller_changes(self):
+        """Test new revocations and reinstated tickets are tracked exactly"""
+        revocations = RevocationFilter(["TICKET-1"])
+        added = revocations.update([
+            attendee_row("TICKET-2", verification_status="refunded"),
+            attendee_row("TICKET-1", verification_status="verified"),
+            attendee_row("TICKET-3", verification_status="pending"),
+        ])
+        self.assertEqual(added, 1)
+        self.assertIn("TICKET-2", revocations)
+        self.assertNotIn("TICKET-1", revocations)
+        self.assertNotIn("TICKET-3", revocations)
+
+        # Revoked again after being reinstated
+        revocations.update([attendee_row("TICKET-1", verification_status="cancelled")])
+        self.assertIn("TICKET-1", revocations)
+
+    def test_compact_serialization(self):
+        """Test a large event's filter stays small and survives a round trip"""
+        revoked = [f"df564495-{i:08d}|0|event|Guest|general" for i in range(5000)]
+        revocations = RevocationFilter(revoked, error_rate=1e-4)
+        revocations.update([attendee_row("LATE-REFUND", verification_status="refunded"),
+                            attendee_row(revoked[0], verification_status="verified")])
+
+        data = revocations.to_bytes()
+        self.assertLess(len(data), 32 * 1024)
+        loaded = RevocationFilter.from_bytes(data)
+        self.assertIn(revoked[1], loaded)
+        self.assertIn("LATE-REFUND", loaded)
+        self.assertNotIn(revoked[0], loaded)
+        self.assertNotIn("never-revoked", loaded)
+        self.assertEqual(loaded.error_rate, 1e-4)
+        with self.assertRaises(ValueError):
+            RevocationFilter.from_bytes(data[:-10])
+
+
+class TestRevocationChecks(unittest.TestCase):
+    """
+    Tests for refusing revoked tickets
+    """
+
+    def setUp(self):
+        """Set up a temporary database with one revoked attendee"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = DBManager(os.path.join(self.temp_dir.name, "test.db"))
+        self.db.preload_tickets([attendee_row("TICKET-1"),
+                                 attendee_row("TICKET-2", verification_status="cancelled")])
+        self.revocations = RevocationFilter()
+        self.revocations.load(self.db.reader())
+
+    def tearDown(self):
+        """Clean up the temporary directory"""
+        self.db.close()
+        self.temp_dir.cleanup()
+
+    def test_revoked_code_refused_offline(self):
+        """Test a revoked code is refused even though it is in the local database"""
+        scanner = QRScanner("secret", None, self.db, scan_cooldown=0, revocations=self.revocations)
+        is_valid, result, message = scanner.verify_qr_code("TICKET-2")
+        self.assertFalse(is_valid)
+        self.assertEqual(message, "Ticket has been revoked")
+        self.assertTrue(scanner.verify_qr_code("TICKET-1")[0])
+
+    def test_poll_revokes(self):
+        """Test a refund picked up by the poller is refused on the next scan"""
+        sync = SyncEngine(self.db, None, revocations=self.revocations)
+        sync._update_revocations([attendee_row("TICKET-1", verification_status="refunded")])
+        self.assertIn("TICKET-1", self.revocations)
+
+
+if __name__ == '__main__':
+    unittest.main()
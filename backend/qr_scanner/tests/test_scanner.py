@@ -7,19 +7,30 @@ import unittest
 import os
 import tempfile
 import json
+import threading
 from pathlib import Path
 import sys
 from unittest.mock import MagicMock, patch
 
+import cv2
+
 # Add the parent directory to the path to import our modules
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 from backend.qr_scanner.core.scanner import QRScanner
 from backend.qr_scanner.db.database import DBManager
-from backend.qr_scanner.utils import generate_hmac_signature, verify_hmac_signature
+from backend.qr_scanner.utils import generate_hmac_signature, verify_hmac_signature, TTLCache
 from backend.qr_scanner import config
 
 
+def make_qr_frame(data: str, scale: int = 6, border: int = 40):
+    """Render a QR code into a BGR frame for decoding tests"""
+    qr = cv2.QRCodeEncoder.create().encode(data)
+    qr = cv2.resize(qr, None, fx=scale, fy=scale, interpolation=cv2.INTER_NEAREST)
+    qr = cv2.copyMakeBorder(qr, border, border, border, border, cv2.BORDER_CONSTANT, value=255)
+    return cv2.cvtColor(qr, cv2.COLOR_GRAY2BGR)
+
+
 class TestQRScanner(unittest.TestCase):
     """
     Tests for the QR Scanner core functionality
@@ -46,6 +57,64 @@ class TestQRScanner(unittest.TestCase):
         result = verify_hmac_signature(test_data_str, invalid_signature, self.secret)
         self.assertFalse(result, "Invalid signature should fail verification")
     
+    def test_analyze_frame(self):
+        """Test single-pass frame analysis"""
+        frame = make_qr_frame("ticket-123")
+        
+        analysis = self.scanner.analyze_frame(frame)
+        self.assertEqual(len(analysis.symbols), 1, "Should decode exactly one symbol")
+        symbol = analysis.symbols[0]
+        self.assertEqual(symbol.data, "ticket-123")
+        self.assertEqual(symbol.symbol_type, "QRCODE")
+        self.assertEqual(len(symbol.rect), 4)
+        self.assertGreaterEqual(len(symbol.polygon), 4)
+        self.assertGreaterEqual(analysis.decode_time, 0)
+        self.assertEqual(self.scanner.scan_image(frame), "ticket-123")
+        
+        # Blank frame yields an empty analysis
+        blank = frame.copy()
+        blank[:] = 255
+        self.assertIsNone(self.scanner.analyze_frame(blank).payload)
+    
+    def test_decode_strategies(self):
+        """Test ROI tracking and downscaled-first decoding"""
+        # Place a code in the corner of a 1280x720 frame
+        code = make_qr_frame("roi-ticket")
+        frame = cv2.copyMakeBorder(code, 0, 720 - code.shape[0], 0, 1280 - code.shape[1],
+                                   cv2.BORDER_CONSTANT, value=(255, 255, 255))
+        self.assertEqual(frame.shape[:2], (720, 1280))
+        
+        first = self.scanner.analyze_frame(frame)
+        self.assertEqual(first.payload, "roi-ticket")
+        self.assertEqual(first.strategy, "half", "Wide frames should be tried at half resolution first")
+        self.assertIsNotNone(self.scanner.roi, "Region of the code should be remembered")
+        
+        second = self.scanner.analyze_frame(frame)
+        self.assertEqual(second.strategy, "roi", "Next frame should hit the tracked region")
+        # Coordinates are reported in full-frame space whatever the strategy
+        self.assertEqual(second.symbols[0].rect[:2], first.symbols[0].rect[:2])
+        
+        stats = self.scanner.get_decode_stats()
+        self.assertEqual(stats["roi"]["hits"], 1)
+        self.assertEqual(stats["half"]["hits"], 1)
+        self.assertEqual(stats["full"]["attempts"], 0)
+        self.assertEqual(stats["roi"]["hit_rate"], 1.0)
+    
+    def test_per_code_dedup(self):
+        """Test that only repeats of the same code are suppressed"""
+        is_valid, _, _ = self.scanner.verify_qr_code("ticket-a")
+        self.assertTrue(is_valid)
+        
+        is_valid, result, _ = self.scanner.verify_qr_code("ticket-a")
+        self.assertFalse(is_valid)
+        self.assertEqual(result["status"], "cooldown")
+        
+        is_valid, _, _ = self.scanner.verify_qr_code("ticket-b")
+        self.assertTrue(is_valid, "A different code should be processed immediately")
+        
+        stats = self.scanner.get_dedup_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+    
     @patch('cv2.VideoCapture')
     def test_camera_device(self, mock_video_capture):
         """Test camera device handling"""
@@ -60,6 +129,40 @@ class TestQRScanner(unittest.TestCase):
         self.assertIsNotNone(vid, "Should return a video capture device")
 
 
+class TestTTLCache(unittest.TestCase):
+    """
+    Tests for the TTL-bounded LRU cache
+    """
+    
+    def setUp(self):
+        """Set up a cache driven by a fake clock"""
+        self.now = 0.0
+        self.cache = TTLCache(capacity=2, ttl=2.0, clock=lambda: self.now)
+    
+    def test_ttl_expiry(self):
+        """Test that entries expire after their TTL"""
+        self.assertFalse(self.cache.check_and_add("a"))
+        self.now = 1.0
+        self.assertTrue(self.cache.check_and_add("a"))
+        
+        # The hit restarted the window
+        self.now = 2.5
+        self.assertIn("a", self.cache)
+        self.now = 3.5
+        self.assertNotIn("a", self.cache)
+        self.assertFalse(self.cache.check_and_add("a"))
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted at capacity"""
+        for key in ("a", "b", "c"):
+            self.cache.check_and_add(key)
+        
+        self.assertNotIn("a", self.cache)
+        self.assertIn("c", self.cache)
+        self.assertEqual(self.cache.get_stats()["evictions"], 1)
+        self.assertEqual(len(self.cache), 2)
+
+
 class TestDatabase(unittest.TestCase):
     """
     Tests for the Database functionality
@@ -78,7 +181,7 @@ class TestDatabase(unittest.TestCase):
     def tearDown(self):
         """Clean up test environment"""
         # Close the database connection
-        self.db.conn.close()
+        self.db.close()
         
         # Remove the temporary database file
         os.unlink(self.db_path)
@@ -147,6 +250,147 @@ class TestDatabase(unittest.TestCase):
         unsynced = self.db.get_unsynced_scans()
         self.assertEqual(len(unsynced), 0, "Should have no unsynced scans")
 
+    def test_lookup_attendee(self):
+        """Test a scan's local verification is one query returning a typed record"""
+        self.db.preload_tickets([{
+            "id": "1", "event_id": "event1", "qr_code": "qr_code1",
+            "attendee_name": "John Doe", "attendee_email": "john@example.com",
+            "event": {"id": "event1", "name": "Launch", "venue": "Hall A"}
+        }])
+        record = self.db.lookup_attendee("qr_code1")
+        self.assertEqual((record.attendee_name, record.event_name, record.venue), ("John Doe", "Launch", "Hall A"))
+        self.assertFalse(record.checked_in)
+        self.assertIsNone(self.db.lookup_attendee("missing"))
+
+        statements = []
+        self.db.reader().set_trace_callback(statements.append)
+        scanner = QRScanner("secret", None, self.db, scan_cooldown=0)
+        is_valid, result, _ = scanner.verify_qr_code("qr_code1")
+        self.db.reader().set_trace_callback(None)
+        self.assertTrue(is_valid)
+        self.assertEqual(result["attendee"]["attendee_email"], "john@example.com")
+        self.assertEqual(len(statements), 1)
+
+
+    def test_bulk_preload(self):
+        """Test repeat preloads skip unchanged rows and keep local check-ins"""
+        event = {"id": "event1", "name": "Launch"}
+        attendees = [{"id": str(i), "event_id": "event1", "qr_code": f"qr_{i}", "updated_at": "v1", "event": event}
+                     for i in range(3)]
+        self.assertEqual(self.db.preload_tickets(attendees), {"inserted": 3, "updated": 0, "unchanged": 0})
+        self.assertEqual(self.db.preload_tickets(attendees), {"inserted": 0, "updated": 0, "unchanged": 3})
+        self.assertEqual(self.db.conn.execute("SELECT COUNT(*) FROM events").fetchone()[0], 1)
+
+        self.db.check_in_attendee("qr_0")
+        # A local check-in doesn't make the server's row look changed
+        self.assertEqual(self.db.preload_tickets(attendees), {"inserted": 0, "updated": 0, "unchanged": 3})
+        changed = [dict(attendees[0], updated_at="v2", attendee_name="Renamed"),
+                   dict(attendees[1], updated_at="v2", checked_in=True, checked_in_at="09:00")]
+        self.assertEqual(self.db.preload_tickets(changed + attendees[2:]),
+                         {"inserted": 0, "updated": 2, "unchanged": 1})
+        record = self.db.lookup_attendee("qr_0")
+        self.assertEqual(record.attendee_name, "Renamed")
+        self.assertTrue(record.checked_in)
+        self.assertNotEqual(record.checked_in_at, "")
+        self.assertEqual(self.db.lookup_attendee("qr_1").checked_in_at, "09:00")
+
+        # A reissued row taking over a QR code keeps that code's local check-in
+        self.db.preload_tickets([dict(attendees[0], id="reissued", updated_at="v3")])
+        record = self.db.lookup_attendee("qr_0")
+        self.assertEqual(record.id, "reissued")
+        self.assertTrue(record.checked_in)
+
+
+class TestDatabaseConcurrency(unittest.TestCase):
+    """Tests for the WAL writer and per-thread readers"""
+
+    def setUp(self):
+        """Set up a temporary database with a few hundred attendees"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = DBManager(os.path.join(self.temp_dir.name, "test.db"))
+        self.attendees = [{"id": str(i), "event_id": "event1", "qr_code": f"qr_{i}"} for i in range(300)]
+        self.db.preload_tickets(self.attendees)
+
+    def tearDown(self):
+        """Clean up the temporary directory"""
+        self.db.close()
+        self.temp_dir.cleanup()
+
+    def test_wal_and_per_thread_readers(self):
+        """Test WAL journaling is on and each thread reads on its own connection"""
+        self.assertEqual(self.db.conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        readers = []
+        thread = threading.Thread(target=lambda: readers.append(self.db.reader()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(readers[0], self.db.reader())
+        self.assertIs(self.db.reader(), self.db.reader())
+
+    def test_reader_reopened_after_close(self):
+        """Test a thread reading after close() gets a fresh connection, not the closed one"""
+        closed = self.db.reader()
+        self.db.close()
+        reader = self.db.reader()
+        self.assertIsNot(reader, closed)
+        self.assertIsNone(self.db.lookup_attendee("QR-NONE"))
+
+    def test_ended_threads_readers_closed(self):
+        """Test short-lived threads don't accumulate open read connections"""
+        for _ in range(20):
+            thread = threading.Thread(target=self.db.lookup_attendee, args=("QR-NONE",))
+            thread.start()
+            thread.join()
+        self.assertLessEqual(len(self.db._readers), 1)
+
+    def test_readers_do_not_wait_for_writer(self):
+        """Test lookups complete while a write transaction is open"""
+        with self.db._write_lock:
+            self.db.conn.execute("UPDATE booking_attendees SET checked_in=1 WHERE qr_code='qr_1'")
+            results = []
+            thread = threading.Thread(target=lambda: results.append(self.db.lookup_attendee("qr_1")))
+            thread.start()
+            thread.join(2)
+            self.assertFalse(thread.is_alive())
+            # The reader sees the last committed state
+            self.assertFalse(results[0].checked_in)
+            self.db.conn.rollback()
+
+    def test_concurrent_paths(self):
+        """Test preloads, check-ins, sync and lookups running together"""
+        errors = []
+        stop = threading.Event()
+
+        def run(target):
+            def loop():
+                try:
+                    while not stop.is_set():
+                        target()
+                except Exception as e:
+                    errors.append(e)
+            return threading.Thread(target=loop)
+
+        def sync():
+            for scan_id, *_ in self.db.get_unsynced_scans():
+                self.db.mark_scan_synced(scan_id)
+
+        lookups = iter(range(10 ** 9))
+        threads = [
+            run(lambda: self.db.preload_tickets(self.attendees)),
+            run(sync),
+            run(lambda: self.db.lookup_attendee(f"qr_{next(lookups) % 300}")),
+            run(lambda: self.db.lookup_attendee(f"qr_{next(lookups) % 300}")),
+        ]
+        for thread in threads:
+            thread.start()
+        outcomes = [self.db.check_in_attendee(f"qr_{i}", "scanner1") for i in range(100)]
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertTrue(all(outcome in ("admitted", "duplicate") for outcome in outcomes))
+        self.assertEqual(self.db.count_scans(), outcomes.count("admitted"))
+
 
 if __name__ == '__main__':
     unittest.main()
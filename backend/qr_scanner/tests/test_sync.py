@@ -0,0 +1,233 @@
+"""
+EventHive Sync Tests
+Unit tests for incremental ticket sync
+"""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from functools import partial
+from pathlib import Path
+import sys
+from unittest.mock import patch
+
+# Add the parent directory to the path to import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from backend.qr_scanner.core.attendee_index import AttendeeIndex
+from backend.qr_scanner.core.preload import PagedPreloader
+from backend.qr_scanner.core.sync import SyncEngine, advance_watermark
+from backend.qr_scanner.db.database import DBManager
+from backend.qr_scanner.utils.error_handler import ApiError
+from backend.qr_scanner.tests.test_attendee_index import attendee_row
+
+
+class ChangeFeed:
+    """Supabase stand-in serving full downloads and (updated_at, id) keyset changes"""
+
+    def __init__(self, rows):
+        self.rows = {row["id"]: row for row in rows}
+        self.full_fetches = 0
+        self.change_fetches = []
+
+    def count_tickets(self, event_id):
+        return len(self.rows)
+
+    def fetch_ticket_page(self, event_id, after_id=None, page_size=1000):
+        if after_id is None:
+            self.full_fetches += 1
+        return [self.rows[key] for key in sorted(self.rows) if after_id is None or key > after_id][:page_size]
+
+    def fetch_ticket_changes(self, event_id, since_updated_at=None, since_id=None):
+        self.change_fetches.append((since_updated_at, since_id))
+        since = (since_updated_at or "", since_id or "")
+        return sorted((row for row in self.rows.values() if (row["updated_at"], row["id"]) > since),
+                      key=lambda row: (row["updated_at"], row["id"]))
+
+
+class TestIncrementalSync(unittest.TestCase):
+    """
+    Tests for watermark-based polling
+    """
+
+    def setUp(self):
+        """Set up a temporary database and a feed of three attendees"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = DBManager(os.path.join(self.temp_dir.name, "test.db"))
+        self.feed = ChangeFeed([attendee_row(f"TICKET-{i}", updated_at="2026-01-01T10:00:00") for i in range(3)])
+
+    def tearDown(self):
+        """Clean up the temporary directory"""
+        self.db.close()
+        self.temp_dir.cleanup()
+
+    def test_watermark_tie_breaker(self):
+        """Test rows sharing an updated_at are ordered by id"""
+        rows = [{"updated_at": "t1", "id": "b"}, {"updated_at": "t1", "id": "a"}, {"updated_at": None, "id": "z"}]
+        self.assertEqual(advance_watermark(rows, (None, None)), ("t1", "b"))
+        self.assertEqual(advance_watermark([], ("t1", "b")), ("t1", "b"))
+
+    def test_polls_fetch_only_changes(self):
+        """Test polls after the first full download fetch changed rows only"""
+        index = AttendeeIndex()
+        sync = SyncEngine(self.db, self.feed, index=index)
+        self.assertEqual(sync.load_event("event-1"), 3)
+        self.assertEqual(self.db.get_sync_state("event-1")["id"], "id-TICKET-2")
+
+        self.assertEqual(sync.poll_event("event-1"), 0)
+        self.feed.rows["id-TICKET-0"].update(attendee_name="Ada King", updated_at="2026-01-01T10:05:00")
+        self.assertEqual(sync.poll_event("event-1"), 1)
+        self.assertEqual(self.feed.full_fetches, 1)
+        self.assertEqual(self.feed.change_fetches[-1], ("2026-01-01T10:00:00", "id-TICKET-2"))
+        self.assertEqual(self.db.lookup_attendee("TICKET-0").attendee_name, "Ada King")
+        self.assertEqual(index.get("TICKET-0").name, "Ada King")
+
+    def test_watermark_survives_restart(self):
+        """Test a restarted engine resumes from the stored watermark"""
+        SyncEngine(self.db, self.feed).load_event("event-1")
+        self.assertEqual(SyncEngine(self.db, self.feed).load_event("event-1"), 3)
+        self.assertEqual(self.feed.full_fetches, 1)
+
+    def test_full_reconciliation(self):
+        """Test a full download runs once the interval has passed"""
+        sync = SyncEngine(self.db, self.feed, full_sync_interval=0)
+        sync.load_event("event-1")
+        sync.poll_event("event-1")
+        self.assertEqual((self.feed.full_fetches, self.feed.change_fetches), (2, []))
+
+    def test_concurrent_full_syncs_serialized(self):
+        """Test full downloads of one event started together run one at a time"""
+        feed = PagedFeed(self.feed.rows.values())
+        sync = SyncEngine(self.db, feed, full_sync_interval=0)
+        threads = [threading.Thread(target=sync._full_sync, args=("event-1",)) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(feed.max_in_flight, 1)
+        self.assertEqual(self.db.count_attendees("event-1"), 3)
+
+
+class PagedFeed(ChangeFeed):
+    """Change feed whose page requests are slow, counted, and can fail once"""
+
+    def __init__(self, rows, fail_at=None):
+        super().__init__(rows)
+        self.fail_at = fail_at
+        self.afters = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def fetch_ticket_page(self, event_id, after_id=None, page_size=1000):
+        with self._lock:
+            self.afters.append(after_id)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(0.005)
+            if after_id is not None and after_id == self.fail_at:
+                self.fail_at = None
+                raise ApiError("connection reset")
+            return super().fetch_ticket_page(event_id, after_id, page_size)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class TestPagedPreload(unittest.TestCase):
+    """
+    Tests for streaming an event into the database page by page
+    """
+
+    def setUp(self):
+        """Set up a temporary database and an event of 1050 attendees"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = DBManager(os.path.join(self.temp_dir.name, "test.db"))
+        self.rows = [attendee_row(f"TICKET-{i:04d}", updated_at=f"2026-01-01T10:{i % 60:02d}:00")
+                     for i in range(1050)]
+
+    def tearDown(self):
+        """Clean up the temporary directory"""
+        self.db.close()
+        self.temp_dir.cleanup()
+
+    def test_pages_stored_in_id_order(self):
+        """Test every page is stored, progress is reported and each page follows the last ID"""
+        feed = PagedFeed(self.rows)
+        progress = []
+        pages = []
+        result = PagedPreloader(self.db, feed, page_size=100).run(
+            "event-1", on_page=lambda rows: pages.append(len(rows)),
+            on_progress=lambda loaded, total: progress.append((loaded, total)))
+
+        self.assertTrue(result["complete"])
+        self.assertEqual((result["rows"], result["inserted"]), (1050, 1050))
+        self.assertEqual(self.db.count_attendees("event-1"), 1050)
+        self.assertEqual(feed.max_in_flight, 1)
+        self.assertEqual(feed.afters[:3], [None, "id-TICKET-0099", "id-TICKET-0199"])
+        self.assertLessEqual(max(pages), 100)
+        self.assertEqual(progress[-1], (1050, 1050))
+        self.assertEqual(result["watermark"], ("2026-01-01T10:59:00", "id-TICKET-1019"))
+        self.assertIsNone(self.db.get_preload_progress("event-1"))
+
+    def test_resume_after_failure(self):
+        """Test a failed download resumes after the last stored ID"""
+        feed = PagedFeed(self.rows, fail_at="id-TICKET-0499")
+        preloader = PagedPreloader(self.db, feed, page_size=100)
+        with self.assertRaises(ApiError):
+            preloader.run("event-1")
+        progress = self.db.get_preload_progress("event-1")
+        self.assertEqual((progress["last_id"], progress["rows"]), ("id-TICKET-0499", 500))
+
+        feed.afters.clear()
+        loaded = []
+        result = preloader.run("event-1", on_progress=lambda stored, total: loaded.append(stored))
+        self.assertTrue(result["complete"])
+        self.assertEqual(feed.afters[0], "id-TICKET-0499")
+        self.assertEqual(loaded[-1], 1050)
+        self.assertEqual(self.db.count_attendees("event-1"), 1050)
+
+    def test_deleted_rows_do_not_shift_pages(self):
+        """Test rows removed behind the download don't make it skip rows ahead"""
+        feed = PagedFeed(self.rows)
+
+        def delete_stored(rows):
+            feed.rows.pop(rows[0]["id"], None)
+
+        result = PagedPreloader(self.db, feed, page_size=100).run("event-1", on_page=delete_stored)
+        self.assertTrue(result["complete"])
+        self.assertEqual(self.db.count_attendees("event-1"), 1050)
+
+    def test_resume_with_nothing_left(self):
+        """Test a download interrupted after its last full page completes on resume"""
+        feed = PagedFeed(self.rows[:200])
+        sync = SyncEngine(self.db, feed)
+
+        def stop_after_two(rows):
+            if self.db.count_attendees("event-1") == 200:
+                sync._stop.set()
+
+        with patch("backend.qr_scanner.core.sync.PagedPreloader", partial(PagedPreloader, page_size=100)):
+            self.assertEqual(sync._full_sync("event-1", on_page=stop_after_two), 200)
+            self.assertIsNone(self.db.get_sync_state("event-1"))
+
+            sync._stop.clear()
+            self.assertEqual(sync.load_event("event-1"), 200)
+        self.assertIsNotNone(self.db.get_sync_state("event-1"))
+        self.assertIsNone(self.db.get_preload_progress("event-1"))
+
+    def test_stop_keeps_progress(self):
+        """Test stopping mid-download leaves a resume position"""
+        stop = threading.Event()
+        feed = PagedFeed(self.rows)
+        result = PagedPreloader(self.db, feed, page_size=100).run(
+            "event-1", stop=stop, on_page=lambda rows: stop.set())
+        self.assertFalse(result["complete"])
+        self.assertEqual(self.db.get_preload_progress("event-1")["last_id"], "id-TICKET-0099")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+"""
+EventHive Signed Ticket Tests
+Unit tests for the compact signed ticket format
+"""
+
+import json
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+import sys
+
+import cv2
+
+# Add the parent directory to the path to import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from backend.qr_scanner.core.attendee_index import AttendeeIndex
+from backend.qr_scanner.core.checkin import CheckInService
+from backend.qr_scanner.core.revocation import RevocationFilter
+from backend.qr_scanner.core.scanner import QRScanner
+from backend.qr_scanner.core.tickets import SignedTicket, TicketKeyring, parse_keyring
+from backend.qr_scanner.db.database import DBManager
+from backend.qr_scanner.utils.error_handler import ValidationError
+from backend.qr_scanner.utils.helpers import generate_hmac_signature
+from backend.qr_scanner.tests.test_attendee_index import attendee_row
+from backend.qr_scanner.tests.test_scanner import make_qr_frame
+
+TICKET_ID = "df564495-1e62-4a97-a479-44197c6d7163"
+EVENT_ID = "11111111-1111-1111-1111-111111111111"
+
+
+def make_ticket(valid_for: float = 3600, ticket_type: str = "VIP") -> SignedTicket:
+    """Build ticket fields valid from now"""
+    now = int(time.time())
+    return SignedTicket(TICKET_ID, EVENT_ID, ticket_type, now, int(now + valid_for))
+
+
+class TestSignedTickets(unittest.TestCase):
+    """
+    Tests for encoding and verifying signed tickets
+    """
+
+    def setUp(self):
+        """Set up a keyring with two keys"""
+        self.keyring = TicketKeyring({1: "old-secret", 2: "new-secret"})
+
+    def test_round_trip(self):
+        """Test a ticket decodes to the fields it was issued with"""
+        payload = self.keyring.encode(make_ticket())
+        ticket = self.keyring.decode(payload)
+        self.assertEqual(ticket.ticket_id, TICKET_ID)
+        self.assertEqual(ticket.event_id, EVENT_ID)
+        self.assertEqual(ticket.ticket_type, "vip")
+        self.assertEqual(ticket.key_id, 2)
+        self.assertTrue(ticket.is_current())
+
+    def test_tampering_rejected(self):
+        """Test a changed character fails the MAC check"""
+        payload = self.keyring.encode(make_ticket())
+        index = len(payload) - 20
+        tampered = payload[:index] + ("A" if payload[index] != "A" else "B") + payload[index + 1:]
+        with self.assertRaises(ValidationError):
+            self.keyring.decode(tampered)
+        with self.assertRaises(ValidationError):
+            self.keyring.decode(payload[:-8])
+
+    def test_key_rotation(self):
+        """Test tickets keep verifying until their key is retired"""
+        old_keyring = TicketKeyring({1: "old-secret"})
+        payload = old_keyring.encode(make_ticket())
+        self.assertEqual(self.keyring.decode(payload).key_id, 1)
+
+        self.keyring.remove_key(1)
+        with self.assertRaises(ValidationError):
+            self.keyring.decode(payload)
+        with self.assertRaises(ValueError):
+            self.keyring.remove_key(2)
+
+    def test_smaller_qr_than_json(self):
+        """Test the payload needs fewer modules than the JSON format"""
+        payload = self.keyring.encode(make_ticket())
+        legacy = json.dumps({"ticket_id": TICKET_ID, "event_id": EVENT_ID,
+                             "signature": generate_hmac_signature(f"{TICKET_ID}|{EVENT_ID}", "secret")})
+        encoder = cv2.QRCodeEncoder.create()
+        self.assertLess(encoder.encode(payload).shape[0], encoder.encode(legacy).shape[0])
+
+    def test_parse_keyring(self):
+        """Test keyrings are built from the config format"""
+        keyring = parse_keyring("1:alpha, 3:gamma", "fallback")
+        self.assertEqual((keyring.key_ids, keyring.active_key_id), ([1, 3], 3))
+        self.assertEqual(parse_keyring("", "fallback").key_ids, [0])
+        with self.assertRaises(ValueError):
+            parse_keyring("gamma", "fallback")
+
+
+class TestSignedTicketVerification(unittest.TestCase):
+    """
+    Tests for verifying signed tickets in the scanner
+    """
+
+    def setUp(self):
+        """Set up a keyring"""
+        self.keyring = TicketKeyring({1: "secret"})
+
+    def test_verified_offline(self):
+        """Test a scanned ticket is valid with no Supabase or database"""
+        payload = self.keyring.encode(make_ticket())
+        scanner = QRScanner("secret", scan_cooldown=0, keyring=self.keyring, event_id=EVENT_ID)
+        self.assertEqual(scanner.scan_image(make_qr_frame(payload, scale=4)), payload)
+
+        is_valid, result, message = scanner.verify_qr_code(payload)
+        self.assertTrue(is_valid)
+        self.assertEqual(result["event_id"], EVENT_ID)
+        self.assertEqual(result["attendee"]["ticket_type"], "vip")
+
+    def test_expired_ticket(self):
+        """Test tickets outside their validity window are rejected"""
+        payload = self.keyring.encode(make_ticket(valid_for=-3600))
+        scanner = QRScanner("secret", keyring=self.keyring, event_id=EVENT_ID)
+        is_valid, _, message = scanner.verify_qr_code(payload)
+        self.assertFalse(is_valid)
+        self.assertEqual(message, "Ticket expired")
+
+    def test_other_event_refused(self):
+        """Test a validly signed ticket for another event, or with no event set, is refused"""
+        payload = self.keyring.encode(make_ticket())
+        scanner = QRScanner("secret", scan_cooldown=0, keyring=self.keyring,
+                            event_id="22222222-2222-2222-2222-222222222222")
+        self.assertEqual(scanner.verify_qr_code(payload)[2], "Ticket is for a different event")
+        scanner.event_id = None
+        self.assertFalse(scanner.verify_qr_code(payload)[0])
+        scanner.event_id = EVENT_ID
+        self.assertTrue(scanner.verify_qr_code(payload)[0])
+
+    def test_revoked_by_ticket_id(self):
+        """Test a refunded ticket stored under another QR code is refused by its ticket ID"""
+        payload = self.keyring.encode(make_ticket())
+        refunded = attendee_row("LEGACY-QR", id=TICKET_ID, event_id=EVENT_ID, verification_status="refunded")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db = DBManager(os.path.join(temp_dir, "test.db"))
+            try:
+                db.preload_tickets([refunded])
+                revocations = RevocationFilter()
+                revocations.load(db.reader())
+            finally:
+                db.close()
+        scanner = QRScanner("secret", scan_cooldown=0, keyring=self.keyring, revocations=revocations, event_id=EVENT_ID)
+        self.assertEqual(scanner.verify_qr_code(payload)[2], "Ticket has been revoked")
+
+        # A refund reported by the poller after the build
+        polled = RevocationFilter()
+        polled.update([refunded])
+        scanner.revocations = polled
+        self.assertEqual(scanner.verify_qr_code(payload)[2], "Ticket has been revoked")
+
+    def test_repeat_caught_by_index(self):
+        """Test a checked-in ticket is refused on the next scan"""
+        index = AttendeeIndex()
+        scanner = QRScanner("secret", scan_cooldown=0, index=index, keyring=self.keyring, event_id=EVENT_ID)
+        payload = self.keyring.encode(make_ticket())
+        self.assertTrue(scanner.verify_qr_code(payload)[0])
+
+        index.mark_checked_in(payload)
+        is_valid, _, message = scanner.verify_qr_code(payload)
+        self.assertFalse(is_valid)
+        self.assertIn("already checked in", message)
+
+    def test_check_in_survives_index_rebuild(self):
+        """Test a checked-in ticket missing from the preload is refused after a restart"""
+        payload = self.keyring.encode(make_ticket())
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db = DBManager(os.path.join(temp_dir, "test.db"))
+            try:
+                results = []
+                for _ in range(2):
+                    # A fresh scanner and index per scan, as after a restart
+                    index = AttendeeIndex()
+                    index.load(db)
+                    scanner = QRScanner("secret", None, db, scan_cooldown=0, index=index, keyring=self.keyring, event_id=EVENT_ID)
+                    results.append(CheckInService(scanner, db).verify_and_check_in(payload))
+                self.assertTrue(results[0]["is_valid"])
+                self.assertFalse(results[1]["is_valid"])
+                self.assertIn("already checked in", results[1]["message"])
+                self.assertEqual(db.count_scans(), 1)
+            finally:
+                db.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -27,6 +27,8 @@ from .error_handler import (
     setup_exception_hooks
 )
 
+from .cache import TTLCache
+
 __all__ = [
     # Helpers
     'generate_hmac_signature',
@@ -48,5 +50,8 @@ __all__ = [
     'global_error_handler',
     'handle_errors',
     'log_exception',
-    'setup_exception_hooks'
+    'setup_exception_hooks',
+    
+    # Caches
+    'TTLCache'
 ]
@@ -0,0 +1,100 @@
+"""
+EventHive Caches
+This module provides a TTL-bounded LRU cache used to suppress repeated scans
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+
+class TTLCache:
+    """
+    Least-recently-used cache whose entries also expire after a fixed time-to-live
+    """
+
+    def __init__(self, capacity: int = 1024, ttl: float = 2.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the cache
+
+        Args:
+            capacity: Maximum number of entries kept; the least recently used is evicted first
+            ttl: Seconds an entry stays valid after it was last seen
+            clock: Monotonic time source
+        """
+        self.capacity = capacity
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def check_and_add(self, key: Hashable) -> bool:
+        """
+        Record a key and report whether it was already live
+
+        A hit also restarts the key's window, so a code held in front of the
+        camera stays suppressed for as long as it keeps being seen.
+
+        Args:
+            key: Key to look up
+
+        Returns:
+            True if the key was seen within its TTL, False otherwise
+        """
+        now = self.clock()
+        with self._lock:
+            expires = self._entries.get(key)
+            hit = expires is not None and expires > now
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self._entries[key] = now + self.ttl
+            self._entries.move_to_end(key)
+            self._evict(now)
+            return hit
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Check whether a key is live without recording it"""
+        with self._lock:
+            expires = self._entries.get(key)
+            return expires is not None and expires > self.clock()
+
+    def __len__(self) -> int:
+        """Number of stored entries, including any not yet purged"""
+        return len(self._entries)
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters
+
+        Returns:
+            Dictionary with size, capacity, ttl, hits, misses and evictions
+        """
+        return {
+            "size": len(self._entries),
+            "capacity": self.capacity,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+
+    def _evict(self, now: float):
+        """Drop expired entries from the old end, then enforce capacity"""
+        while self._entries:
+            key, expires = next(iter(self._entries.items()))
+            if expires > now and len(self._entries) <= self.capacity:
+                break
+            self._entries.popitem(last=False)
+            if expires > now:
+                self.evictions += 1
@@ -0,0 +1,134 @@
+"""
+EventHive Latency Tracking
+Per-stage timing spans aggregated into rolling percentiles
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+class LatencyTracker:
+    """
+    Rolling latency samples per named stage
+
+    Recording is an append to a bounded deque; percentiles are only computed
+    when the stats are read.
+    """
+
+    def __init__(self, window: int = 1024, clock: Callable[[], float] = time.perf_counter):
+        """
+        Initialize the tracker
+
+        Args:
+            window: Most recent samples kept per stage
+            clock: Monotonic time source in seconds
+        """
+        self.window = window
+        self.clock = clock
+        self._samples: Dict[str, deque] = {}
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, elapsed: float):
+        """
+        Record one sample
+
+        Args:
+            stage: Stage name
+            elapsed: Duration in seconds
+        """
+        samples = self._samples.get(stage)
+        if samples is None:
+            with self._lock:
+                samples = self._samples.setdefault(stage, deque(maxlen=self.window))
+                self._counts.setdefault(stage, 0)
+        samples.append(elapsed)
+        self._counts[stage] = self._counts.get(stage, 0) + 1
+
+    @contextmanager
+    def span(self, stage: str):
+        """
+        Time a block of code
+
+        Args:
+            stage: Stage name the duration is recorded under
+        """
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.record(stage, self.clock() - start)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get percentiles for every stage
+
+        Returns:
+            Dictionary keyed by stage with the total count and p50, p95, p99 and
+            max of the recent samples in milliseconds
+        """
+        with self._lock:
+            stages = list(self._samples.items())
+        stats = {}
+        for stage, samples in stages:
+            recent = sorted(list(samples))
+            if not recent:
+                continue
+            stats[stage] = {
+                "count": self._counts.get(stage, len(recent)),
+                "p50_ms": round(_percentile(recent, 0.50) * 1000, 3),
+                "p95_ms": round(_percentile(recent, 0.95) * 1000, 3),
+                "p99_ms": round(_percentile(recent, 0.99) * 1000, 3),
+                "max_ms": round(recent[-1] * 1000, 3)
+            }
+        return stats
+
+    def format_summary(self, stages: Iterable[str]) -> str:
+        """
+        Format a one-line readout of selected stages
+
+        Args:
+            stages: Stage names to include, in order; stages without samples are left out
+
+        Returns:
+            Text such as "verify 0.2/1.1/3.0ms" giving p50/p95/p99
+        """
+        stats = self.get_stats()
+        return " | ".join(
+            f"{stage} {stats[stage]['p50_ms']:.1f}/{stats[stage]['p95_ms']:.1f}/{stats[stage]['p99_ms']:.1f}ms"
+            for stage in stages if stage in stats
+        )
+
+    def dump(self, path: str, extra: Optional[Dict[str, Any]] = None):
+        """
+        Write the current percentiles to a JSON file
+
+        Args:
+            path: Output file
+            extra: Additional fields stored alongside the stages
+        """
+        report = dict(extra or {})
+        report["written_at"] = time.strftime('%Y-%m-%d %H:%M:%S')
+        report["stages"] = self.get_stats()
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(report, f, indent=2)
+        os.replace(temp_path, path)
+
+    def reset(self):
+        """Discard all samples"""
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+
+
+def _percentile(sorted_samples, fraction: float) -> float:
+    """Nearest-rank percentile of sorted samples"""
+    index = max(0, math.ceil(fraction * len(sorted_samples)) - 1)
+    return sorted_samples[index]